@@ -24,16 +24,27 @@ show_usage() {
     cat << EOF
 VenturePulse - AI-Powered Product Viability Analysis
 
-Usage: $0 <project-file> [model]
+Usage: $0 <project-file> [model] [options]
 
 Arguments:
   project-file    Path to your project description (markdown or text)
   model          OpenRouter model to use (optional, default: $DEFAULT_MODEL)
 
+Options:
+  --no-cache             Call the API for every section, ignoring cached responses
+  --refresh-section NN   Re-generate section NN even if a cached response exists
+  --cache-dir DIR        Response cache directory (default: ~/.cache/venturepulse)
+  --stream               Write each section file as tokens arrive
+  --fallback MODEL       Model to use when the primary fails or is slow (repeatable, in order)
+  --latency-slo SECONDS  Skip models whose median section latency exceeds this
+  --hedge                Race a section that exceeds the latency SLO against the next fallback
+
 Examples:
   $0 my-idea.md
   $0 my-idea.md anthropic/claude-sonnet-4
   $0 my-idea.md deepseek/deepseek-chat
+  $0 my-idea.md deepseek/deepseek-chat --refresh-section 02
+  $0 my-idea.md openai/gpt-4o --fallback anthropic/claude-sonnet-4 --latency-slo 90
 
 Popular Models:
   google/gemini-2.0-flash-exp:free    Fast, FREE (recommended for testing)
@@ -47,6 +58,7 @@ See all models: https://openrouter.ai/models
 Environment:
   OPENROUTER_API_KEY    Required - Get yours at https://openrouter.ai/keys
   VENTUREPULSE_DEBUG    Optional - Set to 1 for debug output
+  VENTUREPULSE_CONCURRENCY  Optional - Sections generated at once (default: 8)
 
 EOF
 }
@@ -63,7 +75,12 @@ if [ "$1" = "-h" ] || [ "$1" = "--help" ]; then
 fi
 
 PROJECT_FILE="$1"
-MODEL="${2:-$DEFAULT_MODEL}"
+shift
+MODEL="$DEFAULT_MODEL"
+if [ $# -gt 0 ] && [ "${1#--}" = "$1" ]; then
+    MODEL="$1"
+    shift
+fi
 MODEL_NAME=$(echo "$MODEL" | sed -E 's/^[^\/]*\///; s/[^A-Za-z0-9_]/-/g; s/[-_][-_]*/-/g')
 
 # Validate project file exists
@@ -97,99 +114,40 @@ if [ -z "$OPENROUTER_API_KEY" ]; then
     exit 1
 fi
 
-# Check dependencies
-for cmd in jq curl; do
-    if ! command -v $cmd &> /dev/null; then
-        echo -e "${RED}Error: Required command '$cmd' not found${NC}" >&2
-        echo "Install it with: brew install $cmd  (or apt-get install $cmd)" >&2
-        exit 1
-    fi
-done
+# Check dependencies (the pipeline is pure Python; jq and curl are only used
+# by the standalone call-openrouter.sh)
+if ! command -v python3 &> /dev/null; then
+    echo -e "${RED}Error: Required command 'python3' not found${NC}" >&2
+    echo "Install it with: brew install python3  (or apt-get install python3)" >&2
+    exit 1
+fi
 
 # Create output directory
 mkdir -p "$OUTPUT_DIR"
 
-# Read project data
-PROJECT_DATA=$(cat "$PROJECT_FILE")
-
-# Load common instructions
+# Check common instructions
 if [ ! -f "prompts/common-instructions.md" ]; then
     echo -e "${RED}Error: prompts/common-instructions.md not found${NC}" >&2
     exit 1
 fi
-COMMON_INSTRUCTIONS=$(cat "prompts/common-instructions.md")
-
-# Section definitions: 
-#    number:display-name:file-slug
-declare -a SECTIONS=(
-    "01:Executive Summary:executive-summary"
-    "02:Market Landscape:market-landscape"
-    "03:Technical Feasibility:technical-feasibility"
-    "04:Competitive Advantage:competitive-advantage"
-    "05:Business Model:business-model"
-    "06:MVP Roadmap:mvp-roadmap"
-    "07:Success Metrics:success-metrics"
-    "08:Go-to-Market:go-to-market"
-)
-
-
-# Generate sections
-echo -e "${BLUE}Generating sections...${NC}"
+
+# Generate sections concurrently (see scripts/analyze.py)
+echo -e "${BLUE}Generating sections (concurrency ${VENTUREPULSE_CONCURRENCY:-8})...${NC}"
 echo ""
 
-for SECTION_DEF in "${SECTIONS[@]}"; do
-    IFS=':' read -r NUM NAME SLUG <<< "$SECTION_DEF"
-    
-    echo -e "${GREEN}📝 Section ${NUM}: ${NAME}${NC}"
-    
-    # Check if section prompt exists
-    PROMPT_FILE="prompts/sections/section${NUM}-${SLUG}.md"
-    if [ ! -f "$PROMPT_FILE" ]; then
-        echo -e "${YELLOW}   ⚠️  Warning: $PROMPT_FILE not found, skipping...${NC}"
-        continue
-    fi
-    
-    # Load section prompt
-    SECTION_PROMPT=$(cat "$PROMPT_FILE")
-    
-    # Build full prompt
-    FULL_PROMPT="${COMMON_INSTRUCTIONS}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-${SECTION_PROMPT}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-## PROJECT DATA
-
-${PROJECT_DATA}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Generate the HTML for this section now."
-    
-    # Output file
-    OUTPUT_FILE="$OUTPUT_DIR/section${NUM}-${SLUG}.html"
-    
-    # Call OpenRouter (with error handling)
-    if ./scripts/call-openrouter.sh "$MODEL" "$FULL_PROMPT" > "$OUTPUT_FILE" 2>&1; then
-        WORD_COUNT=$(wc -w < "$OUTPUT_FILE" | tr -d ' ')
-        echo -e "   ✅ Generated: section${NUM}-${SLUG}.html (${WORD_COUNT} words)"
-    else
-        echo -e "${RED}   ❌ Failed to generate Section ${NUM}${NC}" >&2
-        echo -e "${RED}   Check error output above for details${NC}" >&2
-        exit 1
-    fi
-    
-    # Small delay to avoid rate limits (adjust if needed)
-    sleep 0.5
-done
+if ! python3 ./scripts/analyze.py "$PROJECT_FILE" "$MODEL" \
+        --output-dir "$OUTPUT_DIR" \
+        --concurrency "${VENTUREPULSE_CONCURRENCY:-8}" \
+        --sections-only "$@"; then
+    echo -e "${RED}   ❌ Failed to generate all sections${NC}" >&2
+    echo -e "${RED}   Check error output above for details${NC}" >&2
+    exit 1
+fi
 
 # Generate provenance section (no AI needed)
 echo ""
 echo -e "${GREEN}📝 Section 09: Provenance${NC}"
-if ./scripts/generate-provenance.sh "$PROJECT_NAME" "$MODEL" > "$OUTPUT_DIR/section09-provenance.html"; then
+if ./scripts/generate-provenance.sh "$PROJECT_NAME" "$MODEL" "$OUTPUT_DIR" > "$OUTPUT_DIR/section09-provenance.html"; then
     echo -e "   ✅ Generated: section09-provenance.html"
 else
     echo -e "${YELLOW}   ⚠️  Warning: Failed to generate provenance${NC}"
@@ -0,0 +1,722 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Generation Engine
+Generates all report sections concurrently instead of one after another.
+
+Usage:
+    python3 analyze.py <project-file> [model] [--concurrency N] [--output-dir DIR]
+    python3 analyze.py my-idea.md anthropic/claude-sonnet-4 --concurrency 4
+    python3 analyze.py my-idea.md --refresh-section 02    # re-generate one section
+    python3 analyze.py my-idea.md --no-cache              # bypass the response cache
+    python3 analyze.py my-idea.md --stream                # write tokens as they arrive
+    python3 analyze.py my-idea.md openai/gpt-4o --fallback anthropic/claude-sonnet-4 --latency-slo 90
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from brief import condense_project
+from cache import DEFAULT_CACHE_DIR, ResponseCache, cache_key
+from manifest import update_manifest
+from openrouter import DEFAULT_MAX_TOKENS, OpenRouterClient, OpenRouterError, build_request, elapsed_ms
+from preflight import CompletionHistory, history_file, plan_request
+from ratelimit import DEFAULT_RATE, TokenBucket
+from render import write_provenance, write_wrapper
+from routing import Router, RoutingPolicy, StatsStore, stats_file
+from sections import UPSTREAM_CHARS, condense_section, load_sections
+from telemetry import TELEMETRY_FILE, RunLog, estimate_cost
+from validate import check_section, strip_fences
+
+ROOT = Path(__file__).resolve().parent.parent
+PROMPTS_DIR = ROOT / 'prompts'
+
+DEFAULT_MODEL = 'deepseek/deepseek-r1-0528-qwen3-8b:free'
+DEFAULT_CONCURRENCY = 8
+
+# Section graph (number, name, slug, dependencies) from prompts/sections.json
+SECTIONS = load_sections()
+
+SEPARATOR = '━' * 61
+
+# Follow-up requests allowed to continue or regenerate a broken section
+MAX_REPAIRS = 2
+CONTINUE_PROMPT = ("Your previous answer was cut off. Continue the HTML exactly where it stopped. "
+                   "Output only the remaining HTML: no code fences, no commentary, and do not "
+                   "repeat anything already written.")
+
+# Providers whose models only reuse a cached prompt prefix when the request
+# marks it with cache_control (OpenAI, DeepSeek and others cache automatically)
+CACHE_CONTROL_PROVIDERS = ('anthropic', 'google')
+
+# Shortest condensed upstream section tried before sending an oversized prompt as it is
+MIN_UPSTREAM_CHARS = 300
+
+
+class SectionError(Exception):
+    """Raised when a section could not be generated."""
+
+    def __init__(self, message, status=None, attempts=1):
+        super().__init__(message)
+        self.status = status
+        self.attempts = attempts
+        self.seconds = None
+
+
+def read_text(path):
+    """Read a file the way bash $(cat file) does (trailing newlines stripped)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read().rstrip('\n')
+
+
+def project_slug(project_file):
+    """Derive the project name used in output folder names."""
+    stem = Path(project_file).name
+    stem = re.sub(r'\.[^.]*$', '', stem)
+    return re.sub(r'[^a-zA-Z0-9-]', '-', stem).lower()
+
+
+def model_slug(model):
+    """Derive the model name used in output folder names."""
+    name = re.sub(r'^[^/]*/', '', model)
+    name = re.sub(r'[^A-Za-z0-9_]', '-', name)
+    return re.sub(r'[-_][-_]*', '-', name)
+
+
+def default_output_dir(project_file, model):
+    """Build the timestamped output directory name used by analyze-script.sh."""
+    timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    return f"{project_slug(project_file)}-analysis-{model_slug(model)}-{timestamp}"
+
+
+def build_messages(common_instructions, section_prompt, project_data, model=None):
+    """Assemble the chat messages for one section.
+
+    The common instructions and project data are the same for every section,
+    so they form a stable system-message prefix that providers can cache;
+    the section prompt comes last. For providers that need it, the prefix is
+    marked with a cache_control breakpoint (see shape_messages).
+    """
+    prefix = f"""{common_instructions}
+
+{SEPARATOR}
+
+## PROJECT DATA
+
+{project_data}"""
+    section = f"""{section_prompt}
+
+{SEPARATOR}
+
+Generate the HTML for this section now."""
+
+    return shape_messages([{'role': 'system', 'content': prefix}, {'role': 'user', 'content': section}], model)
+
+
+def shape_messages(messages, model):
+    """messages with the system prefix in the form model's provider caches.
+
+    Providers in CACHE_CONTROL_PROVIDERS get the prefix as a text part with a
+    cache_control breakpoint; everyone else gets it as plain text.
+    """
+    system, *rest = messages
+    content = system['content']
+    if not isinstance(content, str):
+        content = ''.join(part.get('text', '') for part in content)
+    if model and model.split('/', 1)[0] in CACHE_CONTROL_PROVIDERS:
+        content = [{'type': 'text', 'text': content, 'cache_control': {'type': 'ephemeral'}}]
+    return [dict(system, content=content)] + rest
+
+
+def request_for(request, model):
+    """A request body sent to model instead, with its messages shaped for model's provider."""
+    return dict(request, model=model, messages=shape_messages(request['messages'], model))
+
+
+def with_upstream(messages, upstream):
+    """Add condensed upstream sections to the user message, before the final instruction.
+
+    upstream is a list of (section, condensed text). The system message is
+    left alone so the cached prefix stays the same.
+    """
+    system, user = messages
+    section_prompt, _, instruction = user['content'].rpartition(f"\n\n{SEPARATOR}\n\n")
+    parts = [f"""## EARLIER SECTIONS OF THIS REPORT
+
+These sections have already been written (condensed below). Build on their
+findings and keep facts, figures and scores consistent with them instead of
+re-deriving them."""]
+    for section, text in upstream:
+        parts.append(f"### Section {section.num}: {section.name}\n\n{text}")
+    content = f"{section_prompt}\n\n{SEPARATOR}\n\n" + '\n\n'.join(parts) + f"\n\n{SEPARATOR}\n\n{instruction}"
+    return [system, {'role': 'user', 'content': content}]
+
+
+def load_section_prompts(sections=SECTIONS):
+    """Load section prompts as (section, prompt), skipping (with a warning) any that are missing."""
+    prompts = []
+    for section in sections:
+        prompt_file = PROMPTS_DIR / 'sections' / f'section{section.num}-{section.slug}.md'
+        if not prompt_file.exists():
+            print(f"Warning: {prompt_file.relative_to(ROOT)} not found, skipping...")
+            continue
+        prompts.append((section, read_text(prompt_file)))
+    return prompts
+
+
+def load_prompts():
+    """Return (common instructions, [(section, prompt)]) for build_jobs."""
+    return read_text(PROMPTS_DIR / 'common-instructions.md'), load_section_prompts()
+
+
+def write_atomic(path, content):
+    """Write content to path so readers never see a half-written file."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def call_model(client, request, retry=None):
+    """Run one completion on the shared client and return the Completion."""
+    try:
+        return client.send(request, retry)
+    except OpenRouterError as e:
+        raise SectionError(str(e), e.status, getattr(e, 'attempts', 1)) from e
+    except OSError as e:
+        raise SectionError(f"Network error: {e}", attempts=getattr(e, 'attempts', 1)) from e
+
+
+def stream_model(client, request, output_file, retry=None):
+    """Stream one completion straight into output_file as tokens arrive."""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        def on_text(text):
+            f.write(text)
+            f.flush()
+
+        def on_retry():
+            # Discard the partial output of the failed attempt
+            f.seek(0)
+            f.truncate()
+        try:
+            completion = client.stream(request, on_text, on_retry, retry)
+        except OpenRouterError as e:
+            raise SectionError(f"{e}\n(partial output left in {output_file.name})",
+                               e.status, getattr(e, 'attempts', 1)) from e
+        except OSError as e:
+            raise SectionError(f"Network error: {e}\n(partial output left in {output_file.name})",
+                               attempts=getattr(e, 'attempts', 1)) from e
+        f.write('\n')
+    return completion
+
+
+def add_usage(usage, extra):
+    """Sum the token counts (and cost) of two calls."""
+    total = dict(usage)
+    for name in ('prompt_tokens', 'completion_tokens', 'total_tokens', 'cost'):
+        if extra.get(name) is not None:
+            total[name] = (total.get(name) or 0) + extra[name]
+    cached = (extra.get('prompt_tokens_details') or {}).get('cached_tokens')
+    if cached:
+        details = dict(total.get('prompt_tokens_details') or {})
+        details['cached_tokens'] = (details.get('cached_tokens') or 0) + cached
+        total['prompt_tokens_details'] = details
+    return total
+
+
+def repair_section(client, request, completion):
+    """Validate a generated section and fix it when it is broken.
+
+    A response cut off at max_tokens is continued from where it stopped; any
+    other unusable response (no HTML, unclosed structure) is regenerated. Only
+    this section is re-requested, at most MAX_REPAIRS times. Returns
+    (content, finish_reason, usage, repairs, problems); problems is empty when
+    the final HTML passed validation.
+    """
+    content = strip_fences(completion.content)
+    finish_reason = completion.finish_reason
+    usage = completion.usage or {}
+    problems = check_section(content, finish_reason)
+    repairs = 0
+    request = {k: v for k, v in request.items() if k != 'stream'}
+    while problems and repairs < MAX_REPAIRS:
+        repairs += 1
+        if finish_reason == 'length':
+            messages = request['messages'] + [{'role': 'assistant', 'content': content},
+                                              {'role': 'user', 'content': CONTINUE_PROMPT}]
+            extra = call_model(client, dict(request, messages=messages))
+            content += strip_fences(extra.content)
+        else:
+            extra = call_model(client, request)
+            content = strip_fences(extra.content)
+        finish_reason = extra.finish_reason
+        usage = add_usage(usage, extra.usage or {})
+        problems = check_section(content, finish_reason)
+    return content, finish_reason, usage, repairs, problems
+
+
+def generate_section(client, model, messages, output_file, cache=None, refresh=False, stream=False,
+                     router=None, max_tokens=DEFAULT_MAX_TOKENS):
+    """Generate one section and write it to output_file.
+
+    With a router, the request goes to the model its policy picks (falling back
+    or hedging as needed) instead of model, and repairs use the same model.
+    A cached response for the identical request is reused unless refresh is set.
+    With stream set, tokens are written to output_file as they arrive; otherwise
+    the file is written once the whole response is in. Code fences are
+    stripped and broken output is repaired (see repair_section) before the
+    final file is written. The result carries the call's phase timings (ms),
+    HTTP status, attempts and repairs for telemetry.
+    """
+    start = time.monotonic()
+    request = build_request(model, messages, max_tokens)
+    build = elapsed_ms(start)
+    entry = None
+    # A response from any model of the routing policy counts, in policy order
+    for candidate in (router.policy.models if router else [model]):
+        if not cache or refresh:
+            break
+        entry = cache.get(cache_key(request_for(request, candidate)))
+        # Entries cached before validation existed may hold broken output
+        if entry is not None and check_section(strip_fences(entry['content']), entry.get('finish_reason')):
+            entry = None
+        if entry is not None:
+            break
+    result = {'file': output_file.name, 'cached': entry is not None, 'timings': {'build': build},
+              'repairs': 0, 'problems': []}
+    if entry is not None and candidate != model:
+        result['routed_to'] = candidate
+
+    if entry is None:
+        try:
+            if router:
+                # A fallback or hedge may go to another provider, so the
+                # messages are shaped for the model each request goes to
+                if stream:
+                    send = lambda request, retry: stream_model(client, request_for(request, request['model']),
+                                                               output_file, retry)
+                else:
+                    send = lambda request, retry: call_model(client, request_for(request, request['model']), retry)
+                # A streamed section is written to one file, so it is never hedged
+                routed, completion = router.send(request, send, hedge=not stream)
+                request = request_for(request, routed)
+                if routed != model:
+                    result['routed_to'] = routed
+            elif stream:
+                completion = stream_model(client, request, output_file)
+            else:
+                completion = call_model(client, request)
+            if stream:
+                result.update(ttft=completion.ttft, tokens_per_sec=completion.tokens_per_sec)
+            content, finish_reason, usage, repairs, problems = repair_section(client, request, completion)
+        except SectionError as e:
+            e.seconds = time.monotonic() - start
+            raise
+        result.update(
+            status=completion.status,
+            attempts=completion.attempts,
+            timings=dict(completion.timings, build=round(build + completion.timings.get('build', 0), 1)),
+            repairs=repairs,
+            problems=problems,
+        )
+        entry = {
+            'content': content + '\n',
+            'model': completion.model,
+            'finish_reason': finish_reason,
+            'usage': usage,
+        }
+        # Never cache a broken response
+        if cache and not problems:
+            cache.put(cache_key(request), entry)
+
+    content = strip_fences(entry['content']) + '\n'
+    write_atomic(output_file, content)
+    result.update(
+        words=len(content.split()),
+        seconds=time.monotonic() - start,
+        # The model the request went to; providers echo back their own
+        # (often dated) id for it, which is kept separately
+        served_by=result.get('routed_to') or model,
+        provider_model=entry.get('model'),
+        finish_reason=entry.get('finish_reason'),
+        usage=entry.get('usage') or {},
+    )
+    return result
+
+
+def describe_result(result):
+    """One-line summary of a generated section for progress output."""
+    details = [f"{result['words']} words"]
+    if result.get('routed_to'):
+        details.append(f"via {result['routed_to']}")
+    if result['cached']:
+        details.append('cached')
+    else:
+        details.append(f"{result['seconds']:.1f}s")
+        if result.get('ttft') is not None:
+            details.append(f"TTFT {result['ttft']:.1f}s")
+        if result.get('tokens_per_sec'):
+            details.append(f"{result['tokens_per_sec']:.0f} tok/s")
+        if result.get('repairs'):
+            details.append(f"{result['repairs']} repair{'s' if result['repairs'] > 1 else ''}")
+    summary = f"{result['file']} ({', '.join(details)})"
+    if result['problems']:
+        summary += f" ⚠️  {'; '.join(result['problems'])}"
+    return summary
+
+
+def telemetry_record(job, result=None, error=None):
+    """Build the telemetry.jsonl record for a finished section job."""
+    record = {'type': 'section', 'report': job.report_dir.name, 'section': job.num,
+              'name': job.name, 'model': job.model}
+    if error is not None:
+        attempts = getattr(error, 'attempts', 1)
+        seconds = getattr(error, 'seconds', None)
+        record.update(
+            status='failed',
+            http_status=getattr(error, 'status', None),
+            attempts=attempts,
+            retries=attempts - 1,
+            timings_ms={'total': round(seconds * 1000, 1)} if seconds is not None else {},
+            error=getattr(error.__cause__, 'message', None) or str(error),
+        )
+        return record
+
+    usage = result['usage']
+    attempts = result.get('attempts', 0)
+    record.update(
+        status='cached' if result['cached'] else 'ok',
+        served_by=result['served_by'],
+        provider_model=result.get('provider_model'),
+        http_status=result.get('status'),
+        attempts=attempts,
+        retries=max(0, attempts - 1),
+        finish_reason=result['finish_reason'],
+        timings_ms=dict(result['timings'], total=round(result['seconds'] * 1000, 1)),
+        prompt_tokens=usage.get('prompt_tokens'),
+        # Prompt tokens the provider served from its prompt cache
+        cached_tokens=(usage.get('prompt_tokens_details') or {}).get('cached_tokens'),
+        completion_tokens=usage.get('completion_tokens'),
+        # A cache hit costs nothing; the token counts are those of the original call
+        cost_usd=0.0 if result['cached'] else estimate_cost(result.get('routed_to') or job.model, usage),
+        repairs=result['repairs'],
+        problems=result['problems'] or None,
+    )
+    return record
+
+
+@dataclass
+class SectionJob:
+    """One section request for one report."""
+    num: str
+    name: str
+    slug: str
+    model: str
+    messages: list
+    output_file: Path
+    refresh: bool = False
+    label: str = None  # prefix for progress output when several reports share a pool
+    project_file: Path = None
+    depends_on: tuple = ()  # section numbers whose output this section builds on
+
+    @property
+    def report_dir(self):
+        return self.output_file.parent
+
+
+def build_jobs(project_file, model, output_dir, refresh_sections=(), label=None, prompts=None, client=None,
+               project_data=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Build the section jobs for one report, creating its output directory.
+
+    prompts is the result of load_prompts(); it is read from disk when omitted.
+    project_data is the project text for the prompts. When omitted, the
+    project file is read, and a large description is replaced by its
+    condensed brief (see brief.py), built with client if it is not cached in
+    cache_dir yet.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    common_instructions, section_prompts = prompts or load_prompts()
+    if project_data is None:
+        project_data = condense_project(read_text(project_file), model, client, cache_dir=cache_dir)
+    jobs = []
+    for section, section_prompt in section_prompts:
+        jobs.append(SectionJob(
+            num=section.num, name=section.name, slug=section.slug, model=model,
+            messages=build_messages(common_instructions, section_prompt, project_data, model),
+            output_file=output_dir / section.file_name,
+            refresh=section.num in refresh_sections,
+            label=label,
+            project_file=Path(project_file),
+            depends_on=section.depends_on,
+        ))
+    return jobs
+
+
+def upstream_sections(job, max_chars=UPSTREAM_CHARS):
+    """Return [(section, condensed text)] for the sections a job depends on.
+
+    Upstream outputs are read from the report folder, so sections generated in
+    an earlier run count too; a missing file is left out.
+    """
+    by_num = {section.num: section for section in SECTIONS}
+    upstream = []
+    for num in job.depends_on:
+        section = by_num[num]
+        try:
+            text = read_text(job.report_dir / section.file_name)
+        except OSError:
+            continue
+        upstream.append((section, condense_section(text, max_chars)))
+    return upstream
+
+
+def prepare_job(job, history, models=None):
+    """Add the upstream sections to a job's prompt and size the request (see preflight.py).
+
+    models are the models the request may go to (default: the job's model).
+    A prompt too large for the smallest context window among them gets its
+    upstream sections condensed harder; if it still does not fit, a warning is
+    printed and it is sent anyway. Returns max_tokens for the request.
+    """
+    models = models or [job.model]
+    messages = job.messages
+    max_chars = UPSTREAM_CHARS
+    while True:
+        if job.depends_on:
+            messages = with_upstream(job.messages, upstream_sections(job, max_chars))
+        plan = plan_request(messages, models, job.num, history)
+        if plan.fits or not job.depends_on or max_chars // 2 < MIN_UPSTREAM_CHARS:
+            break
+        max_chars //= 2
+    label = f"[{job.label}] " if job.label else ''
+    if max_chars < UPSTREAM_CHARS:
+        print(f"  ⚠️  {label}Section {job.num}: {plan.describe()}; upstream sections condensed to "
+              f"{max_chars} characters", file=sys.stderr)
+    if not plan.fits:
+        print(f"  ⚠️  {label}Section {job.num}: {plan.describe()} - the request will probably be "
+              f"rejected; shorten the project file", file=sys.stderr)
+    job.messages = messages
+    return plan.max_tokens
+
+
+def run_jobs(jobs, client, concurrency=DEFAULT_CONCURRENCY, cache=None, stream=False,
+             cancel_on_failure=True, on_done=None, router=None):
+    """Run section jobs (possibly for several reports) on one bounded worker pool.
+
+    Sections run in parallel except where one depends on others of the same
+    report in this run: it starts once they have finished, with their condensed
+    output added to its prompt, and fails if one of them failed.
+    Each file is written as its section finishes. After a failure, jobs of the
+    same report that have not started yet are cancelled (unless
+    cancel_on_failure is False); other reports carry on. on_done(job, error)
+    is called from the calling thread as each job finishes, with error None on
+    success. Every finished job is recorded in its report's telemetry.jsonl,
+    followed by a summary record for the run, and merged into its manifest.json.
+    With a router, sections are sent to the models its policy picks.
+    Each request is sized by prepare_job, and the completion lengths are
+    remembered for the next run.
+    Returns {report_dir: [failed section numbers]} for every report.
+    """
+    failures = {job.report_dir: [] for job in jobs}
+    logs = {report_dir: RunLog(report_dir / TELEMETRY_FILE) for report_dir in failures}
+    unfinished = {(job.report_dir, job.num) for job in jobs}
+    waiting = list(jobs)
+    history = CompletionHistory(history_file(cache.directory if cache else DEFAULT_CACHE_DIR))
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    futures = {}
+    reported = set()
+
+    def fail(job, error, label):
+        failures[job.report_dir].append(job.num)
+        unfinished.discard((job.report_dir, job.num))
+        logs[job.report_dir].write(telemetry_record(job, error=error))
+        print(f"  ✗ {label}Section {job.num}: {job.name} failed\n{error}", file=sys.stderr)
+        if on_done:
+            on_done(job, error)
+        if cancel_on_failure:
+            for pending, other in futures.items():
+                if other.report_dir == job.report_dir:
+                    pending.cancel()
+            waiting[:] = [other for other in waiting if other.report_dir != job.report_dir]
+
+    def release():
+        """Submit every waiting job whose dependencies have finished."""
+        for job in list(waiting):
+            if any((job.report_dir, num) in unfinished for num in job.depends_on):
+                continue
+            waiting.remove(job)
+            failed = [num for num in job.depends_on if num in failures[job.report_dir]]
+            if failed:
+                fail(job, SectionError(f"Upstream section(s) failed: {', '.join(failed)}"),
+                     f"[{job.label}] " if job.label else '')
+                continue
+            max_tokens = prepare_job(job, history, router.policy.models if router else None)
+            future = executor.submit(generate_section, client, job.model, job.messages,
+                                     job.output_file, cache, job.refresh, stream, router, max_tokens)
+            futures[future] = job
+
+    try:
+        release()
+        while True:
+            running = [future for future in futures if future not in reported]
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = futures[future]
+                reported.add(future)
+                label = f"[{job.label}] " if job.label else ''
+                if future.cancelled():
+                    unfinished.discard((job.report_dir, job.num))
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    fail(job, e, label)
+                    continue
+                unfinished.discard((job.report_dir, job.num))
+                logs[job.report_dir].write(telemetry_record(job, result))
+                if not result['cached'] and not result['problems']:
+                    history.record(result.get('routed_to') or job.model, job.num,
+                                   result['usage'].get('completion_tokens'))
+                print(f"  ✓ {label}Section {job.num}: {job.name} -> {describe_result(result)}")
+                if on_done:
+                    on_done(job, None)
+            release()
+    except KeyboardInterrupt:
+        print("\nInterrupted - waiting for sections already in flight...", file=sys.stderr)
+        executor.shutdown(wait=True, cancel_futures=True)
+        # Record sections that finished while shutting down
+        for future, job in futures.items():
+            if future.done() and not future.cancelled() and future not in reported:
+                error = future.exception()
+                logs[job.report_dir].write(telemetry_record(job, None if error else future.result(), error))
+                if on_done:
+                    on_done(job, error)
+        raise
+    finally:
+        history.save()
+        for report_dir, log in logs.items():
+            run = log.finish()
+            if run:
+                update_manifest(report_dir, [job for job in jobs if job.report_dir == report_dir],
+                                log.records, run)
+    executor.shutdown(wait=True)
+
+    if cache:
+        cache.evict()
+    return failures
+
+
+def generate_sections(project_file, model, output_dir, concurrency=DEFAULT_CONCURRENCY,
+                      client=None, cache=None, refresh_sections=(), stream=False, router=None):
+    """Generate every section of one report concurrently.
+
+    All requests share one pooled client; pass client to reuse a pool across
+    several runs. Responses are served from cache when given, except for the
+    section numbers in refresh_sections. With stream set, each section file
+    fills in as tokens arrive. A router (see routing.py) picks the model per
+    section from its policy. Returns True when all sections succeeded.
+    """
+    if client is None:
+        rate = float(os.environ.get('VENTUREPULSE_RATE_LIMIT', DEFAULT_RATE))
+        limiter = TokenBucket(rate, burst=concurrency)
+        with OpenRouterClient(pool_size=concurrency, rate_limiter=limiter) as client:
+            return generate_sections(project_file, model, output_dir, concurrency, client,
+                                     cache, refresh_sections, stream, router)
+
+    jobs = build_jobs(project_file, model, output_dir, refresh_sections, client=client,
+                      cache_dir=cache.directory if cache else None)
+    print(f"Generating {len(jobs)} sections (concurrency {concurrency})...")
+    start = time.monotonic()
+    failed = run_jobs(jobs, client, concurrency, cache, stream, router=router).get(Path(output_dir), [])
+    elapsed = time.monotonic() - start
+
+    if failed:
+        print(f"Error: {len(failed)} section(s) failed: {', '.join(sorted(failed))}", file=sys.stderr)
+        return False
+    print(f"All sections generated in {elapsed:.1f}s")
+    return True
+
+
+def finalize_report(project_name, model, output_dir):
+    """Write the provenance section and the report wrapper (in-process, see render.py).
+
+    The provenance lists the model that produced each section, from manifest.json.
+    """
+    try:
+        write_provenance(project_name, model, output_dir)
+    except OSError as e:
+        print(f"Warning: Failed to generate provenance: {e}")
+    write_wrapper(project_name, output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='VenturePulse concurrent report generator')
+    parser.add_argument('project_file', help='Path to your project description (markdown or text)')
+    parser.add_argument('model', nargs='?', default=DEFAULT_MODEL,
+                        help=f'OpenRouter model to use (default: {DEFAULT_MODEL})')
+    parser.add_argument('--output-dir', help='Output directory (default: <project>-analysis-<model>-<timestamp>)')
+    parser.add_argument('--concurrency', type=int,
+                        default=int(os.environ.get('VENTUREPULSE_CONCURRENCY', DEFAULT_CONCURRENCY)),
+                        help=f'Maximum sections generated at once (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--sections-only', action='store_true',
+                        help='Only generate the AI sections; skip provenance and wrapper')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the response cache')
+    parser.add_argument('--refresh-section', action='append', default=[], metavar='NN',
+                        help='Ignore cached responses for this section (repeatable)')
+    parser.add_argument('--cache-dir', help='Response cache directory (default: ~/.cache/venturepulse)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream responses and write each section file as tokens arrive')
+    parser.add_argument('--fallback', action='append', default=[], metavar='MODEL',
+                        help='Model to use when the primary model fails or is slow (repeatable, in order)')
+    parser.add_argument('--latency-slo', type=float, metavar='SECONDS',
+                        help='Skip models whose median section latency exceeds this')
+    parser.add_argument('--hedge', action='store_true',
+                        help='Race a section that exceeds the latency SLO against the next fallback')
+    args = parser.parse_args()
+    refresh_sections = {n.zfill(2) for n in args.refresh_section}
+    cache = None if args.no_cache else ResponseCache(args.cache_dir or DEFAULT_CACHE_DIR)
+
+    if not Path(args.project_file).is_file():
+        print(f"Error: Project file not found: {args.project_file}", file=sys.stderr)
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir or default_output_dir(args.project_file, args.model))
+
+    router = None
+    if args.fallback or args.latency_slo or args.hedge:
+        router = Router(RoutingPolicy(args.model, args.fallback, args.latency_slo, args.hedge),
+                        StatsStore(stats_file(args.cache_dir or DEFAULT_CACHE_DIR)))
+    try:
+        ok = generate_sections(args.project_file, args.model, output_dir, args.concurrency,
+                               cache=cache, refresh_sections=refresh_sections,
+                               stream=args.stream, router=router)
+    except OpenRouterError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if router:
+            router.close()
+    if not ok:
+        sys.exit(1)
+
+    if args.sections_only:
+        return
+
+    finalize_report(project_slug(args.project_file), args.model, output_dir)
+    print(f"✓ Report saved to: {output_dir}/")
+
+
+if __name__ == '__main__':
+    main()
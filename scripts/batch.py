@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Batch Runner
+Analyses a directory (or glob) of idea files against one or more models. Every
+(project, model, section) is a row in a job queue persisted in SQLite, so an
+interrupted batch (crash or Ctrl-C) resumes from the last completed section.
+A failed section only affects its own report.
+
+Usage:
+    python3 batch.py <dir-or-glob> [...] --models <model> [<model> ...] [--output-root DIR]
+    python3 batch.py ideas/ --models google/gemini-2.5-flash openai/gpt-4o-mini
+    python3 batch.py ideas/ --models google/gemini-2.5-flash --retry-failed
+    python3 batch.py --status --output-root reports/
+
+Reports are written to <output-root>/<project>/<project>-analysis-<model>-<timestamp>/
+and each project folder gets a comparison index.html.
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from analyze import (
+    build_jobs, default_output_dir, finalize_report, load_section_prompts, project_slug, read_text,
+    run_jobs,
+)
+from brief import condense_project
+from cache import DEFAULT_CACHE_DIR, ResponseCache
+from createindex import build_index
+from openrouter import OpenRouterClient, OpenRouterError
+from ratelimit import DEFAULT_RATE, TokenBucket
+
+QUEUE_FILE = '.venturepulse-batch.sqlite'
+DEFAULT_CONCURRENCY = 16
+PROJECT_PATTERNS = ('*.md', '*.txt')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    project_file TEXT NOT NULL,
+    model TEXT NOT NULL,
+    output_dir TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',   -- pending | done | failed
+    created TEXT NOT NULL,
+    UNIQUE (project_file, model)
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    section TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',   -- pending | running | done | failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated TEXT,
+    PRIMARY KEY (report_id, section)
+);
+"""
+
+
+def now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class JobQueue:
+    """SQLite-backed queue with one row per report and one per section job.
+
+    Every status change is committed immediately so that the queue on disk
+    always reflects the last completed section.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def enqueue(self, project_file, model, output_dir, sections):
+        """Add a report and its section jobs unless it is already queued. Returns True if added."""
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO reports (project_file, model, output_dir, created) "
+                "VALUES (?, ?, ?, ?)",
+                (str(project_file), model, str(output_dir), now()),
+            )
+            if cursor.rowcount == 0:
+                return False
+            self.db.executemany(
+                "INSERT INTO jobs (report_id, section, updated) VALUES (?, ?, ?)",
+                [(cursor.lastrowid, section, now()) for section in sections],
+            )
+        return True
+
+    def recover(self, retry_failed=False):
+        """Requeue jobs left running by a crash (and failed jobs if retry_failed)."""
+        states = ('running', 'failed') if retry_failed else ('running',)
+        with self.db:
+            self.db.execute(
+                f"UPDATE jobs SET status = 'pending' WHERE status IN ({','.join('?' * len(states))})",
+                states,
+            )
+            if retry_failed:
+                self.db.execute("UPDATE reports SET status = 'pending' WHERE status = 'failed'")
+
+    def pending_jobs(self):
+        """Return pending jobs joined with their report details."""
+        return self.db.execute(
+            "SELECT r.id AS report_id, r.project_file, r.model, r.output_dir, j.section "
+            "FROM jobs j JOIN reports r ON r.id = j.report_id "
+            "WHERE j.status = 'pending' ORDER BY r.id, j.section"
+        ).fetchall()
+
+    def mark(self, report_id, section, status, error=None):
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated = ?, "
+                "attempts = attempts + (? = 'running') WHERE report_id = ? AND section = ?",
+                (status, error, now(), status, report_id, section),
+            )
+
+    def unfinished_reports(self):
+        """Return pending reports with their done/failed/total job counts."""
+        return self.db.execute(
+            "SELECT r.*, "
+            "SUM(j.status = 'done') AS done, SUM(j.status = 'failed') AS failed, "
+            "COUNT(*) AS total "
+            "FROM reports r JOIN jobs j ON j.report_id = r.id "
+            "WHERE r.status = 'pending' GROUP BY r.id"
+        ).fetchall()
+
+    def set_report_status(self, report_id, status):
+        with self.db:
+            self.db.execute("UPDATE reports SET status = ? WHERE id = ?", (status, report_id))
+
+    def summary(self):
+        """Return ({report status: count}, {job status: count})."""
+        reports = dict(self.db.execute("SELECT status, COUNT(*) FROM reports GROUP BY status").fetchall())
+        jobs = dict(self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return reports, jobs
+
+
+def find_project_files(sources):
+    """Expand directories and globs into a sorted list of project files."""
+    files = set()
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            for pattern in PROJECT_PATTERNS:
+                files.update(p for p in path.glob(pattern) if p.is_file())
+        elif glob.has_magic(source):
+            files.update(Path(p) for p in glob.glob(source, recursive=True) if Path(p).is_file())
+        elif path.is_file():
+            files.add(path)
+        else:
+            print(f"Warning: {source} not found, skipping")
+    return sorted(p.resolve() for p in files)
+
+
+def enqueue_projects(queue, project_files, models, output_root):
+    """Queue every project x model report that is not already in the queue.
+
+    Nothing is written for a report that is already queued; its output
+    directory is created when its sections run.
+    """
+    sections = [section.num for section, _ in load_section_prompts()]
+    added = 0
+    for project_file in project_files:
+        project_dir = output_root / project_slug(project_file)
+        for model in models:
+            output_dir = project_dir / default_output_dir(project_file, model)
+            if not queue.enqueue(project_file, model, output_dir, sections):
+                continue
+            added += 1
+            # createindex.py reads the project description from the project folder
+            if not (project_dir / project_file.name).exists():
+                project_dir.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(project_file, project_dir / project_file.name)
+    return added
+
+
+def run_pending(queue, concurrency, rate, cache, stream):
+    """Run every pending job. Returns the number of sections that failed."""
+    rows = queue.pending_jobs()
+    if not rows:
+        return 0
+
+    pending = {}
+    for row in rows:
+        pending.setdefault((row['report_id'], row['project_file'], row['model'], row['output_dir']),
+                           set()).add(row['section'])
+
+    def on_done(job, error):
+        queue.mark(report_ids[job.report_dir], job.num,
+                   'failed' if error else 'done', str(error) if error else None)
+
+    limiter = TokenBucket(rate, burst=concurrency)
+    with OpenRouterClient(pool_size=concurrency, rate_limiter=limiter) as client:
+        # Large projects are condensed once each, side by side, through the shared
+        # pool and rate limit, before their sections are queued
+        projects = {}
+        for _, project_file, model, _ in pending:
+            projects.setdefault(project_file, model)
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(projects)))) as executor:
+            condensed = executor.map(
+                lambda item: condense_project(read_text(item[0]), item[1], client,
+                                              cache_dir=cache.directory if cache else None),
+                projects.items())
+            project_data = dict(zip(projects, condensed))
+
+        jobs = []
+        report_ids = {}
+        for (report_id, project_file, model, output_dir), sections in pending.items():
+            label = f"{Path(project_file).stem} · {model}"
+            for job in build_jobs(project_file, model, output_dir, label=label,
+                                  project_data=project_data[project_file]):
+                if job.num in sections:
+                    jobs.append(job)
+                    report_ids[job.report_dir] = report_id
+                    queue.mark(report_id, job.num, 'running')
+
+        print(f"Running {len(jobs)} section jobs across {len(pending)} reports "
+              f"(concurrency {concurrency}, {rate:g} req/s)...")
+        failures = run_jobs(jobs, client, concurrency, cache, stream,
+                            cancel_on_failure=False, on_done=on_done)
+    return sum(len(failed) for failed in failures.values())
+
+
+def finish_reports(queue):
+    """Finalize reports whose sections are all done; mark those with failures."""
+    project_dirs = set()
+    for report in queue.unfinished_reports():
+        output_dir = Path(report['output_dir'])
+        if report['failed']:
+            queue.set_report_status(report['id'], 'failed')
+        elif report['done'] == report['total']:
+            finalize_report(project_slug(report['project_file']), report['model'], output_dir)
+            queue.set_report_status(report['id'], 'done')
+            project_dirs.add(output_dir.parent)
+    return project_dirs
+
+
+def print_summary(queue):
+    reports, jobs = queue.summary()
+    print(f"Queue: {queue.path}")
+    print("  Reports: " + ', '.join(f"{count} {status}" for status, count in sorted(reports.items())))
+    print("  Sections: " + ', '.join(f"{count} {status}" for status, count in sorted(jobs.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyse many project files with a resumable job queue')
+    parser.add_argument('sources', nargs='*', help='Project files, directories or globs')
+    parser.add_argument('--models', nargs='+', default=[], help='OpenRouter models to run')
+    parser.add_argument('--output-root', default='.', help='Where reports and the queue file live (default: .)')
+    parser.add_argument('--concurrency', type=int,
+                        default=int(os.environ.get('VENTUREPULSE_CONCURRENCY', DEFAULT_CONCURRENCY)),
+                        help=f'Maximum requests in flight (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--rate', type=float,
+                        default=float(os.environ.get('VENTUREPULSE_RATE_LIMIT', DEFAULT_RATE)),
+                        help=f'Global request rate limit in requests/sec (default: {DEFAULT_RATE:g})')
+    parser.add_argument('--retry-failed', action='store_true', help='Requeue previously failed sections')
+    parser.add_argument('--status', action='store_true', help='Show queue status and exit')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the response cache')
+    parser.add_argument('--stream', action='store_true', help='Stream responses into the section files')
+    args = parser.parse_args()
+
+    output_root = Path(args.output_root).resolve()
+    output_root.mkdir(parents=True, exist_ok=True)
+    queue = JobQueue(output_root / QUEUE_FILE)
+
+    if args.status:
+        print_summary(queue)
+        return
+
+    if args.sources:
+        if not args.models:
+            parser.error('--models is required when adding project files')
+        project_files = find_project_files(args.sources)
+        added = enqueue_projects(queue, project_files, args.models, output_root)
+        print(f"Found {len(project_files)} project file(s); queued {added} new report(s)")
+
+    queue.recover(retry_failed=args.retry_failed)
+    cache = None if args.no_cache else ResponseCache(DEFAULT_CACHE_DIR)
+
+    try:
+        failed = run_pending(queue, args.concurrency, args.rate, cache, args.stream)
+    except OpenRouterError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("Stopped. Completed sections are saved; run the same command again to resume.",
+              file=sys.stderr)
+        sys.exit(130)
+
+    for project_dir in sorted(finish_reports(queue)):
+        build_index(project_dir)
+
+    print()
+    print_summary(queue)
+    queue.close()
+    if failed:
+        print(f"{failed} section(s) failed; rerun with --retry-failed to try them again.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
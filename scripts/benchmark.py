@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Benchmark
+Runs the full pipeline (analyze -> provenance -> wrapper -> createindex.py)
+offline against the mock OpenRouter server at several concurrency levels and
+reports throughput (reports/min), p50/p95 section latency and peak memory, so
+performance regressions show up before they reach production.
+
+Usage:
+    python3 benchmark.py [--levels 1 4 8 16] [--reports 4] [--stream]
+    python3 benchmark.py --latency 2 --tokens-per-sec 80 --rate-limit-rate 0.1
+    python3 benchmark.py --json results.json              # save the results
+    python3 benchmark.py --baseline results.json          # exit 1 on a regression
+
+Every level runs in a fresh worker process with its own cache directory, so
+its peak memory is measured on its own and mock results never reach the
+real cache. Mock server options are the same as for mockserver.py.
+"""
+
+import argparse
+import json
+import math
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mockserver import MockServer, add_config_arguments, config_from_args
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PROJECT = ROOT / 'examples' / 'sample-project' / 'smartplate-idea.md'
+DEFAULT_LEVELS = [1, 4, 8, 16]
+DEFAULT_REPORTS = 4
+
+# Relative change against the baseline that counts as a regression
+DEFAULT_TOLERANCE = 0.15
+
+
+def percentile(values, p):
+    """Nearest-rank percentile (p in 0-100) of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def run_level(work_dir, project_file, reports, concurrency, stream):
+    """Run one benchmark level in this process and return its measurements."""
+    from analyze import build_jobs, default_output_dir, finalize_report, project_slug, run_jobs
+    from createindex import build_index
+    from openrouter import OpenRouterClient
+    from telemetry import read_log
+
+    project_dir = Path(work_dir) / project_slug(project_file)
+    project_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(project_file, project_dir / Path(project_file).name)
+    models = [f'mock/model-{i + 1}' for i in range(reports)]
+    output_dirs = {model: project_dir / default_output_dir(project_file, model) for model in models}
+
+    start = time.monotonic()
+    jobs = []
+    for model, output_dir in output_dirs.items():
+        jobs.extend(build_jobs(project_file, model, output_dir, label=model, cache_dir=None))
+    with OpenRouterClient(pool_size=concurrency) as client:
+        failures = run_jobs(jobs, client, concurrency, stream=stream)
+    generated = time.monotonic()
+
+    completed = [model for model, output_dir in output_dirs.items() if not failures.get(output_dir)]
+    for model in completed:
+        finalize_report(project_slug(project_file), model, output_dirs[model])
+    finalized = time.monotonic()
+    build_index(project_dir)
+    indexed = time.monotonic()
+
+    latencies = [record['timings_ms']['total']
+                 for output_dir in output_dirs.values() for record in read_log(output_dir)
+                 if record.get('type') == 'section' and record.get('status') == 'ok']
+    retries = sum(record.get('retries') or 0
+                  for output_dir in output_dirs.values() for record in read_log(output_dir)
+                  if record.get('type') == 'section')
+    wall = indexed - start
+    return {
+        'concurrency': concurrency,
+        'reports': reports,
+        'completed': len(completed),
+        'sections': len(jobs),
+        'failed_sections': sum(len(failed) for failed in failures.values()),
+        'retries': retries,
+        'generate_s': round(generated - start, 2),
+        'finalize_s': round(finalized - generated, 2),
+        'index_s': round(indexed - finalized, 3),
+        'wall_s': round(wall, 2),
+        'reports_per_min': round(len(completed) / wall * 60, 2) if wall else None,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'peak_mb': round(peak_memory_mb(), 1),
+    }
+
+
+def benchmark_level(args, concurrency, verbose=False):
+    """Start a mock server and run one level in a worker process."""
+    with MockServer(config_from_args(args)) as server, tempfile.TemporaryDirectory() as tmp:
+        result_file = Path(tmp) / 'result.json'
+        # Everything the worker caches stays in the temporary directory,
+        # away from the real cache
+        env = dict(os.environ, OPENROUTER_API_KEY='mock', OPENROUTER_BASE_URL=server.base_url,
+                   VENTUREPULSE_CACHE_DIR=str(Path(tmp) / 'cache'))
+        command = [sys.executable, __file__, '--worker', tmp, '--result', str(result_file),
+                   '--project', str(args.project), '--reports', str(args.reports),
+                   '--levels', str(concurrency)]
+        if args.stream:
+            command.append('--stream')
+        output = None if verbose else subprocess.DEVNULL
+        completed = subprocess.run(command, env=env, stdout=output, stderr=output)
+        if completed.returncode != 0 or not result_file.exists():
+            raise RuntimeError(f"Benchmark worker failed at concurrency {concurrency} "
+                               f"(exit {completed.returncode}); rerun with --verbose")
+        result = json.loads(result_file.read_text(encoding='utf-8'))
+        result['mock'] = dict(server.stats)
+        return result
+
+
+def print_results(results):
+    print(f"{'conc':>5} {'reports/min':>12} {'p50 ms':>8} {'p95 ms':>8} {'peak MB':>8} "
+          f"{'wall s':>7} {'gen s':>7} {'final s':>7} {'index s':>7} {'failed':>6} {'retries':>7}")
+    for r in results:
+        print(f"{r['concurrency']:>5} {r['reports_per_min']:>12.1f} {r['p50_ms'] or 0:>8.0f} "
+              f"{r['p95_ms'] or 0:>8.0f} {r['peak_mb']:>8.1f} {r['wall_s']:>7.1f} "
+              f"{r['generate_s']:>7.1f} {r['finalize_s']:>7.1f} {r['index_s']:>7.2f} "
+              f"{r['failed_sections']:>6} {r['retries']:>7}")
+
+
+def compare_results(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Print changes against a baseline run. Returns the list of regressions."""
+    previous = {r['concurrency']: r for r in baseline}
+    regressions = []
+    for r in results:
+        old = previous.get(r['concurrency'])
+        if not old:
+            continue
+        checks = [
+            ('reports/min', old['reports_per_min'], r['reports_per_min'], False),
+            ('p95 ms', old['p95_ms'], r['p95_ms'], True),
+            ('peak MB', old['peak_mb'], r['peak_mb'], True),
+        ]
+        for name, before, after, lower_is_better in checks:
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = change > tolerance if lower_is_better else change < -tolerance
+            marker = '  ⚠️  regression' if worse else ''
+            print(f"  concurrency {r['concurrency']:>3}: {name:<11} {before:>9.1f} -> {after:>9.1f} "
+                  f"({change:+.0%}){marker}")
+            if worse:
+                regressions.append((r['concurrency'], name))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the VenturePulse pipeline against a mock API')
+    parser.add_argument('--levels', type=int, nargs='+', default=DEFAULT_LEVELS,
+                        help=f'Concurrency levels to run (default: {" ".join(map(str, DEFAULT_LEVELS))})')
+    parser.add_argument('--reports', type=int, default=DEFAULT_REPORTS,
+                        help=f'Reports (models) generated per level (default: {DEFAULT_REPORTS})')
+    parser.add_argument('--project', default=str(DEFAULT_PROJECT), help='Project file to analyse')
+    parser.add_argument('--stream', action='store_true', help='Use streaming responses')
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--baseline', help='Compare against results saved with --json')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Relative change counted as a regression (default: {DEFAULT_TOLERANCE:g})')
+    parser.add_argument('--verbose', action='store_true', help='Show the pipeline output of each level')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    add_config_arguments(parser)
+    # Faster than a real model by default, so a full benchmark takes a few minutes
+    parser.set_defaults(tokens_per_sec=2000.0)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_level(args.worker, args.project, args.reports, args.levels[0], args.stream)
+        Path(args.result).write_text(json.dumps(result), encoding='utf-8')
+        return
+
+    print(f"Benchmarking {args.reports} reports per level, concurrency {', '.join(map(str, args.levels))} "
+          f"(mock latency {args.latency:g}s, {args.tokens_per_sec:g} tok/s)...")
+    results = []
+    for concurrency in args.levels:
+        try:
+            result = benchmark_level(args, concurrency, args.verbose)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"  ✓ concurrency {concurrency}: {result['reports_per_min']:.1f} reports/min")
+        results.append(result)
+
+    print()
+    print_results(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+        print(f"\n✓ Results saved to {args.json}")
+    if args.baseline:
+        print(f"\nAgainst {args.baseline}:")
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Error: {len(regressions)} regression(s) beyond {args.tolerance:.0%}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Project Brief
+A project description too large to send whole with every section prompt is
+condensed once into a brief: the text is split into chunks, the facts of each
+chunk are extracted in parallel (map), and the notes are merged into one
+brief (reduce, repeated in rounds when the notes are still too long). Briefs
+are cached by the hash of the input, so every section and every model of a
+run, and later runs, reuse the same one.
+
+Briefs are kept in <cache-dir>/briefs/, and are neither read nor saved when
+the response cache is turned off.
+
+Usage:
+    python3 brief.py <project-file> [model]     # print the brief (building it if needed)
+
+Environment:
+    VENTUREPULSE_BRIEF_THRESHOLD    Optional - project size in tokens above which a brief is used (default: 8000)
+    VENTUREPULSE_BRIEF_MODEL        Optional - model that writes briefs (default: the report's model)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from cache import DEFAULT_CACHE_DIR
+from openrouter import OpenRouterClient, OpenRouterError, build_request
+from preflight import count_tokens
+
+BRIEF_DIR_NAME = 'briefs'
+BRIEF_DIR = DEFAULT_CACHE_DIR / BRIEF_DIR_NAME
+# Bump when the prompts below change, so old briefs are rebuilt
+BRIEF_VERSION = 1
+
+DEFAULT_THRESHOLD = 8000        # tokens
+CHUNK_TOKENS = 6000
+REDUCE_INPUT_TOKENS = 24000     # notes merged in one reduce request
+BRIEF_WORDS = 2500
+NOTES_MAX_TOKENS = 4096
+BRIEF_MAX_TOKENS = 8192
+MAP_CONCURRENCY = 8
+
+MAP_PROMPT = """Below is part {part} of {parts} of a product or project description.
+
+Extract every fact that matters for a product viability analysis: the product and its features,
+target customers, market and competitors, pricing and business model, technology, team, traction,
+figures, constraints and open questions. Keep numbers, names and claims exactly as written.
+Output concise markdown bullet points under short headings, with no commentary.
+
+---
+
+{text}"""
+
+REDUCE_PROMPT = """Below are notes extracted, in order, from consecutive parts of one product or
+project description.
+
+Merge them into a single project brief of at most about {words} words. Keep every figure, name
+and distinctive claim; drop repetition. Output markdown with these headings: Product, Customers &
+Market, Competition, Business Model, Technology, Traction & Team, Constraints & Open Questions.
+No commentary before or after the brief.
+
+---
+
+{text}"""
+
+
+def brief_threshold():
+    return int(os.environ.get('VENTUREPULSE_BRIEF_THRESHOLD', DEFAULT_THRESHOLD))
+
+
+def brief_dir(cache_dir=DEFAULT_CACHE_DIR):
+    """The brief directory kept in a cache directory."""
+    return Path(cache_dir) / BRIEF_DIR_NAME
+
+
+def brief_key(text):
+    return hashlib.sha256(f'{BRIEF_VERSION}\n{text}'.encode('utf-8')).hexdigest()
+
+
+def split_chunks(text, max_tokens=CHUNK_TOKENS):
+    """Split text into chunks of at most about max_tokens, at headings or paragraph breaks."""
+    blocks = re.split(r'\n\s*\n|\n(?=#)', text)
+    chunks = []
+    current = []
+    size = 0
+    for block in blocks:
+        tokens = count_tokens(block)
+        if current and size + tokens > max_tokens:
+            chunks.append('\n\n'.join(current))
+            current, size = [], 0
+        # A single oversized paragraph is cut by length
+        while tokens > max_tokens:
+            cut = len(block) * max_tokens // tokens
+            chunks.append(block[:cut])
+            block = block[cut:]
+            tokens = count_tokens(block)
+        current.append(block)
+        size += tokens
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
+
+def complete(client, model, prompt, max_tokens):
+    return client.send(build_request(model, prompt, max_tokens=max_tokens)).content.strip()
+
+
+def build_brief(text, client, model, log=print):
+    """Condense text with map-reduce requests to model; returns the brief."""
+    chunks = split_chunks(text)
+
+    def extract(part):
+        prompt = MAP_PROMPT.format(part=part + 1, parts=len(chunks), text=chunks[part])
+        return complete(client, model, prompt, NOTES_MAX_TOKENS)
+
+    def merge(notes):
+        return complete(client, model, REDUCE_PROMPT.format(words=BRIEF_WORDS, text='\n\n'.join(notes)),
+                        BRIEF_MAX_TOKENS)
+
+    log(f"  Condensing the project description ({len(chunks)} parts) with {model}...")
+    with ThreadPoolExecutor(max_workers=min(MAP_CONCURRENCY, len(chunks))) as executor:
+        notes = list(executor.map(extract, range(len(chunks))))
+        # Merge groups of notes until they fit one reduce request
+        while sum(count_tokens(note) for note in notes) > REDUCE_INPUT_TOKENS and len(notes) > 1:
+            groups = [[]]
+            size = 0
+            for note in notes:
+                tokens = count_tokens(note)
+                if groups[-1] and size + tokens > REDUCE_INPUT_TOKENS:
+                    groups.append([])
+                    size = 0
+                groups[-1].append(note)
+                size += tokens
+            if len(groups) == len(notes):
+                break
+            notes = list(executor.map(merge, groups))
+    return merge(notes)
+
+
+def load_brief(key, directory=BRIEF_DIR):
+    try:
+        with open(Path(directory) / f'{key}.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_brief(key, entry, directory=BRIEF_DIR):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = directory / f'{key}.json.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_path, directory / f'{key}.json')
+
+
+def condense_project(text, model, client=None, log=print, cache_dir=DEFAULT_CACHE_DIR):
+    """The project text to put in every section prompt: text itself, or its brief when text is large.
+
+    The brief is read from the briefs of cache_dir, or built with client (a
+    temporary client when None) and saved there; with cache_dir None it is
+    always built and not saved. If it cannot be built, the full text is used.
+    """
+    tokens = count_tokens(text)
+    threshold = brief_threshold()
+    if not threshold or tokens <= threshold:
+        return text
+    key = brief_key(text)
+    entry = load_brief(key, brief_dir(cache_dir)) if cache_dir else None
+    if entry is None:
+        brief_model = os.environ.get('VENTUREPULSE_BRIEF_MODEL') or model
+        try:
+            if client is None:
+                with OpenRouterClient() as client:
+                    brief = build_brief(text, client, brief_model, log)
+            else:
+                brief = build_brief(text, client, brief_model, log)
+        except (OpenRouterError, OSError) as e:
+            print(f"Warning: Could not condense the project description ({e}); sending it in full",
+                  file=sys.stderr)
+            return text
+        if not brief:
+            print("Warning: The condensed brief came back empty; sending the project description in full",
+                  file=sys.stderr)
+            return text
+        entry = {'model': brief_model, 'source_tokens': tokens, 'created': datetime.now().isoformat(),
+                 'brief': brief}
+        if cache_dir:
+            save_brief(key, entry, brief_dir(cache_dir))
+    log(f"  Using the condensed brief of the project description "
+        f"(~{entry['source_tokens']:,} -> ~{count_tokens(entry['brief']):,} tokens, by {entry['model']})")
+    return (f"(Condensed brief of a ~{entry['source_tokens']:,}-token project description.)\n\n"
+            f"{entry['brief']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print the condensed brief used for a large project description')
+    parser.add_argument('project_file', help='Path to your project description (markdown or text)')
+    parser.add_argument('model', nargs='?', help='Model that writes the brief (default: the analysis default)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='Cache directory holding the briefs (default: ~/.cache/venturepulse)')
+    args = parser.parse_args()
+
+    from analyze import DEFAULT_MODEL, read_text
+    try:
+        text = read_text(args.project_file)
+    except OSError as e:
+        print(f"Error: Could not read {args.project_file}: {e}", file=sys.stderr)
+        sys.exit(1)
+    log = lambda message: print(message, file=sys.stderr)
+    data = condense_project(text, args.model or DEFAULT_MODEL, log=log, cache_dir=args.cache_dir)
+    if data is text:
+        log(f"{args.project_file} is ~{count_tokens(text):,} tokens, under the "
+            f"{brief_threshold():,}-token threshold; it is sent in full")
+    print(data)
+
+
+if __name__ == '__main__':
+    main()
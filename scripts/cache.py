@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Response Cache
+Content-addressed on-disk cache of LLM responses, keyed on the model, the full
+prompt and the sampling parameters (temperature, top_p). max_tokens is left
+out: it is sized per run (see preflight.py), and a response cut off by it is
+never cached.
+
+Usage:
+    python3 cache.py --stats
+    python3 cache.py --evict
+    python3 cache.py --clear
+
+Environment:
+    VENTUREPULSE_CACHE_DIR    Optional - cache location (default: ~/.cache/venturepulse)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('VENTUREPULSE_CACHE_DIR', '~/.cache/venturepulse')).expanduser()
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Request fields that determine the response; anything else is ignored
+KEY_FIELDS = ('model', 'messages', 'temperature', 'top_p')
+# Entry subdirectories (the first two hex digits of the key); anything else
+# in the cache directory is left alone
+ENTRY_DIRS = '[0-9a-f][0-9a-f]'
+
+
+def cache_key(request):
+    """Return the content hash for a chat-completions request body."""
+    material = {name: request.get(name) for name in KEY_FIELDS}
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Stores one JSON file per response under <directory>/<key[:2]>/<key>.json.
+
+    Entries older than max_age_days are treated as missing. evict() removes
+    expired entries and then the least recently used ones until the cache
+    fits in max_bytes.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+
+    def path(self, key):
+        return self.directory / key[:2] / f'{key}.json'
+
+    def get(self, key):
+        """Return the cached entry for key, or None."""
+        path = self.path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        if time.time() - stat.st_mtime > self.max_age:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Record the hit so LRU eviction keeps entries that are still in use
+        os.utime(path, (time.time(), stat.st_mtime))
+        return entry
+
+    def put(self, key, entry):
+        """Store entry (a JSON-serialisable dict) under key."""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(entry, cached_at=time.time()), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def entries(self):
+        """Yield (path, stat) for every cache entry."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob(f'{ENTRY_DIRS}/*.json'):
+            try:
+                yield path, path.stat()
+            except FileNotFoundError:
+                continue
+
+    def evict(self):
+        """Apply age- and size-based eviction. Returns the number of entries removed."""
+        now = time.time()
+        removed = 0
+        live = []
+        for path, stat in self.entries():
+            if now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                live.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+
+        total = sum(size for _, size, _ in live)
+        for _, size, path in sorted(live):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self):
+        """Return (entry count, total bytes)."""
+        count = total = 0
+        for _, stat in self.entries():
+            count += 1
+            total += stat.st_size
+        return count, total
+
+    def clear(self):
+        """Delete every response entry, keeping the other files in the cache directory."""
+        for path in self.directory.glob(ENTRY_DIRS):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='VenturePulse response cache maintenance')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Cache directory')
+    parser.add_argument('--max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Size limit used by --evict')
+    parser.add_argument('--max-age-days', type=int, default=DEFAULT_MAX_AGE_DAYS,
+                        help='Age limit used by --evict')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--stats', action='store_true', help='Show entry count and size (default)')
+    group.add_argument('--evict', action='store_true', help='Remove expired and least recently used entries')
+    group.add_argument('--clear', action='store_true', help='Delete every cached response')
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.cache_dir, args.max_mb * 1024 * 1024, args.max_age_days)
+    if args.clear:
+        cache.clear()
+        print(f"✓ Cleared the cached responses in {cache.directory}")
+    elif args.evict:
+        print(f"✓ Evicted {cache.evict()} entries")
+    count, total = cache.stats()
+    print(f"Cache: {cache.directory} ({count} entries, {total / (1024 * 1024):.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
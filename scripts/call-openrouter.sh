@@ -3,14 +3,21 @@
 
 set -e
 
-# Check arguments
-if [ $# -ne 2 ]; then
-    echo "Usage: $0 <model> <prompt>" >&2
+# Check arguments: the prompt is read from files (joined by blank lines), or
+# from stdin when none are given, so it never has to fit in an argument
+if [ $# -lt 1 ]; then
+    echo "Usage: $0 <model> [prompt-file ...]    (prompt read from stdin without files)" >&2
     exit 1
 fi
 
 MODEL="$1"
-PROMPT="$2"
+shift
+for PROMPT_FILE in "$@"; do
+    if [ "$PROMPT_FILE" != "-" ] && [ ! -f "$PROMPT_FILE" ]; then
+        echo "Error: Prompt file not found: $PROMPT_FILE" >&2
+        exit 1
+    fi
+done
 
 VENTUREPULSE_DEBUG=""
 VENTUREPULSE_TIMING=""
@@ -31,25 +38,24 @@ fi
 # Time: Creating request body
 REQUEST_START=$(date +%s)
 
-# Create temporary file for request body
+# Create temporary files for the request and response bodies
 TEMP_REQUEST=$(mktemp)
-trap "rm -f $TEMP_REQUEST" EXIT
-
-# Build JSON request (using jq for proper escaping)
-cat > "$TEMP_REQUEST" << EOF
-{
-    "model": "$MODEL",
-    "messages": [
-        {
-            "role": "user",
-            "content": $(echo "$PROMPT" | jq -Rs .)
-        }
-    ],
-    "max_tokens": 25192,
-    "temperature": 0.7,
-    "top_p": 0.95
-}
-EOF
+TEMP_RESPONSE=$(mktemp)
+trap "rm -f $TEMP_REQUEST $TEMP_RESPONSE" EXIT
+
+# Build JSON request (jq reads the prompt from the pipe and does the escaping)
+if [ $# -eq 0 ]; then
+    cat
+else
+    SEPARATOR=""
+    for PROMPT_FILE in "$@"; do
+        printf '%b' "$SEPARATOR"
+        cat -- "$PROMPT_FILE"
+        SEPARATOR='\n\n'
+    done
+fi | jq -Rs --arg model "$MODEL" --argjson max_tokens "${VENTUREPULSE_MAX_TOKENS:-25192}" \
+    '{model: $model, messages: [{role: "user", content: .}], max_tokens: $max_tokens,
+      temperature: 0.7, top_p: 0.95}' > "$TEMP_REQUEST"
 
 REQUEST_END=$(date +%s)
 REQUEST_TIME=$((REQUEST_END - REQUEST_START))
@@ -57,13 +63,13 @@ REQUEST_TIME=$((REQUEST_END - REQUEST_START))
 # Time: API call
 API_START=$(date +%s)
 
-# Call OpenRouter API
-RESPONSE=$(curl -s https://openrouter.ai/api/v1/chat/completions \
+# Call OpenRouter API (the response is kept in a file, not a shell variable)
+curl -s "${OPENROUTER_BASE_URL:-https://openrouter.ai/api/v1}/chat/completions" -o "$TEMP_RESPONSE" \
     -H "Content-Type: application/json" \
     -H "Authorization: Bearer ${OPENROUTER_API_KEY}" \
     -H "HTTP-Referer: https://github.com/knightsri/VenturePulse" \
     -H "X-Title: VenturePulse CLI v1.0" \
-    -d @"$TEMP_REQUEST")
+    -d @"$TEMP_REQUEST"
 
 API_END=$(date +%s)
 API_TIME=$((API_END - API_START))
@@ -72,9 +78,9 @@ API_TIME=$((API_END - API_START))
 PARSE_START=$(date +%s)
 
 # Check for API errors
-if echo "$RESPONSE" | jq -e '.error' > /dev/null 2>&1; then
-    ERROR_TYPE=$(echo "$RESPONSE" | jq -r '.error.code // "unknown"')
-    ERROR_MSG=$(echo "$RESPONSE" | jq -r '.error.message // "Unknown error"')
+if jq -e '.error' "$TEMP_RESPONSE" > /dev/null 2>&1; then
+    ERROR_TYPE=$(jq -r '.error.code // "unknown"' "$TEMP_RESPONSE")
+    ERROR_MSG=$(jq -r '.error.message // "Unknown error"' "$TEMP_RESPONSE")
     
     echo "Error from OpenRouter API:" >&2
     echo "  Type: $ERROR_TYPE" >&2
@@ -102,14 +108,14 @@ if echo "$RESPONSE" | jq -e '.error' > /dev/null 2>&1; then
 fi
 
 # Check if response has choices
-if ! echo "$RESPONSE" | jq -e '.choices[0]' > /dev/null 2>&1; then
+if ! jq -e '.choices[0]' "$TEMP_RESPONSE" > /dev/null 2>&1; then
     echo "Error: Unexpected API response format" >&2
-    echo "Response: $RESPONSE" >&2
+    echo "Response: $(cat "$TEMP_RESPONSE")" >&2
     exit 1
 fi
 
 # Extract and output the content
-echo "$RESPONSE" | jq -r '.choices[0].message.content'
+jq -r '.choices[0].message.content' "$TEMP_RESPONSE"
 
 PARSE_END=$(date +%s)
 PARSE_TIME=$((PARSE_END - PARSE_START))
@@ -129,7 +135,7 @@ fi
 
 # Also log usage statistics if available
 if [ -n "$VENTUREPULSE_DEBUG" ]; then
-    USAGE=$(echo "$RESPONSE" | jq -r '.usage // empty')
+    USAGE=$(jq -r '.usage // empty' "$TEMP_RESPONSE")
     if [ -n "$USAGE" ]; then
         echo "📊 Token usage: $USAGE" >&2
     fi
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Multi-Model Comparison
+Runs one project file against several models in a single invocation. Every
+model x section request goes through one shared worker pool and one global
+rate limiter, then the comparison index.html is generated automatically.
+
+Usage:
+    python3 compare.py <project-file> <model> [<model> ...] [--concurrency N] [--rate R]
+    python3 compare.py my-idea.md google/gemini-2.5-flash openai/gpt-4o-mini anthropic/claude-sonnet-4.5
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from analyze import (
+    build_jobs, finalize_report, model_slug, project_slug, read_text, run_jobs,
+)
+from brief import condense_project
+from cache import DEFAULT_CACHE_DIR, ResponseCache
+from createindex import build_index
+from openrouter import OpenRouterClient, OpenRouterError
+from ratelimit import DEFAULT_RATE, TokenBucket
+
+DEFAULT_CONCURRENCY = 16
+
+
+def run_comparison(project_file, models, output_root, concurrency=DEFAULT_CONCURRENCY,
+                   rate=DEFAULT_RATE, cache=None, stream=False):
+    """Generate one report per model and index them. Returns the failed models."""
+    output_root = Path(output_root)
+    # A model listed twice would write the same report folder twice
+    models = list(dict.fromkeys(models))
+    timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    project_name = project_slug(project_file)
+
+    report_dirs = {}
+    for model in models:
+        folder = f"{project_name}-analysis-{model_slug(model)}-{timestamp}"
+        output_dir = output_root / folder
+        # Distinct models can share a slug (e.g. the same model from two providers)
+        suffix = 2
+        while output_dir in report_dirs.values():
+            output_dir = output_root / f"{folder}-{suffix}"
+            suffix += 1
+        report_dirs[model] = output_dir
+
+    limiter = TokenBucket(rate, burst=concurrency)
+    with OpenRouterClient(pool_size=concurrency, rate_limiter=limiter) as client:
+        # A large project is condensed once, through the shared pool and rate limit
+        project_data = condense_project(read_text(project_file), models[0], client,
+                                        cache_dir=cache.directory if cache else None)
+        jobs = []
+        for model, output_dir in report_dirs.items():
+            jobs.extend(build_jobs(project_file, model, output_dir, label=model, project_data=project_data))
+
+        print(f"Generating {len(jobs)} sections for {len(models)} models "
+              f"(concurrency {concurrency}, {rate:g} req/s)...")
+        start = time.monotonic()
+        failures = run_jobs(jobs, client, concurrency, cache, stream)
+    print(f"Sections finished in {time.monotonic() - start:.1f}s")
+
+    failed_models = []
+    for model, output_dir in report_dirs.items():
+        if failures.get(output_dir):
+            failed_models.append(model)
+            print(f"  ✗ {model}: section(s) {', '.join(sorted(failures[output_dir]))} failed; "
+                  f"report not finalized", file=sys.stderr)
+            continue
+        finalize_report(project_name, model, output_dir)
+        print(f"  ✓ {model}: {output_dir}/")
+
+    if len(failed_models) < len(models):
+        print()
+        build_index(output_root)
+    return failed_models
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run one project against several models')
+    parser.add_argument('project_file', help='Path to your project description (markdown or text)')
+    parser.add_argument('models', nargs='+', help='OpenRouter models to compare')
+    parser.add_argument('--output-root',
+                        help='Directory for the reports and index.html (default: the project file\'s directory)')
+    parser.add_argument('--concurrency', type=int,
+                        default=int(os.environ.get('VENTUREPULSE_CONCURRENCY', DEFAULT_CONCURRENCY)),
+                        help=f'Maximum requests in flight across all models (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--rate', type=float,
+                        default=float(os.environ.get('VENTUREPULSE_RATE_LIMIT', DEFAULT_RATE)),
+                        help=f'Global request rate limit in requests/sec, 0 to disable (default: {DEFAULT_RATE:g})')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the response cache')
+    parser.add_argument('--stream', action='store_true', help='Stream responses into the section files')
+    args = parser.parse_args()
+
+    project_file = Path(args.project_file)
+    if not project_file.is_file():
+        print(f"Error: Project file not found: {project_file}", file=sys.stderr)
+        sys.exit(1)
+
+    output_root = Path(args.output_root) if args.output_root else project_file.resolve().parent
+    cache = None if args.no_cache else ResponseCache(DEFAULT_CACHE_DIR)
+
+    try:
+        failed = run_comparison(project_file, args.models, output_root, args.concurrency,
+                                args.rate, cache, args.stream)
+    except OpenRouterError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Cross-Model Consensus
+Compares what the models of a multi-model comparison actually said, section
+by section. Every section is sketched once with MinHash over its word
+shingles; from the sketches it derives:
+
+- an agreement matrix: for each section and model, the estimated similarity
+  (Jaccard) of that model's section to the same section of every other model;
+- agreed claims: sentences that at least half of the models make in
+  near-identical words (candidate pairs found with locality-sensitive hashing);
+- disputed figures: headline numbers (TAM, CAGR, CAC, ...) the models
+  disagree on by more than DISPUTE_RATIO.
+
+Both steps grow roughly linearly with the number of models. Sketches are
+cached per folder fingerprint in .venturepulse-consensus.json, so only new
+or changed reports are re-read; createindex.py renders the result on the
+comparison page.
+
+Usage:
+    python3 consensus.py <project-dir>      # print the matrix, agreed claims and disputes
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from search import SECTION_GLOB, SECTION_NAMES, section_text, tokenize
+
+CONSENSUS_CACHE_FILE = '.venturepulse-consensus.json'
+CONSENSUS_VERSION = 1
+
+# MinHash slots for section sketches and for (shorter) claims
+SECTION_HASHES = 128
+CLAIM_HASHES = 32
+# LSH bands for claims: 8 bands of 4 rows find pairs with Jaccard above ~0.5
+CLAIM_BANDS = 8
+CLAIM_SIMILARITY = 0.5
+CLAIM_WORDS = (8, 45)
+MAX_CLAIMS = 3
+
+# Highest/lowest value of a figure above which the models disagree
+DISPUTE_RATIO = 1.5
+
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9$])')
+# Headline figures worth comparing between models, by the words that introduce them
+FIGURES = {
+    'TAM': r'\btam\b|total addressable market',
+    'SAM': r'\bsam\b|serviceable (?:addressable|available) market',
+    'SOM': r'\bsom\b|serviceable obtainable market',
+    'CAGR': r'\bcagr\b|annual growth',
+    'CAC': r'\bcac\b|customer acquisition cost',
+    'LTV': r'\bltv\b|\bclv\b|lifetime value',
+    'Churn': r'\bchurn\b',
+}
+PERCENT_FIGURES = ('CAGR', 'Churn')
+# The figure's number must follow its keyword within this many characters
+FIGURE_REACH = 40
+FIGURE_RES = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in FIGURES.items()}
+NUMBER_RE = re.compile(
+    r'(\$)?(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*(%|[kmbt]\b|thousand|million|billion|trillion)?',
+    re.IGNORECASE)
+SCALES = {'k': 1e3, 'thousand': 1e3, 'm': 1e6, 'million': 1e6, 'b': 1e9, 'billion': 1e9,
+          't': 1e12, 'trillion': 1e12}
+
+
+def minhash(shingles, hashes=SECTION_HASHES):
+    """MinHash signature of a set of strings (empty sets get an all-zero signature).
+
+    One SHAKE-128 digest per shingle supplies an independent 32-bit hash for
+    every slot, so the signature is a column-wise minimum.
+    """
+    rows = [array('I', hashlib.shake_128(shingle.encode('utf-8')).digest(4 * hashes))
+            for shingle in set(shingles)]
+    if not rows:
+        return [0] * hashes
+    return list(map(min, zip(*rows)))
+
+
+def shingles(terms):
+    """Words and word pairs: paraphrases share few longer shingles."""
+    return terms + [f'{a} {b}' for a, b in zip(terms, terms[1:])]
+
+
+def parse_figure(sentence, name):
+    """The first number after the figure's keyword in a sentence, as a float, or None."""
+    keyword = FIGURE_RES[name].search(sentence)
+    if not keyword:
+        return None
+    percent = name in PERCENT_FIGURES
+    for match in NUMBER_RE.finditer(sentence, keyword.end(), keyword.end() + FIGURE_REACH):
+        dollar, number, unit = match.groups()
+        unit = (unit or '').lower()
+        if percent != (unit == '%'):
+            continue
+        if not percent and not dollar:
+            continue
+        value = float(number.replace(',', '')) * SCALES.get(unit, 1)
+        if value > 0:
+            return value
+    return None
+
+
+def sketch_section(text):
+    """Sketch of one section: MinHash signature, candidate claims and headline figures."""
+    lines = [line.lstrip('#- ').strip() for line in text.split('\n')]
+    sentences = [sentence for line in lines for sentence in SENTENCE_RE.split(line) if sentence]
+    claims = []
+    figures = {}
+    for sentence in sentences:
+        for name in FIGURES:
+            if name not in figures:
+                value = parse_figure(sentence, name)
+                if value is not None:
+                    figures[name] = value
+        words = len(sentence.split())
+        if CLAIM_WORDS[0] <= words <= CLAIM_WORDS[1] and not sentence.count(' | ') > 2:
+            claims.append(sentence)
+    return {'signature': minhash(shingles(tokenize(text))), 'claims': claims, 'figures': figures}
+
+
+def sketch_folder(folder):
+    """{section number: sketch} for a report folder."""
+    sketches = {}
+    for path in sorted(Path(folder).glob(SECTION_GLOB)):
+        try:
+            sketches[path.name[7:9]] = sketch_section(section_text(path))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Warning: Could not read {path}: {e}")
+    return sketches
+
+
+def agreement_scores(signatures):
+    """Mean estimated Jaccard similarity of each signature to all the others.
+
+    Counting equal minima per hash slot gives every model's mean pairwise
+    similarity in O(models x hashes) instead of comparing every pair.
+    """
+    if len(signatures) < 2:
+        return [None] * len(signatures)
+    slots = [Counter(values) for values in zip(*signatures)]
+    others = len(signatures) - 1
+    return [sum(counts[value] - 1 for counts, value in zip(slots, signature)) / (len(slots) * others)
+            for signature in signatures]
+
+
+def agreed_claims(claims_by_model, min_models):
+    """Claims made (in near-identical words) by at least min_models models.
+
+    claims_by_model is [(model, [sentence])]. Returns [(sentence, [models])],
+    most widely shared first.
+    """
+    claims = []
+    signatures = []
+    for model, sentences in claims_by_model:
+        for sentence in sentences:
+            claims.append((model, sentence))
+            signatures.append(minhash(shingles(tokenize(sentence)), CLAIM_HASHES))
+
+    # Union sentences that share an LSH band and really are similar
+    parent = list(range(len(claims)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = CLAIM_HASHES // CLAIM_BANDS
+    for band in range(CLAIM_BANDS):
+        buckets = defaultdict(list)
+        for i, signature in enumerate(signatures):
+            buckets[tuple(signature[band * rows:(band + 1) * rows])].append(i)
+        for members in buckets.values():
+            for i in members[1:]:
+                first = members[0]
+                if claims[i][0] == claims[first][0] or find(i) == find(first):
+                    continue
+                same = sum(a == b for a, b in zip(signatures[i], signatures[first])) / CLAIM_HASHES
+                if same >= CLAIM_SIMILARITY:
+                    parent[find(i)] = find(first)
+
+    groups = defaultdict(list)
+    for i in range(len(claims)):
+        groups[find(i)].append(i)
+    agreed = []
+    for members in groups.values():
+        models = list(dict.fromkeys(claims[i][0] for i in members))
+        if len(models) >= min_models:
+            # The shortest wording stands for the group
+            agreed.append((min((claims[i][1] for i in members), key=len), models))
+    agreed.sort(key=lambda item: (-len(item[1]), item[0]))
+    return agreed
+
+
+def disputed_figures(figures_by_model):
+    """Figures whose values differ by more than DISPUTE_RATIO between models.
+
+    figures_by_model is [(model, {figure: value})]. Returns
+    [(figure, [(model, value)] sorted by value)].
+    """
+    values = defaultdict(list)
+    for model, figures in figures_by_model:
+        for name, value in figures.items():
+            values[name].append((model, value))
+    disputes = []
+    for name in FIGURES:
+        found = sorted(values.get(name, []), key=lambda item: item[1])
+        if len(found) >= 2 and found[-1][1] / found[0][1] > DISPUTE_RATIO:
+            disputes.append((name, found))
+    return disputes
+
+
+def format_figure(name, value):
+    """A figure as the reports write it: "12%", "$4.5B", "$180"."""
+    if name in PERCENT_FIGURES:
+        return f'{value:g}%'
+    for unit, scale in (('T', 1e12), ('B', 1e9), ('M', 1e6), ('K', 1e3)):
+        if value >= scale:
+            return f'${value / scale:.3g}{unit}'
+    return f'${value:,.2f}'.removesuffix('.00')
+
+
+def load_consensus_cache(target_dir):
+    try:
+        with open(Path(target_dir) / CONSENSUS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) and cache.get('version') == CONSENSUS_VERSION else {}
+
+
+def build_consensus(target_dir, folders, use_cache=True, log=print):
+    """Compare the sections of a project's analysis folders.
+
+    folders maps folder names to (fingerprint, model label). Returns None for
+    fewer than two folders, otherwise {'models': [...], 'sections': [{'num',
+    'name', 'scores' (one per model, None when missing), 'agreed',
+    'disputed'}]}. Folder sketches and the last result are cached per
+    fingerprint.
+    """
+    if len(folders) < 2:
+        return None
+    target_dir = Path(target_dir)
+    cache = load_consensus_cache(target_dir) if use_cache else {}
+    cached_folders = cache.get('folders', {})
+    key = hashlib.sha256(json.dumps(sorted((name, fp, model) for name, (fp, model) in folders.items()))
+                         .encode('utf-8')).hexdigest()
+    if cache.get('key') == key:
+        return cache['result']
+
+    sketched = {}
+    rescanned = 0
+    for name, (fingerprint, _) in folders.items():
+        cached = cached_folders.get(name)
+        if cached and cached['fingerprint'] == fingerprint:
+            sketched[name] = cached
+        else:
+            sketched[name] = {'fingerprint': fingerprint, 'sections': sketch_folder(target_dir / name)}
+            rescanned += 1
+
+    names = sorted(folders, key=lambda name: (folders[name][1], name))
+    models = [folders[name][1] for name in names]
+    min_models = max(2, math.ceil(len(names) / 2))
+    sections = []
+    nums = sorted({num for entry in sketched.values() for num in entry['sections']})
+    for num in nums:
+        present = [(i, sketched[name]['sections'][num]) for i, name in enumerate(names)
+                   if num in sketched[name]['sections']]
+        scores = [None] * len(names)
+        for (i, _), score in zip(present, agreement_scores([sketch['signature'] for _, sketch in present])):
+            scores[i] = round(score, 3) if score is not None else None
+        agreed = agreed_claims([(models[i], sketch['claims']) for i, sketch in present], min_models)
+        disputed = disputed_figures([(models[i], sketch['figures']) for i, sketch in present])
+        sections.append({
+            'num': num,
+            'name': SECTION_NAMES.get(num, f'Section {num}'),
+            'scores': scores,
+            'agreed': [[text, agreeing] for text, agreeing in agreed[:MAX_CLAIMS]],
+            'disputed': [[figure, [[model, format_figure(figure, value)] for model, value in found]]
+                         for figure, found in disputed],
+        })
+    result = {'models': models, 'sections': sections}
+
+    tmp_path = target_dir / f'{CONSENSUS_CACHE_FILE}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CONSENSUS_VERSION, 'folders': sketched, 'key': key, 'result': result}, f,
+                  ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, target_dir / CONSENSUS_CACHE_FILE)
+    log(f"  Consensus: {len(sections)} sections across {len(models)} models ({rescanned} folder(s) re-read)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the sections of a project\'s model analyses')
+    parser.add_argument('directory', help='Project directory containing analysis folders')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the consensus cache')
+    args = parser.parse_args()
+
+    # Label the models as the comparison index does (from the manifest or
+    # provenance page), reusing its folder scans where they are current
+    from createindex import load_index_cache, scan_analysis_folders
+    target_dir = Path(args.directory).resolve()
+    scanned, _ = scan_analysis_folders(target_dir, load_index_cache(target_dir).get('folders'),
+                                       log=lambda *args: None)
+    folders = {name: (entry['fingerprint'], entry['analysis']['model']) for name, entry in scanned.items()}
+    result = build_consensus(target_dir, folders, use_cache=not args.rebuild)
+    if result is None:
+        print("Error: At least two analysis folders are needed for a comparison", file=sys.stderr)
+        sys.exit(1)
+
+    width = max(len(model) for model in result['models']) + 2
+    print(f"\n{'section':<28}" + ''.join(f'{model:>{width}}' for model in result['models']))
+    for section in result['sections']:
+        cells = ''.join(f"{'-' if score is None else f'{score:.0%}':>{width}}" for score in section['scores'])
+        print(f"{section['num']} {section['name'][:25]:<25}{cells}")
+    for section in result['sections']:
+        if not section['agreed'] and not section['disputed']:
+            continue
+        print(f"\nSection {section['num']}: {section['name']}")
+        for text, models in section['agreed']:
+            print(f"  ✓ {len(models)}/{len(result['models'])} agree: {text}")
+        for figure, values in section['disputed']:
+            print(f"  ≠ {figure}: " + ', '.join(f'{value} ({model})' for model, value in values))
+
+
+if __name__ == '__main__':
+    main()
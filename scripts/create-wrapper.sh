@@ -1,5 +1,6 @@
 #!/bin/bash
 # scripts/create-wrapper.sh - Generate index.html wrapper for VenturePulse report
+# (rendered from templates/wrapper.html by scripts/render.py)
 
 set -e
 
@@ -8,363 +9,4 @@ if [ $# -ne 2 ]; then
     exit 1
 fi
 
-PROJECT_NAME="$1"
-OUTPUT_DIR="$2"
-
-# Create the wrapper HTML
-cat > "$OUTPUT_DIR/index.html" << 'HTMLEOF'
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>VenturePulse Analysis - PROJECT_NAME_PLACEHOLDER</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            height: 100vh;
-            display: flex;
-            flex-direction: column;
-            background: #f5f7fa;
-        }
-        
-        header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 1.5rem 2rem;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            flex-shrink: 0;
-        }
-        
-        header h1 {
-            font-size: 1.5rem;
-            margin-bottom: 0.25rem;
-            font-weight: 600;
-        }
-        
-        header p {
-            font-size: 0.9rem;
-            opacity: 0.95;
-        }
-        
-        .container {
-            display: flex;
-            flex: 1;
-            overflow: hidden;
-            background: white;
-        }
-        
-        nav {
-            width: 300px;
-            background: #f8f9fa;
-            border-right: 1px solid #e9ecef;
-            overflow-y: auto;
-            flex-shrink: 0;
-        }
-        
-        nav ul {
-            list-style: none;
-            padding: 0.5rem 0;
-        }
-        
-        nav li {
-            margin: 0;
-        }
-        
-        nav a {
-            display: block;
-            padding: 1rem 1.5rem;
-            color: #495057;
-            text-decoration: none;
-            border-left: 3px solid transparent;
-            transition: all 0.2s ease;
-            font-size: 0.95rem;
-        }
-        
-        nav a:hover {
-            background: #e9ecef;
-            border-left-color: #667eea;
-            color: #667eea;
-        }
-        
-        nav a.active {
-            background: white;
-            border-left-color: #667eea;
-            color: #667eea;
-            font-weight: 600;
-        }
-        
-        nav .section-number {
-            display: inline-block;
-            width: 24px;
-            height: 24px;
-            background: #667eea;
-            color: white;
-            border-radius: 50%;
-            text-align: center;
-            line-height: 24px;
-            font-size: 0.75rem;
-            margin-right: 0.75rem;
-            font-weight: 600;
-        }
-        
-        nav a:hover .section-number {
-            background: #764ba2;
-        }
-        
-        nav a.active .section-number {
-            background: #764ba2;
-        }
-        
-        .content {
-            flex: 1;
-            overflow: hidden;
-            display: flex;
-            flex-direction: column;
-        }
-        
-        iframe {
-            width: 100%;
-            height: 100%;
-            border: none;
-            background: white;
-        }
-        
-        .loading {
-            display: none;
-            position: absolute;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            text-align: center;
-            color: #667eea;
-        }
-        
-        .loading.active {
-            display: block;
-        }
-        
-        footer {
-            background: #f8f9fa;
-            padding: 0.75rem 1.5rem;
-            border-top: 1px solid #e9ecef;
-            font-size: 0.85rem;
-            color: #6c757d;
-            text-align: center;
-        }
-        
-        footer a {
-            color: #667eea;
-            text-decoration: none;
-        }
-        
-        footer a:hover {
-            text-decoration: underline;
-        }
-        
-        @media print {
-            nav, footer { display: none; }
-            .container { display: block; }
-            iframe { height: auto; }
-        }
-        
-        @media (max-width: 768px) {
-            .container {
-                flex-direction: column;
-            }
-            
-            nav {
-                width: 100%;
-                max-height: 200px;
-                border-right: none;
-                border-bottom: 1px solid #e9ecef;
-            }
-            
-            nav ul {
-                display: flex;
-                overflow-x: auto;
-                padding: 0.5rem;
-            }
-            
-            nav li {
-                flex-shrink: 0;
-            }
-            
-            nav a {
-                padding: 0.75rem 1rem;
-                white-space: nowrap;
-                border-left: none;
-                border-bottom: 3px solid transparent;
-            }
-            
-            nav a.active {
-                border-left: none;
-                border-bottom-color: #667eea;
-            }
-        }
-    </style>
-</head>
-<body>
-    <header>
-        <h1>🎯 VenturePulse Analysis</h1>
-        <p>PROJECT_NAME_PLACEHOLDER</p>
-    </header>
-    
-    <div class="container">
-        <nav>
-            <ul>
-                <li>
-                    <a href="#" data-section="section01-executive-summary.html" class="nav-link active">
-                        <span class="section-number">1</span>
-                        Executive Summary
-                    </a>
-                </li>
-                <li>
-                    <a href="#" data-section="section02-market-landscape.html" class="nav-link">
-                        <span class="section-number">2</span>
-                        Market Landscape
-                    </a>
-                </li>
-                <li>
-                    <a href="#" data-section="section03-technical-feasibility.html" class="nav-link">
-                        <span class="section-number">3</span>
-                        Technical Feasibility
-                    </a>
-                </li>
-                <li>
-                    <a href="#" data-section="section04-competitive-advantage.html" class="nav-link">
-                        <span class="section-number">4</span>
-                        Competitive Advantage
-                    </a>
-                </li>
-                <li>
-                    <a href="#" data-section="section05-business-model.html" class="nav-link">
-                        <span class="section-number">5</span>
-                        Business Model
-                    </a>
-                </li>
-                <li>
-                    <a href="#" data-section="section06-mvp-roadmap.html" class="nav-link">
-                        <span class="section-number">6</span>
-                        MVP Roadmap
-                    </a>
-                </li>
-                <li>
-                    <a href="#" data-section="section07-success-metrics.html" class="nav-link">
-                        <span class="section-number">7</span>
-                        Success Metrics
-                    </a>
-                </li>
-                <li>
-                    <a href="#" data-section="section08-go-to-market.html" class="nav-link">
-                        <span class="section-number">8</span>
-                        Go-to-Market
-                    </a>
-                </li>
-                <li>
-                    <a href="#" data-section="section09-provenance.html" class="nav-link">
-                        <span class="section-number">9</span>
-                        Provenance
-                    </a>
-                </li>
-            </ul>
-        </nav>
-        
-        <div class="content">
-            <div class="loading" id="loading">
-                <div style="font-size: 2rem; margin-bottom: 1rem;">⏳</div>
-                <div>Loading section...</div>
-            </div>
-            <iframe id="contentFrame" src="section01-executive-summary.html"></iframe>
-        </div>
-    </div>
-    
-    <footer>
-        Generated by <a href="https://github.com/knightsri/VenturePulse" target="_blank">VenturePulse v1.0</a> 
-        &nbsp;•&nbsp; 
-        TIMESTAMP_PLACEHOLDER
-    </footer>
-    
-    <script>
-        // Navigation handling
-        const navLinks = document.querySelectorAll('.nav-link');
-        const contentFrame = document.getElementById('contentFrame');
-        const loading = document.getElementById('loading');
-        
-        navLinks.forEach(link => {
-            link.addEventListener('click', (e) => {
-                e.preventDefault();
-                
-                // Update active state
-                navLinks.forEach(l => l.classList.remove('active'));
-                link.classList.add('active');
-                
-                // Show loading
-                loading.classList.add('active');
-                
-                // Load section
-                const section = link.getAttribute('data-section');
-                contentFrame.src = section;
-                
-                // Hide loading when iframe loads
-                contentFrame.onload = () => {
-                    loading.classList.remove('active');
-                };
-                
-                // Update URL hash (optional, for bookmarking)
-                window.location.hash = section.replace('.html', '');
-            });
-        });
-        
-        // Handle direct navigation via URL hash
-        window.addEventListener('load', () => {
-            const hash = window.location.hash.substring(1);
-            if (hash) {
-                const targetLink = document.querySelector(`[data-section="${hash}.html"]`);
-                if (targetLink) {
-                    targetLink.click();
-                }
-            }
-        });
-        
-        // Keyboard navigation
-        document.addEventListener('keydown', (e) => {
-            const currentActive = document.querySelector('.nav-link.active');
-            let nextLink = null;
-            
-            if (e.key === 'ArrowDown' || e.key === 'ArrowRight') {
-                e.preventDefault();
-                nextLink = currentActive.parentElement.nextElementSibling?.querySelector('.nav-link');
-            } else if (e.key === 'ArrowUp' || e.key === 'ArrowLeft') {
-                e.preventDefault();
-                nextLink = currentActive.parentElement.previousElementSibling?.querySelector('.nav-link');
-            }
-            
-            if (nextLink) {
-                nextLink.click();
-                nextLink.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
-            }
-        });
-        
-        // Print all sections
-        window.printReport = () => {
-            window.print();
-        };
-    </script>
-</body>
-</html>
-HTMLEOF
-
-# Replace placeholders
-TIMESTAMP=$(date -u +"%Y-%m-%d %H:%M:%S UTC")
-sed -i.bak "s/PROJECT_NAME_PLACEHOLDER/$PROJECT_NAME/g" "$OUTPUT_DIR/index.html"
-sed -i.bak "s/TIMESTAMP_PLACEHOLDER/$TIMESTAMP/g" "$OUTPUT_DIR/index.html"
-rm "$OUTPUT_DIR/index.html.bak"
-
-exit 0
+exec python3 "$(dirname "$0")/render.py" wrapper "$1" "$2"
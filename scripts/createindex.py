@@ -1,21 +1,100 @@
 #!/usr/bin/env python3
 """
 VenturePulse Index Generator
-Creates an attractive index.html for multi-model analysis comparisons.
+Creates an attractive index.html for multi-model analysis comparisons. In
+archive mode every project directory under a root is indexed in parallel and
+a catalogue.html listing all projects and analyses is written to the root.
+Both pages get a full-text search box backed by search-index.js (see search.py),
+which is updated incrementally along with the scan cache.
 
 Usage:
     python3 createindex.py <directory>
     python3 createindex.py .
+    python3 createindex.py . --rebuild    # ignore the scan cache
+    python3 createindex.py reports/ --archive [--workers N]
 """
 
+import argparse
+import hashlib
+import json
 import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime
+from statistics import median
+
+from manifest import load_manifest
+from render import build_time, render_template
+from consensus import build_consensus
+from search import merge_search_indexes, update_search_index
+from telemetry import read_log
+
+INDEX_CACHE_FILE = '.venturepulse-index.json'
+INDEX_CACHE_VERSION = 2
+TIMESTAMP_PLACEHOLDER = 'INDEX_TIMESTAMP_PLACEHOLDER'
+# Pages are stamped in UTC (or at SOURCE_DATE_EPOCH), so a rebuild is byte-identical
+TIMESTAMP_FORMAT = '%B %d, %Y at %I:%M %p UTC'
+CATALOGUE_FILE = 'catalogue.html'
+ANALYSES_FILE = 'analyses.json'
+# Files whose changes invalidate a folder's cached scan (besides index.html)
+FINGERPRINT_FILES = ('manifest.json', 'telemetry.jsonl', 'section09-provenance.html')
+
+def format_duration(seconds):
+    """Format seconds as e.g. "42s", "3m 05s" or "1h 12m"."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m" if minutes > 0 else f"{hours}h"
+
+def load_run_metrics(folder, manifest=None):
+    """Read the metrics recorded at generation time.
+
+    Uses the report's manifest.json when given, otherwise telemetry.jsonl.
+    Returns a dict with wall time, median section latency, throughput, tokens
+    and cost, or None for folders generated before metrics were recorded.
+    """
+    if manifest:
+        runs = [r for r in manifest.get('runs', []) if r.get('wall_ms') is not None]
+        sections = {entry['num']: entry for entry in manifest.get('sections', [])
+                    if entry.get('status') in ('ok', 'cached')}
+    else:
+        records = read_log(folder)
+        runs = [r for r in records if r.get('type') == 'run' and r.get('wall_ms') is not None]
+        # The latest record per section describes what the report currently contains
+        sections = {}
+        for record in records:
+            if record.get('type') == 'section' and record.get('status') in ('ok', 'cached'):
+                sections[record['section']] = record
+    if not runs:
+        return None
+    live = [r for r in sections.values() if r['status'] == 'ok']
+
+    # The run that generated the most sections live (a --refresh-section run is
+    # mostly cache hits, a resumed batch run only covers the remaining sections)
+    run = max(runs, key=lambda r: (r.get('ok', 0), r.get('sections', 0)))
+    latencies = [r['timings_ms']['total'] / 1000 for r in live if r.get('timings_ms', {}).get('total')]
+    completion_tokens = sum(r.get('completion_tokens') or 0 for r in live)
+    generating = sum(latencies)
+    costs = [r.get('cost_usd') for r in sections.values()]
+    return {
+        'wall_seconds': run['wall_ms'] / 1000,
+        'section_latency': median(latencies) if latencies else None,
+        'tokens_per_sec': completion_tokens / generating if generating else None,
+        'tokens': sum((r.get('prompt_tokens') or 0) + (r.get('completion_tokens') or 0)
+                      for r in sections.values()),
+        'cost': sum(costs) if costs and None not in costs else None,
+        'sections': len(sections),
+    }
 
-def calculate_duration_from_files(folder):
-    """Calculate analysis duration from file creation timestamps."""
+def file_duration_seconds(folder):
+    """Seconds between the first and last section file timestamps (legacy folders without telemetry)."""
     try:
         html_files = list(folder.glob('section*.html'))
         if not html_files:
@@ -27,8 +106,20 @@ def calculate_duration_from_files(folder):
         if len(timestamps) < 2:
             return None
         
+        return max(timestamps) - min(timestamps)
+    except Exception as e:
+        print(f"Warning: Could not calculate duration for {folder}: {e}")
+        return None
+
+def calculate_duration_from_files(folder, duration_seconds=None):
+    """Estimate analysis duration from file timestamps (legacy folders without telemetry)."""
+    try:
+        if duration_seconds is None:
+            duration_seconds = file_duration_seconds(folder)
+        if duration_seconds is None:
+            return None
+        
         # Calculate duration in minutes
-        duration_seconds = max(timestamps) - min(timestamps)
         duration_minutes = int(duration_seconds / 60)
         
         if duration_minutes < 1:
@@ -43,23 +134,22 @@ def calculate_duration_from_files(folder):
         print(f"Warning: Could not calculate duration for {folder}: {e}")
         return None
 
+def provenance_field(content, label, table_label):
+    """Find a value in either the table layout of generate-provenance.sh or <strong>Label:</strong> markup."""
+    match = re.search(r'<td[^>]*>\s*' + table_label + r'\s*</td>\s*<td[^>]*>\s*(?:<code[^>]*>)?([^<]+)', content)
+    if not match:
+        match = re.search(r'<strong>' + label + r':</strong>\s*([^<]+)', content)
+    return match.group(1).strip() if match else None
+
 def parse_provenance_html(provenance_file):
-    """Parse provenance HTML to extract model info and metadata."""
+    """Parse provenance HTML to extract model info (for folders without a manifest.json)."""
     try:
         with open(provenance_file, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Extract model name
-        model_match = re.search(r'<strong>Model:</strong>\s*([^<]+)', content)
-        model = model_match.group(1).strip() if model_match else None
-        
-        # Extract provider
-        provider_match = re.search(r'<strong>Provider:</strong>\s*([^<]+)', content)
-        provider = provider_match.group(1).strip() if provider_match else None
-        
-        # Extract generation date
-        date_match = re.search(r'<strong>Generated:</strong>\s*([^<]+)', content)
-        generated = date_match.group(1).strip() if date_match else None
+        model = provenance_field(content, 'Model', 'AI Model')
+        provider = provenance_field(content, 'Provider', 'AI Provider')
+        generated = provenance_field(content, 'Generated', 'Generated At')
         
         return {
             'model': model,
@@ -102,6 +192,10 @@ def parse_model_name(folder_name):
     # Fallback: capitalize and clean up
     return cleaned.replace('-', ' ').title()
 
+def display_model_name(model):
+    """Display name for an OpenRouter model id, e.g. "openai/gpt-4o-mini" -> "GPT-4o Mini"."""
+    return parse_model_name(re.sub(r'[^a-z0-9]+', '-', model.split('/')[-1].lower()))
+
 def get_model_category(model_name):
     """Determine model category based on model name."""
     if not model_name:
@@ -154,573 +248,389 @@ def read_project_description(md_file):
         print(f"Warning: Could not read {md_file}: {e}")
         return "Project Analysis", "Multi-model analysis comparison"
 
-def generate_html(project_name, project_desc, analyses, timestamp):
-    """Generate the complete HTML index page."""
-    
-    # Build model cards HTML
-    model_cards = ''
-    for analysis in analyses:
-        provenance = analysis.get('provenance', {})
-        
-        model_name = provenance.get('model') or analysis['model']
-        provider = provenance.get('provider')
-        duration = analysis.get('duration', 'N/A')
-        
-        category = get_model_category(model_name)
-        
-        category_label = {
-            'premium': 'Premium',
-            'fast': 'Fast',
-            'budget': 'Budget',
-            'standard': 'Standard'
-        }.get(category, 'Standard')
-        
-        category_color = {
-            'premium': '#667eea',
-            'fast': '#28a745',
-            'budget': '#6c757d',
-            'standard': '#17a2b8'
-        }.get(category, '#17a2b8')
-        
-        # Only show provider if available
-        provider_html = f'<p class="provider">{provider}</p>' if provider else ''
-        
-        model_cards += f'''
-                <div class="model-card">
-                    <span class="badge" style="background: {category_color};">{category_label}</span>
-                    <h3>{model_name}</h3>
-                    {provider_html}
-                    
-                    <div class="model-stats">
-                        <div class="stat">
-                            <span class="stat-value">{duration}</span>
-                            <span class="stat-label">Duration</span>
-                        </div>
-                        <div class="stat">
-                            <span class="stat-value">9</span>
-                            <span class="stat-label">Reports</span>
-                        </div>
-                    </div>
-
-                    <button onclick="openModal('{analysis['folder']}/index.html')" class="view-analysis-btn">
-                        View Analysis →
-                    </button>
-                </div>
-'''
+def card_data(analysis):
+    """The fields the index page needs to render, sort and filter one model card."""
+    provenance = analysis.get('provenance', {})
+    metrics = analysis.get('metrics')
+    duration_seconds = analysis.get('duration_seconds')
+    card = {
+        'folder': analysis['folder'],
+        'model': analysis['model'],
+        'provider': provenance.get('provider'),
+        'category': get_model_category(provenance.get('model') or analysis['model']),
+        'date': analysis_date(analysis),
+        'duration': analysis.get('duration', 'N/A'),
+        'duration_seconds': round(duration_seconds, 1) if duration_seconds is not None else None,
+        'metrics': bool(metrics),
+    }
+    if metrics:
+        card.update(latency=metrics['section_latency'], tokens_per_sec=metrics['tokens_per_sec'],
+                    cost=metrics['cost'])
+    return card
+
+def consensus_view(consensus):
+    """The agreement matrix, agreed claims and disputed figures as the index template expects them, or None."""
+    if not consensus:
+        return None
+    models = consensus['models']
+    scores = [score for section in consensus['sections'] for score in section['scores'] if score is not None]
+    top = max(scores, default=0) or 1
+    rows = []
+    details = []
+    for section in consensus['sections']:
+        # Shade relative to the most similar cell, so the scale fits the project
+        cells = [{'model': model, 'text': None} if score is None else
+                 {'model': model, 'text': f'{score:.0%}', 'shade': f'{score / top * 0.6:.2f}'}
+                 for model, score in zip(models, section['scores'])]
+        rows.append({'num': section['num'], 'name': section['name'], 'cells': cells})
+        if section['agreed'] or section['disputed']:
+            details.append({
+                'num': section['num'],
+                'name': section['name'],
+                'agreed': [{'text': text, 'count': f'{len(agreeing)}/{len(models)}'}
+                           for text, agreeing in section['agreed']],
+                'disputed': [{'figure': figure,
+                              'values': [{'model': model, 'value': value, 'more': i < len(values) - 1}
+                                         for i, (model, value) in enumerate(values)]}
+                             for figure, values in section['disputed']],
+            })
+    return {'models': models, 'rows': rows, 'details': details}
+
+def generate_html(project_name, project_desc, analyses, timestamp, consensus=None):
+    """Generate the complete HTML index page.
+
+    The model cards are rendered in the browser from the embedded card data,
+    a page at a time, so the page stays fast with hundreds of analyses.
+    consensus (see consensus.py) adds the section x model agreement matrix.
+    """
+    cards = [card_data(analysis) for analysis in analyses]
+    # Embedded in a <script> element, so "</" must not appear literally
+    cards_json = json.dumps(cards, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+    return render_template('index.html', project_name=project_name, project_desc=project_desc,
+                           analysis_count=len(analyses), timestamp=timestamp,
+                           consensus=consensus_view(consensus), cards_json=cards_json)
+
+def folder_fingerprint(folder):
+    """Return a cheap fingerprint of an analysis folder, or None if it has no index.html.
+
+    Reports are written with atomic renames, which update the folder mtime;
+    the files the index reads are fingerprinted by mtime and size as well.
+    """
+    try:
+        index_stat = (folder / 'index.html').stat()
+    except FileNotFoundError:
+        return None
+    fingerprint = [folder.stat().st_mtime_ns, index_stat.st_mtime_ns, index_stat.st_size]
+    for name in FINGERPRINT_FILES:
+        try:
+            stat = (folder / name).stat()
+            fingerprint += [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            fingerprint += [None, None]
+    return fingerprint
+
+def scan_analysis_folder(folder, log=print):
+    """Collect the card data for one analysis folder."""
+    model_name = parse_model_name(folder.name)
     
-    html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{project_name} - VenturePulse Analysis</title>
-    <meta name="description" content="Multi-model AI analysis comparison for {project_name}">
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 2rem 1rem;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 12px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }}
-
-        header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 3rem 2rem;
-            text-align: center;
-        }}
-
-        header h1 {{
-            font-size: 2.5rem;
-            margin-bottom: 0.5rem;
-            font-weight: 700;
-        }}
-
-        header .subtitle {{
-            font-size: 1.2rem;
-            opacity: 0.95;
-            font-weight: 300;
-        }}
-
-        .intro {{
-            padding: 2rem;
-            background: #f8f9fa;
-            border-bottom: 1px solid #dee2e6;
-        }}
-
-        .intro h2 {{
-            color: #667eea;
-            margin-bottom: 1rem;
-            font-size: 1.8rem;
-        }}
-
-        .intro p {{
-            font-size: 1.05rem;
-            margin-bottom: 1rem;
-            color: #555;
-            line-height: 1.8;
-        }}
-
-        .project-meta {{
-            display: flex;
-            gap: 2rem;
-            margin-top: 1.5rem;
-            flex-wrap: wrap;
-        }}
-
-        .meta-item {{
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-            color: #666;
-            font-size: 0.95rem;
-        }}
-
-        .meta-item strong {{
-            color: #667eea;
-        }}
-
-        .models-section {{
-            padding: 2rem;
-        }}
-
-        .models-section h2 {{
-            color: #333;
-            margin-bottom: 1rem;
-            font-size: 2rem;
-            text-align: center;
-        }}
-
-        .models-intro {{
-            text-align: center;
-            margin-bottom: 2rem;
-            color: #666;
-            font-size: 1.1rem;
-        }}
-
-        .model-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 2rem;
-            margin-top: 2rem;
-        }}
-
-        .model-card {{
-            background: white;
-            border: 2px solid #e9ecef;
-            border-radius: 12px;
-            padding: 1.5rem;
-            transition: all 0.3s ease;
-            position: relative;
-        }}
-
-        .model-card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 10px 30px rgba(0,0,0,0.15);
-            border-color: #667eea;
-        }}
-
-        .model-card .badge {{
-            position: absolute;
-            top: 1rem;
-            right: 1rem;
-            padding: 0.25rem 0.75rem;
-            border-radius: 20px;
-            font-size: 0.75rem;
-            font-weight: 600;
-            text-transform: uppercase;
-            color: white;
-        }}
-
-        .model-card h3 {{
-            color: #333;
-            margin-bottom: 0.5rem;
-            font-size: 1.4rem;
-            padding-right: 100px;
-        }}
-
-        .model-card .provider {{
-            color: #6c757d;
-            font-size: 0.85rem;
-            margin-bottom: 1rem;
-            font-family: 'Courier New', monospace;
-        }}
-
-        .model-stats {{
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 0.75rem;
-            margin: 1.5rem 0;
-        }}
-
-        .stat {{
-            text-align: center;
-            padding: 0.75rem;
-            background: #f8f9fa;
-            border-radius: 6px;
-        }}
-
-        .stat-value {{
-            display: block;
-            font-size: 1.2rem;
-            font-weight: 700;
-            color: #667eea;
-            margin-bottom: 0.25rem;
-        }}
-
-        .stat-label {{
-            font-size: 0.75rem;
-            color: #6c757d;
-            text-transform: uppercase;
-        }}
-
-        .view-analysis-btn {{
-            display: block;
-            width: 100%;
-            padding: 0.75rem;
-            background: #667eea;
-            color: white;
-            text-decoration: none;
-            border: none;
-            border-radius: 6px;
-            text-align: center;
-            font-weight: 600;
-            transition: all 0.3s ease;
-            margin-top: 1rem;
-            cursor: pointer;
-            font-size: 1rem;
-        }}
-
-        .view-analysis-btn:hover {{
-            background: #5568d3;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(102, 126, 234, 0.4);
-        }}
-
-        /* Modal styles */
-        .modal {{
-            display: none;
-            position: fixed;
-            z-index: 1000;
-            left: 0;
-            top: 0;
-            width: 100%;
-            height: 100%;
-            background-color: rgba(0, 0, 0, 0.8);
-            animation: fadeIn 0.3s ease;
-        }}
-
-        .modal.active {{
-            display: block;
-        }}
-
-        @keyframes fadeIn {{
-            from {{ opacity: 0; }}
-            to {{ opacity: 1; }}
-        }}
-
-        .modal-content {{
-            position: relative;
-            margin: 2% auto;
-            width: 95%;
-            height: 90%;
-            background: white;
-            border-radius: 12px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.5);
-            overflow: hidden;
-            animation: slideIn 0.3s ease;
-        }}
-
-        @keyframes slideIn {{
-            from {{
-                transform: translateY(-50px);
-                opacity: 0;
-            }}
-            to {{
-                transform: translateY(0);
-                opacity: 1;
-            }}
-        }}
-
-        .modal-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 1rem 1.5rem;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }}
-
-        .modal-header h3 {{
-            margin: 0;
-            font-size: 1.2rem;
-        }}
-
-        .close-btn {{
-            background: rgba(255, 255, 255, 0.2);
-            border: none;
-            color: white;
-            font-size: 1.5rem;
-            cursor: pointer;
-            width: 36px;
-            height: 36px;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            transition: all 0.3s ease;
-        }}
-
-        .close-btn:hover {{
-            background: rgba(255, 255, 255, 0.3);
-            transform: rotate(90deg);
-        }}
-
-        .modal-body {{
-            width: 100%;
-            height: calc(100% - 60px);
-            border: none;
-        }}
-
-        footer {{
-            padding: 2rem;
-            text-align: center;
-            background: #f8f9fa;
-            border-top: 1px solid #dee2e6;
-            color: #6c757d;
-        }}
-
-        footer a {{
-            color: #667eea;
-            text-decoration: none;
-            font-weight: 600;
-        }}
-
-        footer a:hover {{
-            text-decoration: underline;
-        }}
-
-        .watermark {{
-            margin-top: 1rem;
-            font-size: 0.85rem;
-            opacity: 0.7;
-        }}
-
-        @media (max-width: 768px) {{
-            body {{
-                padding: 1rem 0.5rem;
-            }}
-
-            header h1 {{
-                font-size: 1.8rem;
-            }}
-
-            .model-grid {{
-                grid-template-columns: 1fr;
-            }}
-
-            .project-meta {{
-                flex-direction: column;
-                gap: 0.5rem;
-            }}
-
-            .modal-content {{
-                width: 98%;
-                height: 95%;
-                margin: 1% auto;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>🎯 {project_name}</h1>
-            <p class="subtitle">Multi-Model AI Analysis Comparison</p>
-        </header>
-
-        <section class="intro">
-            <h2>About This Analysis</h2>
-            <p>{project_desc}</p>
-            
-            <div class="project-meta">
-                <div class="meta-item">
-                    <strong>Models Analyzed:</strong> {len(analyses)}
-                </div>
-                <div class="meta-item">
-                    <strong>Generated:</strong> {timestamp}
-                </div>
-                <div class="meta-item">
-                    <strong>Tool:</strong> VenturePulse
-                </div>
-            </div>
-        </section>
-
-        <section class="models-section">
-            <h2>🤖 Compare AI Model Analyses</h2>
-            <p class="models-intro">
-                Each model brings different strengths to the analysis. Click to explore how different AI models 
-                approach market analysis, competitive positioning, technical feasibility, and strategic recommendations.
-            </p>
-
-            <div class="model-grid">
-{model_cards}
-            </div>
-        </section>
-
-        <footer>
-            <p>
-                Generated with <strong>VenturePulse</strong> • 
-                <a href="https://github.com/knightsri/VenturePulse" target="_blank">GitHub</a> • 
-                <a href="https://shalusri.com" target="_blank">Blog</a>
-            </p>
-            <p class="watermark">
-                Open source, MIT licensed • AI-powered product viability analysis
-            </p>
-        </footer>
-    </div>
-
-    <!-- Modal -->
-    <div id="analysisModal" class="modal">
-        <div class="modal-content">
-            <div class="modal-header">
-                <h3>Analysis Report</h3>
-                <button class="close-btn" onclick="closeModal()">&times;</button>
-            </div>
-            <iframe id="modalFrame" class="modal-body"></iframe>
-        </div>
-    </div>
-
-    <script>
-        function openModal(url) {{
-            const modal = document.getElementById('analysisModal');
-            const frame = document.getElementById('modalFrame');
-            frame.src = url;
-            modal.classList.add('active');
-            document.body.style.overflow = 'hidden';
-        }}
-
-        function closeModal() {{
-            const modal = document.getElementById('analysisModal');
-            const frame = document.getElementById('modalFrame');
-            modal.classList.remove('active');
-            frame.src = '';
-            document.body.style.overflow = 'auto';
-        }}
-
-        // Close modal on Escape key
-        document.addEventListener('keydown', function(e) {{
-            if (e.key === 'Escape') {{
-                closeModal();
-            }}
-        }});
-
-        // Close modal when clicking outside
-        document.getElementById('analysisModal').addEventListener('click', function(e) {{
-            if (e.target === this) {{
-                closeModal();
-            }}
-        }});
-    </script>
-</body>
-</html>'''
+    # Read the run manifest, falling back to the provenance HTML
+    # for folders generated before manifests were written
+    provenance = {}
+    manifest = load_manifest(folder)
+    if manifest:
+        provenance = {
+            'model': manifest.get('model'),
+            'provider': manifest.get('provider'),
+            'generated': manifest.get('created'),
+        }
+    else:
+        provenance_file = folder / 'section09-provenance.html'
+        if provenance_file.exists():
+            provenance = parse_provenance_html(provenance_file)
+    if provenance.get('model'):
+        model_name = display_model_name(provenance['model'])
     
-    return html
-
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 createindex.py <directory>")
-        print("Example: python3 createindex.py .")
-        sys.exit(1)
+    # Prefer the metrics recorded at generation time; guess from
+    # file timestamps only for folders that predate them
+    metrics = load_run_metrics(folder, manifest)
+    if metrics:
+        duration_seconds = metrics['wall_seconds']
+        duration = format_duration(duration_seconds)
+    else:
+        duration_seconds = file_duration_seconds(folder)
+        duration = calculate_duration_from_files(folder, duration_seconds)
     
-    target_dir = Path(sys.argv[1]).resolve()
+    log(f"  Found analysis: {model_name} ({folder.name})")
+    if duration:
+        log(f"    Duration: {duration}")
     
-    if not target_dir.exists() or not target_dir.is_dir():
-        print(f"Error: {target_dir} is not a valid directory")
-        sys.exit(1)
-    
-    print(f"Scanning directory: {target_dir}")
+    return {
+        'folder': folder.name,
+        'model': model_name,
+        'provenance': provenance,
+        'duration': duration or 'N/A',
+        'duration_seconds': duration_seconds,
+        'metrics': metrics,
+    }
+
+def load_index_cache(target_dir):
+    """Load the per-folder scan cache, or an empty one if missing or outdated."""
+    try:
+        with open(target_dir / INDEX_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != INDEX_CACHE_VERSION:
+        return {}
+    return cache
+
+def save_index_cache(target_dir, cache):
+    write_atomic(target_dir / INDEX_CACHE_FILE, json.dumps(cache, ensure_ascii=False))
+
+def write_atomic(path, content):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def scan_analysis_folders(target_dir, cached_folders=None, log=print):
+    """Scan the analysis folders (those containing index.html) of target_dir.
+
+    Folders whose fingerprint matches their entry in cached_folders are not
+    read again. Returns ({folder name: {'fingerprint', 'analysis'}}, number
+    of folders scanned).
+    """
+    cached_folders = cached_folders or {}
+    folders = {}
+    rescanned = 0
+    for item in sorted(target_dir.iterdir()):
+        if item.is_dir() and not item.name.startswith('.'):
+            fingerprint = folder_fingerprint(item)
+            if fingerprint is None:
+                continue
+            
+            cached = cached_folders.get(item.name)
+            if cached and cached['fingerprint'] == fingerprint:
+                analysis = cached['analysis']
+            else:
+                analysis = scan_analysis_folder(item, log)
+                rescanned += 1
+            folders[item.name] = {'fingerprint': fingerprint, 'analysis': analysis}
+    return folders, rescanned
+
+def index_project(target_dir, use_cache=True, verbose=True):
+    """Scan target_dir for analysis folders and write its index.html.
+
+    Folder scans are cached in .venturepulse-index.json (unless use_cache is
+    False) and index.html is only rewritten when its content changes.
+    Returns a dict with the project's index path, name, description and
+    analyses, or None if no analyses were found.
+    """
+    log = print if verbose else (lambda *args: None)
+    target_dir = Path(target_dir).resolve()
+    log(f"Scanning directory: {target_dir}")
     
     # Find markdown file (project description)
-    md_files = list(target_dir.glob('*.md'))
+    md_files = sorted(target_dir.glob('*.md'))
     if not md_files:
-        print("Warning: No .md file found, using default project info")
+        log("Warning: No .md file found, using default project info")
         project_name = target_dir.name.replace('-', ' ').replace('_', ' ').title()
         project_desc = "Multi-model analysis comparison"
     else:
         md_file = md_files[0]
-        print(f"Found project description: {md_file.name}")
+        log(f"Found project description: {md_file.name}")
         project_name, project_desc = read_project_description(md_file)
     
-    # Find analysis directories (containing index.html)
-    analyses = []
-    for item in target_dir.iterdir():
-        if item.is_dir() and not item.name.startswith('.'):
-            index_file = item / 'index.html'
-            provenance_file = item / 'section09-provenance.html'
-            
-            if index_file.exists():
-                model_name = parse_model_name(item.name)
-                
-                # Parse provenance if available
-                provenance = {}
-                if provenance_file.exists():
-                    provenance = parse_provenance_html(provenance_file)
-                    if provenance.get('model'):
-                        model_name = provenance['model']
-                
-                # Calculate duration from file timestamps
-                duration = calculate_duration_from_files(item)
-                
-                print(f"  Found analysis: {model_name} ({item.name})")
-                if duration:
-                    print(f"    Duration: {duration}")
-                
-                analyses.append({
-                    'folder': item.name,
-                    'model': model_name,
-                    'provenance': provenance,
-                    'duration': duration or 'N/A'
-                })
+    # Find analysis directories (containing index.html), rescanning only
+    # folders whose fingerprint changed since the last run
+    cache = load_index_cache(target_dir) if use_cache else {}
+    folders, rescanned = scan_analysis_folders(target_dir, cache.get('folders'), log)
+    analyses = [entry['analysis'] for entry in folders.values()]
     
     if not analyses:
-        print("Error: No analysis directories with index.html found")
-        sys.exit(1)
+        log("Error: No analysis directories with index.html found")
+        return None
+    
+    log(f"  {rescanned} folder(s) scanned, {len(analyses) - rescanned} unchanged")
+    labels = {name: (entry['fingerprint'], entry['analysis']['model']) for name, entry in folders.items()}
+    update_search_index(target_dir, labels, use_cache=use_cache, log=log)
+    consensus = build_consensus(target_dir, labels, use_cache=use_cache, log=log)
     
     # Sort analyses by model name
-    analyses.sort(key=lambda x: x['model'])
+    analyses.sort(key=lambda x: (x['model'], x['folder']))
     
-    print(f"\nGenerating index.html for {len(analyses)} analyses...")
+    # Render with a placeholder timestamp so unchanged content can be detected
+    html_content = generate_html(project_name, project_desc, analyses, TIMESTAMP_PLACEHOLDER, consensus)
+    page_hash = hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+    output_file = target_dir / 'index.html'
     
-    # Generate HTML
-    timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-    html_content = generate_html(project_name, project_desc, analyses, timestamp)
+    data_file = target_dir / ANALYSES_FILE
     
-    # Write to file
-    output_file = target_dir / 'index.html'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    if page_hash == cache.get('page_sha256') and output_file.exists() and data_file.exists():
+        log(f"\n✓ index.html is up to date ({len(analyses)} analyses)")
+    else:
+        log(f"\nGenerating index.html for {len(analyses)} analyses...")
+        timestamp = build_time().strftime(TIMESTAMP_FORMAT)
+        write_atomic(output_file, html_content.replace(TIMESTAMP_PLACEHOLDER, timestamp))
+        # The card data on its own, for other tools
+        write_atomic(data_file, json.dumps([card_data(analysis) for analysis in analyses],
+                                           ensure_ascii=False, separators=(',', ':')))
+        log(f"✓ Successfully created: {output_file}")
+    
+    save_index_cache(target_dir, {'version': INDEX_CACHE_VERSION, 'folders': folders,
+                                  'page_sha256': page_hash})
+    return {
+        'dir': target_dir,
+        'index': output_file,
+        'name': project_name,
+        'description': project_desc,
+        'analyses': analyses,
+    }
+
+def build_index(target_dir, use_cache=True):
+    """Write target_dir/index.html. Returns its path, or None if no analyses were found."""
+    project = index_project(target_dir, use_cache)
+    return project['index'] if project else None
+
+def is_analysis_folder(folder):
+    """An analysis folder has a finalized report (index.html) and its manifest or provenance page."""
+    join = os.path.join
+    return (os.path.isfile(join(folder, 'index.html'))
+            and (os.path.isfile(join(folder, 'manifest.json'))
+                 or os.path.isfile(join(folder, 'section09-provenance.html'))))
+
+def find_project_dirs(root):
+    """Return every directory under root that directly contains analysis folders.
+
+    Analysis folders themselves and hidden directories are not descended into.
+    """
+    projects = []
+    pending = [str(root)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                children = [entry.path for entry in entries
+                            if entry.is_dir() and not entry.name.startswith('.')]
+        except OSError as e:
+            print(f"Warning: Could not read {directory}: {e}")
+            continue
+        has_analyses = False
+        for child in children:
+            if is_analysis_folder(child):
+                has_analyses = True
+            else:
+                pending.append(child)
+        if has_analyses:
+            projects.append(Path(directory))
+    return sorted(projects)
+
+def analysis_date(analysis):
+    """Generation date of an analysis as "YYYY-MM-DD HH:MM", or '' if unknown."""
+    generated = analysis['provenance'].get('generated')
+    if generated:
+        return generated.replace('T', ' ')[:16]
+    match = re.search(r'(\d{4})(\d{2})(\d{2})-(\d{2})(\d{2})\d{2}', analysis['folder'])
+    if match:
+        year, month, day, hour, minute = match.groups()
+        return f"{year}-{month}-{day} {hour}:{minute}"
+    return ''
+
+def generate_catalogue_html(root, projects, timestamp):
+    """Generate the archive catalogue page listing every project and analysis."""
+    rows = []
+    total = 0
+    for project in projects:
+        analyses = project['analyses']
+        total += len(analyses)
+        for i, analysis in enumerate(analyses):
+            metrics = analysis.get('metrics') or {}
+            latency = metrics.get('section_latency')
+            throughput = metrics.get('tokens_per_sec')
+            cost = metrics.get('cost')
+            rows.append({
+                # The project cell spans all of its analyses
+                'project': {'name': project['name'], 'count': len(analyses),
+                            'link': project['index'].relative_to(root).as_posix()} if i == 0 else None,
+                'link': (project['dir'] / analysis['folder'] / 'index.html').relative_to(root).as_posix(),
+                'model': analysis['model'],
+                'provider': analysis['provenance'].get('provider') or '',
+                'date': analysis_date(analysis),
+                'duration': analysis.get('duration') or 'N/A',
+                'latency': f"{latency:.1f}s" if latency is not None else '',
+                'throughput': f"{throughput:.0f}" if throughput else '',
+                'cost': f"${cost:.2f}" if cost is not None else '',
+            })
+    return render_template('catalogue.html', project_count=len(projects), analysis_count=total,
+                           timestamp=timestamp, rows=rows)
+
+def index_archive(root, workers=None, use_cache=True):
+    """Index every project under root in parallel and write root/catalogue.html.
+
+    Each project gets its own index.html (with its own scan cache); the
+    catalogue is only rewritten when its content changes. Returns the
+    catalogue path, or None if no projects were found.
+    """
+    root = Path(root).resolve()
+    start = datetime.now()
+    project_dirs = find_project_dirs(root)
+    if not project_dirs:
+        print(f"Error: No project directories with analyses found under {root}")
+        return None
+    print(f"Indexing {len(project_dirs)} project(s) under {root}...")
+    
+    workers = workers or os.cpu_count() or 1
+    index = partial(index_project, use_cache=use_cache, verbose=False)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(project_dirs) // (4 * workers))
+        projects = [project for project in executor.map(index, project_dirs, chunksize=chunksize)
+                    if project]
+    projects.sort(key=lambda project: (project['name'].lower(), str(project['dir'])))
+    sections = merge_search_indexes(root, projects)
+    
+    html_content = generate_catalogue_html(root, projects, TIMESTAMP_PLACEHOLDER)
+    page_hash = hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+    output_file = root / CATALOGUE_FILE
+    marker = f'<!-- content-sha256: {page_hash} -->'
+    try:
+        with open(output_file, 'r', encoding='utf-8') as f:
+            unchanged = f.readline().strip() == marker
+    except OSError:
+        unchanged = False
+    
+    analyses = sum(len(project['analyses']) for project in projects)
+    if not unchanged:
+        timestamp = build_time().strftime(TIMESTAMP_FORMAT)
+        write_atomic(output_file, marker + '\n' + html_content.replace(TIMESTAMP_PLACEHOLDER, timestamp))
+    elapsed = (datetime.now() - start).total_seconds()
+    print(f"✓ {len(projects)} projects, {analyses} analyses ({sections} sections searchable) indexed in {elapsed:.1f}s"
+          f"{' (catalogue unchanged)' if unchanged else ''}")
+    return output_file
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the VenturePulse comparison index')
+    parser.add_argument('directory', help='Project directory (or archive root with --archive)')
+    parser.add_argument('--archive', action='store_true',
+                        help='Index every project directory under the root and write catalogue.html')
+    parser.add_argument('--workers', type=int, help='Worker processes for --archive (default: CPU count)')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the scan cache')
+    args = parser.parse_args()
+    
+    target_dir = Path(args.directory).resolve()
+    
+    if not target_dir.exists() or not target_dir.is_dir():
+        print(f"Error: {target_dir} is not a valid directory")
+        sys.exit(1)
+    
+    if args.archive:
+        output_file = index_archive(target_dir, args.workers, use_cache=not args.rebuild)
+    else:
+        output_file = build_index(target_dir, use_cache=not args.rebuild)
+    if output_file is None:
+        sys.exit(1)
     
-    print(f"✓ Successfully created: {output_file}")
     print(f"\nOpen in browser:")
     print(f"  file://{output_file}")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Report Export
+Bundles a report folder into one self-contained, minified HTML file: every
+section is inlined (no extra requests) and tabs switch instantly, so the
+report can be emailed or hosted as a single file. Inline styles the model
+repeats across elements are replaced by shared classes. Sections are rendered
+in shadow roots, except those with scripts, which keep an iframe of their own
+so their scripts run against their own document.
+
+Usage:
+    python3 export.py <report-folder> [<report-folder> ...] [--output FILE] [--gzip] [--brotli]
+    python3 export.py my-idea-analysis-gemini-2-5-flash-20251021-095250/ --gzip
+
+The bundle is written next to the folder as <report-folder>.html unless
+--output is given. --brotli needs the optional "brotli" package.
+"""
+
+import argparse
+import gzip
+import html
+import json
+import re
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from manifest import load_manifest
+from render import TIMESTAMP_FORMAT, build_time, render_template, report_time
+from sections import load_sections
+from validate import strip_fences
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SECTION_NAMES = {section.num: section.name for section in load_sections()}
+SECTION_NAMES['09'] = 'Provenance'
+
+# Start tags with their attributes (quoted values may contain ">")
+START_TAG_RE = re.compile(
+    r'<([a-zA-Z][\w:-]*)((?:\s+[^\s=/>]+(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+))?)*)\s*(/?)>')
+STYLE_ATTR_RE = re.compile(r'\sstyle\s*=\s*("([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+CLASS_ATTR_RE = re.compile(r'\sclass\s*=\s*("([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+# Elements whose content must not be whitespace-collapsed
+RAW_ELEMENT_RE = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+SCRIPT_RE = re.compile(r'<script\b', re.IGNORECASE)
+# Quoted strings, and runs of whitespace outside them
+CSS_WHITESPACE_RE = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')|\s+')
+# Rule preludes (the selectors or at-rule before each "{")
+CSS_PRELUDE_RE = re.compile(r'([^{};]*)\{')
+# Selectors of the document itself, with any classes, ids or pseudo-classes on them
+DOCUMENT_SELECTOR_RE = re.compile(
+    r'(?<![\w.#:-])(?:html\s*>?\s*body|html|body|:root)\b((?:[.#:\[][^\s,>+~{]*)?)', re.IGNORECASE)
+
+
+def section_files(report_dir):
+    """Return [(num, name, path)] for the section files of a report, in order."""
+    sections = []
+    for path in sorted(Path(report_dir).glob('section[0-9][0-9]-*.html')):
+        num = path.name[7:9]
+        slug = path.stem[10:]
+        sections.append((num, SECTION_NAMES.get(num, slug.replace('-', ' ').title()), path))
+    return sections
+
+
+def host_selectors(css):
+    """Retarget rules for html, body and :root to :host, the shadow root's element.
+
+    Nothing inside a shadow root matches them, so a section's page-level
+    styles (fonts, colours, variables) would otherwise be lost.
+    """
+    def rewrite(prelude):
+        if prelude.lstrip().startswith('@'):
+            return prelude
+        return DOCUMENT_SELECTOR_RE.sub(lambda m: f':host({m.group(1)})' if m.group(1) else ':host', prelude)
+
+    return CSS_PRELUDE_RE.sub(lambda m: rewrite(m.group(1)) + '{', css)
+
+
+def section_body(text):
+    """Strip markdown code fences and any document wrapper the model added.
+
+    Prose around the fenced block (a preamble, or debug output in older
+    reports) is dropped. Page-level rules are rewritten to ":host" (see
+    host_selectors) so they apply inside the shadow root.
+    """
+    text = strip_fences(text)
+    body = re.search(r'<body[^>]*>(.*)</body>', text, re.IGNORECASE | re.DOTALL)
+    if body:
+        styles = re.findall(r'<style\b.*?</style\s*>', text[:body.start()], re.IGNORECASE | re.DOTALL)
+        text = ''.join(styles) + body.group(1)
+    text = re.sub(r'(<style\b[^>]*>)(.*?)(</style\s*>)',
+                  lambda m: m.group(1) + host_selectors(m.group(2)) + m.group(3),
+                  text, flags=re.IGNORECASE | re.DOTALL)
+    return text.strip()
+
+
+def split_declarations(style):
+    """Split CSS declarations at the semicolons outside quotes and parentheses.
+
+    url(data:image/png;base64,...) and quoted strings stay in one piece.
+    """
+    declarations = []
+    start = depth = 0
+    quote = None
+    escaped = False
+    for i, char in enumerate(style):
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth = max(0, depth - 1)
+        elif char == ';' and not depth:
+            declarations.append(style[start:i])
+            start = i + 1
+    declarations.append(style[start:])
+    return declarations
+
+
+def normalize_style(value):
+    """Canonical form of an inline style, e.g. "color: red; " -> "color:red"."""
+    declarations = []
+    for declaration in split_declarations(html.unescape(value)):
+        prop, sep, val = declaration.partition(':')
+        val = CSS_WHITESPACE_RE.sub(lambda m: m.group(1) or ' ', val.strip())
+        if sep and prop.strip() and val:
+            declarations.append(f"{prop.strip().lower()}:{val}")
+    return ';'.join(declarations)
+
+
+def iter_styles(text):
+    for tag in START_TAG_RE.finditer(text):
+        style = STYLE_ATTR_RE.search(tag.group(2))
+        if style:
+            yield normalize_style(style.group(2) if style.group(2) is not None else style.group(3))
+
+
+def dedupe_styles(sections):
+    """Move inline styles used more than once (across all sections) into classes.
+
+    Returns (rewritten section texts, CSS for the shared classes). Rules are
+    !important so they still win over section stylesheets, like inline styles.
+    """
+    counts = Counter(style for text in sections for style in iter_styles(text) if style)
+    names = {}
+    for style, count in counts.most_common():
+        if count > 1:
+            names[style] = f"s{len(names)}"
+
+    def rewrite(tag):
+        attrs = tag.group(2)
+        style = STYLE_ATTR_RE.search(attrs)
+        if not style:
+            return tag.group(0)
+        name = names.get(normalize_style(style.group(2) if style.group(2) is not None else style.group(3)))
+        if not name:
+            return tag.group(0)
+        attrs = attrs[:style.start()] + attrs[style.end():]
+        existing = CLASS_ATTR_RE.search(attrs)
+        if existing:
+            classes = existing.group(2) if existing.group(2) is not None else existing.group(3)
+            attrs = f'{attrs[:existing.start()]} class="{classes} {name}"{attrs[existing.end():]}'
+        else:
+            attrs += f' class="{name}"'
+        return f'<{tag.group(1)}{attrs}{tag.group(3)}>'
+
+    rewritten = [START_TAG_RE.sub(rewrite, text) for text in sections]
+    rules = []
+    for style, name in names.items():
+        declarations = ';'.join(d if d.endswith('!important') else d + '!important'
+                                for d in split_declarations(style))
+        rules.append(f'.{name}{{{declarations}}}')
+    return rewritten, ''.join(rules)
+
+
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_html(text):
+    """Drop comments and collapse whitespace outside <pre>, <textarea>, <script> and <style>."""
+    text = COMMENT_RE.sub('', text)
+    parts = []
+    for i, part in enumerate(RAW_ELEMENT_RE.split(text)):
+        # split() yields text, element, tag name, text, element, tag name, ...
+        kind = i % 3
+        if kind == 0:
+            parts.append(re.sub(r'\s+', ' ', part))
+        elif kind == 1:
+            if part[:6].lower() == '<style':
+                open_end = part.index('>') + 1
+                close_start = part.lower().rindex('</style')
+                part = part[:open_end] + minify_css(part[open_end:close_start]) + part[close_start:]
+            parts.append(part)
+    return re.sub(r'>\s+<', '> <', ''.join(parts)).strip()
+
+
+def project_title(report_dir, manifest):
+    if manifest and manifest.get('project'):
+        name = manifest['project']
+    else:
+        name = re.sub(r'-analysis-.*$', '', Path(report_dir).name)
+    return name.replace('-', ' ').replace('_', ' ').title()
+
+
+def build_bundle(report_dir):
+    """Return the bundled, minified HTML for a report folder."""
+    report_dir = Path(report_dir)
+    sections = section_files(report_dir)
+    if not sections:
+        raise FileNotFoundError(f"No section files found in {report_dir}")
+    manifest = load_manifest(report_dir)
+
+    texts = [strip_fences(path.read_text(encoding='utf-8')) for _, _, path in sections]
+    # Scripts cannot run inside a shadow root (document.getElementById does not
+    # see its elements, and top-level declarations of sections collide), so
+    # those sections are kept whole as iframe documents
+    framed = [bool(SCRIPT_RE.search(text)) for text in texts]
+    shadowed = [i for i, frame in enumerate(framed) if not frame]
+    bodies, shared_css = dedupe_styles([section_body(texts[i]) for i in shadowed])
+    contents = dict(zip(shadowed, bodies))
+
+    nav = []
+    panes = []
+    for i, (num, name, _) in enumerate(sections):
+        active = ' active' if i == 0 else ''
+        nav.append(f'<li><a href="#section{num}" data-pane="s{num}" class="nav-link{active}">'
+                   f'<span class="section-number">{int(num)}</span>{html.escape(name)}</a></li>')
+        if framed[i]:
+            # Without any "<", the JSON cannot end the script element early
+            document = json.dumps(texts[i]).replace('<', '\\u003c')
+            panes.append(f'<div class="pane framed{active}" id="s{num}">'
+                         f'<script type="application/json">{document}</script></div>')
+        else:
+            panes.append(f'<div class="pane{active}" id="s{num}"><template>{contents[i]}</template></div>')
+
+    title = project_title(report_dir, manifest)
+    model = manifest['model'] if manifest else ''
+    # Stamped with the report's generation time (the newest section file for
+    # reports without a manifest), so exporting a report twice gives the same bytes
+    generated = report_time(manifest) or datetime.fromtimestamp(
+        max(path.stat().st_mtime for _, _, path in sections), timezone.utc)
+    timestamp = build_time(generated).strftime(TIMESTAMP_FORMAT)
+    page = render_template(
+        'bundle.html',
+        title=title,
+        subtitle=f'{title} · {model}' if model else title,
+        nav=''.join(nav),
+        panes=''.join(panes),
+        shared_css=json.dumps(minify_css(shared_css)).replace('</', '<\\/'),
+        timestamp=timestamp,
+    )
+    return minify_html(page)
+
+
+def write_variants(output, content, use_gzip=False, use_brotli=False):
+    """Write the bundle and any requested precompressed variants. Returns the paths written."""
+    data = content.encode('utf-8')
+    output.write_bytes(data)
+    written = [output]
+    if use_gzip:
+        path = output.with_name(output.name + '.gz')
+        path.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        written.append(path)
+    if use_brotli:
+        path = output.with_name(output.name + '.br')
+        path.write_bytes(brotli.compress(data, mode=brotli.MODE_TEXT, quality=11))
+        written.append(path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export reports as single-file HTML bundles')
+    parser.add_argument('report_dirs', nargs='+', help='Report folders to export')
+    parser.add_argument('--output', help='Output file (only with a single report folder)')
+    parser.add_argument('--gzip', action='store_true', help='Also write a precompressed .gz file')
+    parser.add_argument('--brotli', action='store_true', help='Also write a precompressed .br file')
+    args = parser.parse_args()
+
+    if args.output and len(args.report_dirs) > 1:
+        parser.error('--output can only be used with a single report folder')
+    if args.brotli and brotli is None:
+        print("Error: --brotli needs the brotli package (pip install brotli)", file=sys.stderr)
+        sys.exit(1)
+
+    failed = False
+    for report_dir in args.report_dirs:
+        report_dir = Path(report_dir).resolve()
+        try:
+            bundle = build_bundle(report_dir)
+        except (FileNotFoundError, NotADirectoryError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            failed = True
+            continue
+        output = Path(args.output) if args.output else report_dir.with_name(report_dir.name + '.html')
+        original = sum(path.stat().st_size for _, _, path in section_files(report_dir))
+        for path in write_variants(output, bundle, args.gzip, args.brotli):
+            print(f"✓ {path} ({path.stat().st_size / 1024:.0f} KB)")
+        print(f"  {original / 1024:.0f} KB of section files bundled")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,187 +1,13 @@
 #!/bin/bash
 # scripts/generate-provenance.sh - Generate metadata section for VenturePulse report
+# (rendered from templates/provenance.html by scripts/render.py; the optional
+# report directory adds the model that produced each section, from manifest.json)
 
 set -e
 
-if [ $# -ne 2 ]; then
-    echo "Usage: $0 <project-name> <model>" >&2
+if [ $# -lt 2 ] || [ $# -gt 3 ]; then
+    echo "Usage: $0 <project-name> <model> [report-dir]" >&2
     exit 1
 fi
 
-PROJECT_NAME="$1"
-MODEL="$2"
-TIMESTAMP=$(date -u +"%Y-%m-%d %H:%M:%S UTC")
-ISO_TIMESTAMP=$(date -u +"%Y-%m-%dT%H:%M:%SZ")
-
-# Extract provider from model string
-PROVIDER=$(echo "$MODEL" | cut -d'/' -f1)
-
-# Map provider to full name
-case $PROVIDER in
-    "google")
-        PROVIDER_NAME="Google AI"
-        ;;
-    "anthropic")
-        PROVIDER_NAME="Anthropic"
-        ;;
-    "openai")
-        PROVIDER_NAME="OpenAI"
-        ;;
-    "xai")
-        PROVIDER_NAME="xAI"
-        ;;
-    "deepseek")
-        PROVIDER_NAME="DeepSeek"
-        ;;
-    "mistral")
-        PROVIDER_NAME="Mistral AI"
-        ;;
-    "meta-llama")
-        PROVIDER_NAME="Meta"
-        ;;
-    *)
-        PROVIDER_NAME="$PROVIDER"
-        ;;
-esac
-
-# Generate HTML
-cat << EOF
-<div style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 900px; margin: 0 auto; padding: 2rem;">
-    <h2 style="color: #2d3748; font-size: 2rem; border-bottom: 3px solid #667eea; padding-bottom: 0.5rem; margin-bottom: 2rem;">
-        Provenance & Metadata
-    </h2>
-    
-    <div style="background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%); padding: 2rem; border-radius: 12px; margin-bottom: 2rem; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-        <h3 style="color: #667eea; margin-top: 0; margin-bottom: 1.5rem; font-size: 1.3rem;">Analysis Details</h3>
-        
-        <table style="width: 100%; border-collapse: collapse;">
-            <tr>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; font-weight: 600; color: #495057; width: 35%;">
-                    Project Name
-                </td>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; color: #212529;">
-                    $PROJECT_NAME
-                </td>
-            </tr>
-            <tr>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; font-weight: 600; color: #495057;">
-                    Generated At
-                </td>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; color: #212529;">
-                    $TIMESTAMP
-                </td>
-            </tr>
-            <tr>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; font-weight: 600; color: #495057;">
-                    AI Model
-                </td>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; color: #212529;">
-                    <code style="background: white; padding: 0.25rem 0.5rem; border-radius: 4px; font-family: 'Courier New', monospace; font-size: 0.9rem;">$MODEL</code>
-                </td>
-            </tr>
-            <tr>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; font-weight: 600; color: #495057;">
-                    AI Provider
-                </td>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; color: #212529;">
-                    $PROVIDER_NAME
-                </td>
-            </tr>
-            <tr>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; font-weight: 600; color: #495057;">
-                    Prompt Version
-                </td>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; color: #212529;">
-                    VenturePulse v1.0
-                </td>
-            </tr>
-            <tr>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; font-weight: 600; color: #495057;">
-                    Temperature Strategy
-                </td>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; color: #212529;">
-                    Creative: 0.7 &nbsp;•&nbsp; Precision: 0.2
-                </td>
-            </tr>
-            <tr>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; font-weight: 600; color: #495057;">
-                    API Gateway
-                </td>
-                <td style="padding: 1rem; border-bottom: 1px solid #dee2e6; color: #212529;">
-                    <a href="https://openrouter.ai" target="_blank" style="color: #667eea; text-decoration: none;">OpenRouter</a>
-                </td>
-            </tr>
-            <tr>
-                <td style="padding: 1rem; font-weight: 600; color: #495057;">
-                    Generator
-                </td>
-                <td style="padding: 1rem; color: #212529;">
-                    <a href="https://github.com/knightsri/VenturePulse" target="_blank" style="color: #667eea; text-decoration: none;">VenturePulse CLI v1.0</a>
-                </td>
-            </tr>
-        </table>
-    </div>
-    
-    <div style="background: #e3f2fd; border-left: 4px solid #2196f3; padding: 1.5rem; border-radius: 8px; margin-bottom: 2rem;">
-        <h4 style="margin-top: 0; color: #1976d2; font-size: 1.1rem;">
-            ℹ️ About This Analysis
-        </h4>
-        <p style="line-height: 1.6; color: #424242; margin: 0;">
-            This comprehensive viability analysis was generated using AI-powered strategic assessment 
-            across technical feasibility, market opportunity, competitive positioning, business economics, 
-            and execution planning. The analysis applies creative exploration for innovation and market 
-            positioning (Temperature 0.7), and precision analysis for financial modeling and risk assessment 
-            (Temperature 0.2).
-        </p>
-    </div>
-    
-    <div style="background: #fff3cd; border-left: 4px solid #ffc107; padding: 1.5rem; border-radius: 8px; margin-bottom: 2rem;">
-        <h4 style="margin-top: 0; color: #856404; font-size: 1.1rem;">
-            ⚠️ Important Disclaimer
-        </h4>
-        <p style="line-height: 1.6; color: #856404; margin-bottom: 1rem;">
-            This analysis was generated by AI and should be used as a <strong>starting point for decision-making</strong>, 
-            not as the sole basis for business decisions. The information provided is based on the AI model's training 
-            data and reasoning capabilities as of its knowledge cutoff date.
-        </p>
-        <p style="line-height: 1.6; color: #856404; margin: 0;">
-            <strong>Always:</strong> Validate findings with domain experts, conduct your own market research, 
-            verify competitive intelligence, and perform due diligence before making significant commitments or investments.
-        </p>
-    </div>
-    
-    <div style="background: #f8f9fa; padding: 1.5rem; border-radius: 8px; border: 1px solid #dee2e6;">
-        <h4 style="margin-top: 0; color: #495057; font-size: 1.1rem;">
-            📚 Learn More
-        </h4>
-        <ul style="line-height: 1.8; color: #495057; margin: 0; padding-left: 1.5rem;">
-            <li>
-                <a href="https://github.com/knightsri/VenturePulse" target="_blank" style="color: #667eea; text-decoration: none;">
-                    VenturePulse on GitHub
-                </a> - View source code and prompts
-            </li>
-            <li>
-                <a href="https://openrouter.ai/models" target="_blank" style="color: #667eea; text-decoration: none;">
-                    OpenRouter Models
-                </a> - Explore available AI models
-            </li>
-            <li>
-                <a href="https://github.com/knightsri/VenturePulse/issues" target="_blank" style="color: #667eea; text-decoration: none;">
-                    Report Issues
-                </a> - Suggest improvements or report bugs
-            </li>
-        </ul>
-    </div>
-    
-    <div style="margin-top: 3rem; padding-top: 2rem; border-top: 1px solid #dee2e6; text-align: center; color: #6c757d; font-size: 0.9rem;">
-        <p style="margin: 0;">
-            Generated with ❤️ by <strong>VenturePulse</strong> 
-            &nbsp;•&nbsp; 
-            <a href="https://github.com/knightsri/VenturePulse/blob/main/LICENSE" target="_blank" style="color: #667eea; text-decoration: none;">MIT License</a>
-        </p>
-        <p style="margin: 0.5rem 0 0 0; font-size: 0.85rem;">
-            Built by founders, for founders 🚀
-        </p>
-    </div>
-</div>
-EOF
+exec python3 "$(dirname "$0")/render.py" provenance "$@"
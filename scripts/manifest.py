@@ -0,0 +1,104 @@
+"""
+VenturePulse Run Manifest
+Every report folder gets a manifest.json describing how it was generated:
+model, provider, timestamps, prompt hashes, the section list with per-section
+timings and usage, and a summary of each run. createindex.py reads it instead
+of parsing the report HTML.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Provider display names (mirrors generate-provenance.sh)
+PROVIDER_NAMES = {
+    'google': 'Google AI',
+    'anthropic': 'Anthropic',
+    'openai': 'OpenAI',
+    'xai': 'xAI',
+    'deepseek': 'DeepSeek',
+    'mistral': 'Mistral AI',
+    'meta-llama': 'Meta',
+}
+
+# Telemetry fields copied into each section entry
+SECTION_FIELDS = ('status', 'served_by', 'provider_model', 'finish_reason', 'attempts',
+                  'timings_ms', 'prompt_tokens', 'cached_tokens', 'completion_tokens', 'cost_usd',
+                  'repairs', 'problems', 'error')
+
+
+def provider_name(model):
+    provider = model.split('/', 1)[0]
+    return PROVIDER_NAMES.get(provider, provider)
+
+
+def sha256_text(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def load_manifest(folder):
+    """Return the manifest of a report folder, or None if it has none."""
+    try:
+        with open(Path(folder) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def update_manifest(report_dir, jobs, records, run):
+    """Merge one run into report_dir/manifest.json.
+
+    jobs are the SectionJobs of the report that were scheduled in this run,
+    records their telemetry section records and run the run summary record.
+    Sections not in this run (e.g. after --refresh-section) keep their entries.
+    """
+    report_dir = Path(report_dir)
+    manifest = load_manifest(report_dir) or {}
+    now = datetime.now().isoformat(timespec='seconds')
+    first = jobs[0]
+
+    manifest.update(
+        version=MANIFEST_VERSION,
+        project=manifest.get('project') or (first.project_file and Path(first.project_file).stem),
+        model=first.model,
+        provider=provider_name(first.model),
+        created=manifest.get('created') or run['started'],
+        updated=now,
+    )
+    if first.project_file:
+        manifest['project_sha256'] = sha256_text(Path(first.project_file).read_text(encoding='utf-8'))
+
+    sections = {entry['num']: entry for entry in manifest.get('sections', [])}
+    by_num = {record['section']: record for record in records}
+    for job in jobs:
+        record = by_num.get(job.num)
+        if record is None:
+            continue
+        prompt = json.dumps(job.messages, sort_keys=True, ensure_ascii=False)
+        entry = {'num': job.num, 'name': job.name, 'file': job.output_file.name,
+                 'prompt_sha256': sha256_text(prompt), 'generated': record.get('ts')}
+        entry.update((name, record[name]) for name in SECTION_FIELDS if record.get(name) is not None)
+        previous = sections.get(job.num)
+        if previous and previous.get('status') != 'failed':
+            # A failed retry does not replace a section that was generated
+            # earlier, and a cache hit keeps the timings of the original call
+            if entry['status'] == 'failed':
+                continue
+            if entry['status'] == 'cached' and previous.get('prompt_sha256') == entry['prompt_sha256']:
+                continue
+        sections[job.num] = entry
+    manifest['sections'] = [sections[num] for num in sorted(sections)]
+    manifest['runs'] = manifest.get('runs', []) + [{k: v for k, v in run.items() if k != 'type'}]
+
+    tmp_path = report_dir / f'{MANIFEST_FILE}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, report_dir / MANIFEST_FILE)
+    return manifest
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Mock OpenRouter Server
+A local stand-in for the OpenRouter chat-completions endpoint, so the
+pipeline can be run and benchmarked offline without spending API credits.
+Latency, token rate, error and 429 injection are configurable; responses are
+canned section HTML, streamed as server-sent events when requested.
+
+Usage:
+    python3 mockserver.py [--port 8089] [--latency 0.5] [--tokens-per-sec 200]
+    python3 mockserver.py --error-rate 0.05 --rate-limit-rate 0.1 --html-dir my-idea-analysis-*/
+    python3 mockserver.py --down-model openai/gpt-4o --slow-model anthropic/claude-sonnet-4
+
+Then point the pipeline at it:
+    export OPENROUTER_API_KEY=mock OPENROUTER_BASE_URL=http://127.0.0.1:8089/api/v1
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+DEFAULT_PORT = 8089
+COMPLETIONS_PATH = '/api/v1/chat/completions'
+
+# Rough size of a token, used for usage counts and pacing
+CHARS_PER_TOKEN = 4
+# Tokens per streamed delta
+CHUNK_TOKENS = 16
+# Latency multiplier for --slow-model
+SLOW_FACTOR = 10
+
+
+@dataclass
+class MockConfig:
+    latency: float = 0.5           # seconds until the response starts
+    jitter: float = 0.2            # latency varies by up to +/- this fraction
+    tokens_per_sec: float = 200.0  # completion speed; 0 sends everything at once
+    completion_tokens: int = 1500  # size of the synthetic section HTML
+    error_rate: float = 0.0        # fraction of requests failing with 502 (mid-stream when streaming)
+    rate_limit_rate: float = 0.0   # fraction of requests rejected with 429
+    retry_after: float = 1.0       # Retry-After seconds sent with a 429
+    truncate_rate: float = 0.0     # fraction of responses cut short with finish_reason "length"
+    html_dir: Path = None          # report folder whose sectionNN-*.html files are served
+    seed: int = None
+    down_models: tuple = field(default_factory=tuple)  # models always answered with 503
+    slow_models: tuple = field(default_factory=tuple)  # models answering SLOW_FACTOR times slower
+
+
+def synthetic_section(num, tokens):
+    """Section HTML of roughly the given number of tokens."""
+    paragraph = ('<p style="margin: 0 0 1rem 0; line-height: 1.6;">The mock analysis finds a '
+                 'growing market with several funded competitors, a feasible technical path and '
+                 'a clear first customer segment.</p>\n')
+    body = paragraph * max(1, tokens * CHARS_PER_TOKEN // len(paragraph))
+    return (f'<div class="section" style="font-family: sans-serif; padding: 1rem;">\n'
+            f'<h2 style="color: #667eea;">Section {num}: Mock Analysis</h2>\n{body}</div>')
+
+
+def load_canned(html_dir):
+    """Map section numbers to the HTML of a report folder's section files."""
+    canned = {}
+    for path in sorted(Path(html_dir).glob('section[0-9][0-9]-*.html')):
+        canned[path.name[7:9]] = path.read_text(encoding='utf-8')
+    return canned
+
+
+class MockServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering chat completions according to a MockConfig.
+
+    Use as a context manager to serve from a background thread:
+
+        with MockServer(MockConfig(latency=0.1)) as server:
+            os.environ['OPENROUTER_BASE_URL'] = server.base_url
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        super().__init__((host, port), MockHandler)
+        self.config = config or MockConfig()
+        self.canned = load_canned(self.config.html_dir) if self.config.html_dir else {}
+        self.random = random.Random(self.config.seed)
+        self.stats = Counter()
+        self._seen_prefixes = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/api/v1'
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+    def draw(self, model=None):
+        """Pick the outcome of one request: 'ok', 'error', 'rate_limit', 'truncate' or 'down'."""
+        config = self.config
+        with self._lock:
+            roll = self.random.random()
+            jitter = self.random.uniform(-config.jitter, config.jitter)
+        latency = config.latency * (SLOW_FACTOR if model in config.slow_models else 1)
+        outcome = 'down' if model in config.down_models else 'ok'
+        for name, rate in (('rate_limit', config.rate_limit_rate), ('error', config.error_rate),
+                           ('truncate', config.truncate_rate)):
+            if outcome == 'down':
+                break
+            if roll < rate:
+                outcome = name
+                break
+            roll -= rate
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats[outcome] += 1
+        return outcome, max(0.0, latency * (1 + jitter))
+
+    def content_for(self, messages):
+        """The section HTML for a request, picked by the section number in the last message."""
+        text = json.dumps(messages[-1]) if messages else ''
+        match = re.search(r'Section (\d\d)', text)
+        num = match.group(1) if match else '00'
+        if num in self.canned:
+            return self.canned[num]
+        return synthetic_section(num, self.config.completion_tokens)
+
+    def usage(self, messages, content):
+        """Token counts; a system message seen before counts as served from the prompt cache."""
+        prefix = json.dumps(messages[0]) if messages and messages[0].get('role') == 'system' else None
+        with self._lock:
+            cached = prefix is not None and prefix in self._seen_prefixes
+            if prefix is not None:
+                self._seen_prefixes.add(prefix)
+        return {
+            'prompt_tokens': len(json.dumps(messages)) // CHARS_PER_TOKEN,
+            'completion_tokens': max(1, len(content) // CHARS_PER_TOKEN),
+            'prompt_tokens_details': {'cached_tokens': len(prefix) // CHARS_PER_TOKEN if cached else 0},
+        }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, payload, headers=()):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_chunk(self, text):
+        data = text.encode('utf-8')
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            self.send_json(400, {'error': {'code': 400, 'message': 'Invalid JSON body'}})
+            return
+        if self.path != COMPLETIONS_PATH:
+            self.send_json(404, {'error': {'code': 404, 'message': f'Not found: {self.path}'}})
+            return
+
+        server = self.server
+        outcome, latency = server.draw(body.get('model'))
+        time.sleep(latency)
+        if outcome == 'down':
+            self.send_json(503, {'error': {'code': 503, 'message': 'No available providers (mock)'}})
+            return
+        if outcome == 'rate_limit':
+            self.send_json(429, {'error': {'code': 429, 'message': 'Rate limit exceeded (mock)'}},
+                           [('Retry-After', f'{server.config.retry_after:g}')])
+            return
+        if outcome == 'error' and not body.get('stream'):
+            self.send_json(502, {'error': {'code': 502, 'message': 'Upstream provider error (mock)'}})
+            return
+
+        model = body.get('model', 'mock/model')
+        messages = body.get('messages') or []
+        content = server.content_for(messages)
+        finish_reason = 'stop'
+        if outcome == 'truncate':
+            content = content[:len(content) // 2]
+            finish_reason = 'length'
+        usage = server.usage(messages, content)
+        if body.get('stream'):
+            self.stream(model, content, finish_reason, usage, fail=outcome == 'error')
+            return
+
+        rate = server.config.tokens_per_sec
+        if rate > 0:
+            time.sleep(usage['completion_tokens'] / rate)
+        self.send_json(200, {
+            'id': 'gen-mock',
+            'model': model,
+            'choices': [{'message': {'role': 'assistant', 'content': content},
+                         'finish_reason': finish_reason}],
+            'usage': usage,
+        })
+
+    def stream(self, model, content, finish_reason, usage, fail=False):
+        """Send the completion as server-sent events, failing halfway when fail is set."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self.send_chunk(': OPENROUTER PROCESSING\n\n')
+
+        rate = self.server.config.tokens_per_sec
+        step = CHUNK_TOKENS * CHARS_PER_TOKEN
+        for i in range(0, len(content), step):
+            if fail and i >= len(content) // 2:
+                self.send_chunk('data: ' + json.dumps({
+                    'error': {'code': 502, 'message': 'Upstream provider error (mock)'},
+                    'choices': [{'delta': {}, 'finish_reason': 'error'}]}) + '\n\n')
+                break
+            delta = {'model': model, 'choices': [{'delta': {'content': content[i:i + step]}}]}
+            self.send_chunk('data: ' + json.dumps(delta) + '\n\n')
+            if rate > 0:
+                time.sleep(CHUNK_TOKENS / rate)
+        else:
+            self.send_chunk('data: ' + json.dumps({
+                'model': model, 'choices': [{'delta': {}, 'finish_reason': finish_reason}],
+                'usage': usage}) + '\n\n')
+            self.send_chunk('data: [DONE]\n\n')
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+
+def add_config_arguments(parser):
+    """Add the MockConfig options to an argparse parser."""
+    defaults = MockConfig()
+    parser.add_argument('--latency', type=float, default=defaults.latency,
+                        help=f'Seconds until a response starts (default: {defaults.latency:g})')
+    parser.add_argument('--jitter', type=float, default=defaults.jitter,
+                        help=f'Random latency variation as a fraction (default: {defaults.jitter:g})')
+    parser.add_argument('--tokens-per-sec', type=float, default=defaults.tokens_per_sec,
+                        help=f'Completion token rate, 0 for instant (default: {defaults.tokens_per_sec:g})')
+    parser.add_argument('--completion-tokens', type=int, default=defaults.completion_tokens,
+                        help=f'Size of synthetic responses (default: {defaults.completion_tokens})')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failing with 502')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=float, default=defaults.retry_after,
+                        help=f'Retry-After seconds for 429s (default: {defaults.retry_after:g})')
+    parser.add_argument('--truncate-rate', type=float, default=0.0,
+                        help='Fraction of responses cut short with finish_reason "length"')
+    parser.add_argument('--html-dir', help='Serve the section files of this report folder instead of synthetic HTML')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible error injection')
+    parser.add_argument('--down-model', action='append', default=[], metavar='MODEL',
+                        help='Answer every request for this model with 503 (repeatable)')
+    parser.add_argument('--slow-model', action='append', default=[], metavar='MODEL',
+                        help=f'Answer requests for this model {SLOW_FACTOR}x slower (repeatable)')
+
+
+def config_from_args(args):
+    return MockConfig(
+        latency=args.latency, jitter=args.jitter, tokens_per_sec=args.tokens_per_sec,
+        completion_tokens=args.completion_tokens, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+        truncate_rate=args.truncate_rate, html_dir=Path(args.html_dir) if args.html_dir else None,
+        seed=args.seed, down_models=tuple(args.down_model), slow_models=tuple(args.slow_model),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local mock of the OpenRouter chat-completions API')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT})')
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockServer(config_from_args(args), port=args.port)
+    print(f"Mock OpenRouter listening on {server.base_url}")
+    print(f"  export OPENROUTER_API_KEY=mock OPENROUTER_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\nServed {server.stats['requests']} requests: "
+              + ', '.join(f"{count} {name}" for name, count in sorted(server.stats.items()) if name != 'requests'))
+
+
+if __name__ == '__main__':
+    main()
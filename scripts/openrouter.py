@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+VenturePulse OpenRouter Client
+Keeps one pool of keep-alive HTTP connections for a whole run and builds and
+parses the chat-completions JSON in-process (no curl or jq per call).
+
+Usage:
+    python3 openrouter.py <model> [prompt-file]    # the prompt is read from stdin without a file
+
+Environment:
+    OPENROUTER_API_KEY     Required
+    OPENROUTER_BASE_URL    Optional - point at a local stub server for testing
+                           (default: https://openrouter.ai/api/v1)
+"""
+
+import http.client
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from ratelimit import ModelRateLimiter
+
+DEFAULT_BASE_URL = 'https://openrouter.ai/api/v1'
+DEFAULT_MAX_TOKENS = 25192
+DEFAULT_TEMPERATURE = 0.7
+DEFAULT_TOP_P = 0.95
+DEFAULT_TIMEOUT = 600
+DEFAULT_POOL_SIZE = 8
+
+# HTTP statuses (or numeric error codes) worth retrying
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504, 520, 522, 524, 529}
+# Error codes we raise ourselves for responses that may succeed on a retry
+RETRYABLE_CODES = {'empty_choices', 'incomplete_stream', 'stream_error'}
+
+REQUEST_HEADERS = {
+    'Content-Type': 'application/json',
+    'HTTP-Referer': 'https://github.com/knightsri/VenturePulse',
+    'X-Title': 'VenturePulse CLI v1.0',
+}
+
+# Helpful hints for common API errors (mirrors call-openrouter.sh)
+ERROR_HINTS = {
+    'invalid_api_key': 'Check that your OPENROUTER_API_KEY is correct\nGet a key at: https://openrouter.ai/keys',
+    'insufficient_quota': 'Add credits to your OpenRouter account\nhttps://openrouter.ai/credits',
+    'model_not_found': 'Check available models at: https://openrouter.ai/models',
+}
+
+# Errors that mean a pooled keep-alive connection was closed by the server
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class OpenRouterError(Exception):
+    """Raised when the API returns an error or an unusable response."""
+
+    def __init__(self, message, code=None, status=None, retry_after=None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.status = status
+        self.retry_after = retry_after
+
+    def __str__(self):
+        lines = ['Error from OpenRouter API:',
+                 f'  Type: {self.code or "unknown"}',
+                 f'  Message: {self.message}']
+        hint = ERROR_HINTS.get(self.code)
+        if hint:
+            lines += ['', f'Hint: {hint}']
+        return '\n'.join(lines)
+
+
+@dataclass
+class Completion:
+    """A parsed chat completion."""
+    content: str
+    model: str = None
+    finish_reason: str = None
+    usage: dict = field(default_factory=dict)
+    # Streaming only: seconds to first token, total seconds, completion tokens/sec
+    ttft: float = None
+    elapsed: float = None
+    tokens_per_sec: float = None
+    attempts: int = 1
+    status: int = None
+    # Milliseconds per phase of the final attempt: build, connect, ttft, transfer, parse
+    timings: dict = field(default_factory=dict)
+
+
+class ConnectionPool:
+    """A small thread-safe pool of keep-alive HTTP(S) connections to one host."""
+
+    def __init__(self, base_url, size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._closed = False
+
+    def _connect(self):
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def acquire(self):
+        """Return (connection, reused) - an idle connection if one is available."""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def release(self, conn):
+        """Return a connection to the pool, or close it if the pool is full."""
+        if self._closed:
+            conn.close()
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def build_request(model, messages, max_tokens=DEFAULT_MAX_TOKENS,
+                  temperature=DEFAULT_TEMPERATURE, top_p=DEFAULT_TOP_P, stream=False):
+    """Build the chat-completions request body.
+
+    messages may be a list of chat messages or a single user prompt string.
+    """
+    if isinstance(messages, str):
+        messages = [{'role': 'user', 'content': messages}]
+    request = {
+        'model': model,
+        'messages': messages,
+        'max_tokens': max_tokens,
+        'temperature': temperature,
+        'top_p': top_p,
+        # Ask OpenRouter to report the actual cost of the call in usage
+        'usage': {'include': True},
+    }
+    if stream:
+        request['stream'] = True
+    return request
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter, capped by attempts and total time."""
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    max_elapsed: float = 900.0
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retrying after the given (1-based) attempt."""
+        if retry_after is not None:
+            # Honour the server's hint, plus a little jitter so clients don't stampede
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+def is_retryable(error):
+    """Classify an exception raised while calling the API."""
+    if isinstance(error, OpenRouterError):
+        if error.code in RETRYABLE_CODES or error.status in RETRYABLE_STATUSES:
+            return True
+        return isinstance(error.code, int) and error.code in RETRYABLE_STATUSES
+    return isinstance(error, (TimeoutError, ConnectionError, http.client.HTTPException))
+
+
+def elapsed_ms(start):
+    """Milliseconds since the time.monotonic() value start."""
+    return round((time.monotonic() - start) * 1000, 1)
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class OpenRouterClient:
+    """Chat-completions client sharing one connection pool across calls and threads.
+
+    An optional rate_limiter (anything with an acquire() method, such as
+    ratelimit.TokenBucket) is consulted before every request, as is the
+    per-model model_limiter. Failed calls are retried according to retry.
+    """
+
+    def __init__(self, api_key=None, base_url=None, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT, rate_limiter=None, model_limiter=None,
+                 retry=None):
+        self.api_key = api_key or os.environ.get('OPENROUTER_API_KEY')
+        if not self.api_key:
+            raise OpenRouterError('OPENROUTER_API_KEY environment variable not set',
+                                  code='invalid_api_key')
+        self.base_url = base_url or os.environ.get('OPENROUTER_BASE_URL') or DEFAULT_BASE_URL
+        self.pool = ConnectionPool(self.base_url, size=pool_size, timeout=timeout)
+        self.rate_limiter = rate_limiter
+        self.model_limiter = model_limiter or ModelRateLimiter(
+            float(os.environ.get('VENTUREPULSE_MODEL_RATE_LIMIT', 0)))
+        self.retry = retry or RetryPolicy()
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self.retries = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+
+    def open(self, path, body, timings=None):
+        """POST a JSON body and return (connection, response) once headers arrive.
+
+        A request on a reused connection that the server has already closed is
+        retried on a fresh connection. Hand both back to finish() after reading.
+        When a timings dict is given, the milliseconds spent encoding the body
+        ("build"), connecting (0 on a reused connection) and waiting for the
+        response headers ("ttft") are recorded in it.
+        """
+        timings = {} if timings is None else timings
+        start = time.monotonic()
+        payload = json.dumps(body).encode('utf-8')
+        headers = dict(REQUEST_HEADERS, Authorization=f'Bearer {self.api_key}')
+        timings['build'] = elapsed_ms(start)
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        self.model_limiter.acquire(body.get('model'))
+        while True:
+            conn, reused = self.pool.acquire()
+            if not reused:
+                with self._lock:
+                    self.connections_opened += 1
+            try:
+                start = time.monotonic()
+                if not reused:
+                    conn.connect()
+                timings['connect'] = elapsed_ms(start)
+                start = time.monotonic()
+                conn.request('POST', self.pool.base_path + path, body=payload, headers=headers)
+                response = conn.getresponse()
+                timings['ttft'] = elapsed_ms(start)
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            with self._lock:
+                self.requests_sent += 1
+            return conn, response
+
+    def finish(self, conn, response, ok=True):
+        """Return a fully read connection to the pool (or close it)."""
+        if ok and not response.will_close and response.isclosed():
+            self.pool.release(conn)
+        else:
+            conn.close()
+
+    def post(self, path, body, timings=None):
+        """POST a JSON body and return (status, headers, raw bytes)."""
+        timings = {} if timings is None else timings
+        conn, response = self.open(path, body, timings)
+        start = time.monotonic()
+        try:
+            data = response.read()
+            timings['transfer'] = elapsed_ms(start)
+        except Exception:
+            self.finish(conn, response, ok=False)
+            raise
+        self.finish(conn, response)
+        return response.status, response.headers, data
+
+    def chat(self, model, messages, **params):
+        """Send a chat completion request and return a Completion.
+
+        messages may be a list of chat messages or a single user prompt string.
+        """
+        return self.send(build_request(model, messages, **params))
+
+    def with_retries(self, model, attempt, on_retry=None, retry=None):
+        """Call attempt() until it succeeds or the retry policy gives up.
+
+        Retryable errors (429, 5xx, timeouts, empty or broken responses) are
+        retried with exponential backoff and jitter, honouring Retry-After.
+        on_retry() is called before each new attempt. The number of attempts
+        made is set on the returned Completion, or on the exception raised.
+        retry overrides the client's RetryPolicy for this call.
+        """
+        retry = retry or self.retry
+        start = time.monotonic()
+        number = 1
+        while True:
+            try:
+                completion = attempt()
+                completion.attempts = number
+                return completion
+            except Exception as e:
+                e.attempts = number
+                if not is_retryable(e) or number >= retry.max_attempts:
+                    raise
+                delay = retry.delay(number, getattr(e, 'retry_after', None))
+                if time.monotonic() - start + delay > retry.max_elapsed:
+                    raise
+                reason = e.message if isinstance(e, OpenRouterError) else repr(e)
+                print(f"  ↻ {model}: {reason} - retrying in {delay:.1f}s "
+                      f"(attempt {number + 1}/{retry.max_attempts})", file=sys.stderr)
+                with self._lock:
+                    self.retries += 1
+            time.sleep(delay)
+            number += 1
+            if on_retry:
+                on_retry()
+
+    def send(self, request, retry=None):
+        """Send a prebuilt chat-completions request body and return a Completion."""
+        def attempt():
+            timings = {}
+            status, headers, data = self.post('/chat/completions', request, timings)
+            start = time.monotonic()
+            completion = parse_completion(status, data, headers)
+            timings['parse'] = elapsed_ms(start)
+            completion.status = status
+            completion.timings = timings
+            return completion
+        return self.with_retries(request.get('model'), attempt, retry=retry)
+
+    def stream(self, request, on_text=None, on_retry=None, retry=None):
+        """Send request with "stream": true and return the assembled Completion.
+
+        on_text(text) is called for every content delta as it arrives. Errors
+        reported mid-stream and streams that end before a finish_reason raise
+        OpenRouterError (after retries; on_retry() is called before each retry
+        so the caller can discard partial output); a finish_reason of "length"
+        is returned for the caller to treat as truncation. The "ttft" timing
+        of a stream runs to the first content token and "transfer" from there
+        to the end of the stream.
+        """
+        request = dict(request, stream=True)
+        return self.with_retries(request.get('model'),
+                                 lambda: self._stream_once(request, on_text), on_retry, retry)
+
+    def _stream_once(self, request, on_text):
+        start = time.monotonic()
+        timings = {}
+        conn, response = self.open('/chat/completions', request, timings)
+        sent = time.monotonic() - timings['ttft'] / 1000
+        ok = False
+        try:
+            if response.status != 200:
+                completion = parse_completion(response.status, response.read(), response.headers)
+                ok = True
+                return completion
+            completion = self._read_stream(response, start, on_text, sent, timings)
+            completion.status = response.status
+            completion.timings = timings
+            ok = True
+            return completion
+        finally:
+            self.finish(conn, response, ok=ok)
+
+    def _read_stream(self, response, start, on_text, sent, timings):
+        parts = []
+        completion = Completion(content='')
+        deltas = 0
+        done = False
+        first_token = None
+        parsing = 0.0
+        for event in iter_sse(response):
+            if event == '[DONE]':
+                done = True
+                response.read()  # drain the chunked terminator so the connection can be reused
+                break
+            parse_start = time.monotonic()
+            try:
+                chunk = json.loads(event)
+            except ValueError:
+                raise OpenRouterError(f'Malformed stream chunk: {event[:200]}', status=response.status)
+            parsing += time.monotonic() - parse_start
+
+            error = chunk.get('error')
+            if error:
+                message = error.get('message', 'Unknown error') if isinstance(error, dict) else str(error)
+                code = error.get('code') if isinstance(error, dict) else None
+                raise OpenRouterError(f'{message} (mid-stream, after {len("".join(parts))} chars)',
+                                      code=code, status=response.status)
+
+            completion.model = chunk.get('model') or completion.model
+            if chunk.get('usage'):
+                completion.usage = chunk['usage']
+            for choice in chunk.get('choices') or []:
+                text = (choice.get('delta') or {}).get('content')
+                if text:
+                    if completion.ttft is None:
+                        first_token = time.monotonic()
+                        completion.ttft = first_token - start
+                    deltas += 1
+                    parts.append(text)
+                    if on_text:
+                        on_text(text)
+                if choice.get('finish_reason'):
+                    completion.finish_reason = choice['finish_reason']
+
+        if not done and completion.finish_reason is None:
+            raise OpenRouterError('Stream ended before the response was complete',
+                                  code='incomplete_stream', status=response.status)
+        if completion.finish_reason == 'error':
+            raise OpenRouterError('Provider reported an error mid-stream',
+                                  code='stream_error', status=response.status)
+
+        completion.content = ''.join(parts)
+        end = time.monotonic()
+        completion.elapsed = end - start
+        first_token = first_token or end
+        timings['ttft'] = round((first_token - sent) * 1000, 1)
+        timings['transfer'] = round((end - first_token) * 1000, 1)
+        timings['parse'] = round(parsing * 1000, 1)
+        tokens = completion.usage.get('completion_tokens') or deltas
+        generating = completion.elapsed - (completion.ttft or 0)
+        if tokens and generating > 0:
+            completion.tokens_per_sec = tokens / generating
+        return completion
+
+
+def iter_sse(response):
+    """Yield the data payload of each server-sent event (comments are skipped)."""
+    data = []
+    for raw in response:
+        line = raw.decode('utf-8').rstrip('\r\n')
+        if not line:
+            if data:
+                yield '\n'.join(data)
+                data = []
+        elif line.startswith('data:'):
+            data.append(line[5:].lstrip(' '))
+    if data:
+        yield '\n'.join(data)
+
+
+def parse_completion(status, data, headers=None):
+    """Parse a chat-completions response body, raising OpenRouterError on errors."""
+    retry_after = parse_retry_after(headers.get('Retry-After')) if headers else None
+    try:
+        response = json.loads(data)
+    except ValueError:
+        snippet = data[:500].decode('utf-8', 'replace')
+        raise OpenRouterError(f'Unexpected API response format: {snippet}', status=status,
+                              retry_after=retry_after)
+
+    error = response.get('error') if isinstance(response, dict) else None
+    if error:
+        if isinstance(error, dict):
+            raise OpenRouterError(error.get('message', 'Unknown error'),
+                                  code=error.get('code'), status=status, retry_after=retry_after)
+        raise OpenRouterError(str(error), status=status, retry_after=retry_after)
+
+    choices = response.get('choices') if isinstance(response, dict) else None
+    if not choices:
+        raise OpenRouterError(f'Response has no choices: {str(response)[:500]}',
+                              code='empty_choices', status=status)
+
+    choice = choices[0]
+    message = choice.get('message') or {}
+    return Completion(
+        content=message.get('content') or '',
+        model=response.get('model'),
+        finish_reason=choice.get('finish_reason'),
+        usage=response.get('usage') or {},
+    )
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print(f"Usage: {sys.argv[0]} <model> [prompt-file]", file=sys.stderr)
+        sys.exit(1)
+
+    # Read from a file or stdin, so large prompts never pass through argv
+    if len(sys.argv) == 3 and sys.argv[2] != '-':
+        try:
+            with open(sys.argv[2], 'r', encoding='utf-8') as f:
+                prompt = f.read()
+        except OSError as e:
+            print(f"Error: Could not read {sys.argv[2]}: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        prompt = sys.stdin.read()
+
+    try:
+        with OpenRouterClient() as client:
+            completion = client.chat(sys.argv[1], prompt)
+    except OpenRouterError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    print(completion.content)
+
+
+if __name__ == '__main__':
+    main()
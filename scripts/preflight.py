@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Request Preflight
+Sizes each section request before it is sent. The prompt is measured with a
+local tokenizer (tiktoken when it is installed, otherwise about 4 characters
+per token) and checked against the model's context window, and max_tokens is
+set per section from the completion lengths of earlier runs plus headroom
+instead of the same 25192 for every section. A response that still runs out
+of tokens is continued by analyze.py's repair step.
+
+Completion lengths persist between runs in <cache-dir>/completion-stats.json.
+
+Usage:
+    python3 preflight.py <project-file> [model]    # estimate every section's request
+    python3 preflight.py --learn reports/*/        # seed the history from telemetry.jsonl files
+
+Environment:
+    VENTUREPULSE_CONTEXT_WINDOW    Optional - context window (tokens) of models not listed below
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from cache import DEFAULT_CACHE_DIR
+from openrouter import DEFAULT_MAX_TOKENS
+from telemetry import read_log
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+HISTORY_FILE_NAME = 'completion-stats.json'
+HISTORY_FILE = DEFAULT_CACHE_DIR / HISTORY_FILE_NAME
+
+# Context windows in tokens; ":free" and other variants share their model's window
+CONTEXT_WINDOWS = {
+    'anthropic/claude-sonnet-4.5': 200_000,
+    'anthropic/claude-sonnet-4': 200_000,
+    'openai/gpt-4o': 128_000,
+    'openai/gpt-4o-mini': 128_000,
+    'openai/gpt-4-turbo': 128_000,
+    'google/gemini-2.5-pro': 1_048_576,
+    'google/gemini-2.5-flash': 1_048_576,
+    'deepseek/deepseek-chat': 163_840,
+    'deepseek/deepseek-r1-0528-qwen3-8b': 131_072,
+}
+DEFAULT_CONTEXT_WINDOW = 32_768
+
+TIKTOKEN_ENCODING = 'o200k_base'
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD = 4            # tokens per chat message for role and separators
+# Other providers' tokenizers differ from tiktoken's, so estimates are padded
+ESTIMATE_MARGIN = 1.1
+
+# Completion lengths remembered per model and section, and how many are needed
+HISTORY_WINDOW = 20
+MIN_SAMPLES = 3
+HEADROOM = 1.5                  # max_tokens = longest recent completion x HEADROOM
+MIN_MAX_TOKENS = 2048
+# Below this much room for the answer a request is not worth sending as it is
+MIN_COMPLETION_TOKENS = 1024
+
+
+@lru_cache(maxsize=1)
+def encoding():
+    """The tiktoken encoding, or None when tiktoken (or its encoding file) is unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(TIKTOKEN_ENCODING)
+    except Exception:
+        # The encoding is downloaded on first use, which fails offline
+        return None
+
+
+def count_tokens(text):
+    enc = encoding()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def message_tokens(messages):
+    """Estimated prompt tokens of chat messages (string or text-part contents)."""
+    total = 0
+    for message in messages:
+        content = message['content']
+        if not isinstance(content, str):
+            content = ''.join(part.get('text', '') for part in content)
+        total += count_tokens(content) + MESSAGE_OVERHEAD
+    return total
+
+
+def history_file(cache_dir=DEFAULT_CACHE_DIR):
+    """The completion history file kept in a cache directory."""
+    return Path(cache_dir) / HISTORY_FILE_NAME
+
+
+def context_window(model):
+    base = model.split(':', 1)[0]
+    if base in CONTEXT_WINDOWS:
+        return CONTEXT_WINDOWS[base]
+    return int(os.environ.get('VENTUREPULSE_CONTEXT_WINDOW', DEFAULT_CONTEXT_WINDOW))
+
+
+class CompletionHistory:
+    """Recent completion token counts per model and section, loaded from and saved to a JSON file."""
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self.models = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for model, sections in json.load(f).items():
+                    self.models[model] = {num: deque(samples, maxlen=HISTORY_WINDOW)
+                                          for num, samples in sections.items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+
+    def record(self, model, section, completion_tokens):
+        if not completion_tokens:
+            return
+        with self._lock:
+            samples = self.models.setdefault(model, {}).setdefault(section, deque(maxlen=HISTORY_WINDOW))
+            samples.append(int(completion_tokens))
+
+    def samples(self, model, section):
+        """Recent completion lengths of a section for model.
+
+        Other models' lengths are not used: they can differ several-fold for
+        the same section.
+        """
+        with self._lock:
+            return list(self.models.get(model, {}).get(section, ()))
+
+    def max_tokens(self, model, section):
+        """max_tokens for a section from its history, or DEFAULT_MAX_TOKENS without enough of it."""
+        samples = self.samples(model, section)
+        if len(samples) < MIN_SAMPLES:
+            return DEFAULT_MAX_TOKENS
+        tokens = math.ceil(max(samples) * HEADROOM / 256) * 256
+        return max(MIN_MAX_TOKENS, min(DEFAULT_MAX_TOKENS, tokens))
+
+    def save(self):
+        with self._lock:
+            data = {model: {num: list(samples) for num, samples in sections.items()}
+                    for model, sections in self.models.items()}
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class Plan:
+    """The preflight verdict for one request."""
+    prompt_tokens: int
+    max_tokens: int
+    context_window: int
+    model: str                  # the model with the smallest context window
+    fits: bool                  # whether the window leaves room for an answer
+
+    def describe(self):
+        return (f"prompt is ~{self.prompt_tokens:,} tokens, {self.model} has a "
+                f"{self.context_window:,}-token context window")
+
+
+def plan_request(messages, models, section, history):
+    """Size a section request for models (the primary first, then any fallbacks).
+
+    max_tokens comes from history for the primary model, capped so the
+    prompt and the answer fit the smallest context window among models.
+    """
+    prompt_tokens = message_tokens(messages)
+    model = min(models, key=context_window)
+    window = context_window(model)
+    room = window - math.ceil(prompt_tokens * ESTIMATE_MARGIN)
+    max_tokens = max(MIN_COMPLETION_TOKENS, min(history.max_tokens(models[0], section), room))
+    return Plan(prompt_tokens, max_tokens, window, model, room >= MIN_COMPLETION_TOKENS)
+
+
+def learn(paths, history):
+    """Record the completion lengths of successful calls in telemetry files (or report folders)."""
+    learned = 0
+    for path in paths:
+        for record in read_log(path):
+            if (record.get('type', 'section') == 'section' and record.get('status') == 'ok'
+                    and not record.get('problems') and record.get('completion_tokens')):
+                history.record(record['model'], record['section'], record['completion_tokens'])
+                learned += 1
+    return learned
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Estimate the size of each section request before sending it')
+    parser.add_argument('paths', nargs='+', help='<project-file> [model], or report folders with --learn')
+    parser.add_argument('--learn', action='store_true',
+                        help='Seed the completion history from the telemetry.jsonl of report folders')
+    parser.add_argument('--history-file', default=str(HISTORY_FILE),
+                        help=f'Completion history file (default: {HISTORY_FILE})')
+    args = parser.parse_args()
+
+    history = CompletionHistory(Path(args.history_file))
+    if args.learn:
+        learned = learn(args.paths, history)
+        history.save()
+        print(f"✓ Recorded {learned} completion lengths in {args.history_file}")
+        return
+
+    from analyze import DEFAULT_MODEL, build_messages, load_prompts, read_text
+    if len(args.paths) > 2:
+        parser.error('expected <project-file> [model]')
+    project_file = args.paths[0]
+    model = args.paths[1] if len(args.paths) > 1 else DEFAULT_MODEL
+    common_instructions, section_prompts = load_prompts()
+    try:
+        project_data = read_text(project_file)
+    except OSError as e:
+        print(f"Error: Could not read {project_file}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    tokenizer = f'tiktoken {TIKTOKEN_ENCODING}' if encoding() else f'~{CHARS_PER_TOKEN} chars/token'
+    print(f"{model}: {context_window(model):,}-token context window ({tokenizer})")
+    print(f"{'section':<32} {'prompt':>8} {'max_tokens':>10} {'history':>8}")
+    for section, section_prompt in section_prompts:
+        messages = build_messages(common_instructions, section_prompt, project_data, model)
+        plan = plan_request(messages, [model], section.num, history)
+        samples = len(history.samples(model, section.num))
+        note = '' if plan.fits else '  ⚠️  too large'
+        print(f"{section.num} {section.name:<29} {plan.prompt_tokens:>8,} {plan.max_tokens:>10,} {samples:>8}{note}")
+    print("(prompts exclude the condensed upstream sections added at run time)")
+
+
+if __name__ == '__main__':
+    main()
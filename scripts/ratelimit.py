@@ -0,0 +1,77 @@
+"""
+VenturePulse Rate Limiting
+Thread-safe token bucket shared by every request in a run.
+"""
+
+import threading
+import time
+
+# Requests per second across the whole run, and how many may start at once
+DEFAULT_RATE = 4.0
+DEFAULT_BURST = 8
+
+
+class TokenBucket:
+    """Classic token bucket: acquire() blocks until a token is available.
+
+    A rate of 0 (or less) disables limiting.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """Take tokens from the bucket, sleeping until enough have accrued."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# OpenRouter allows free (":free") model variants about 20 requests/minute
+FREE_MODEL_RATE = 20 / 60
+
+
+class ModelRateLimiter:
+    """Keeps one TokenBucket per model.
+
+    rates maps a model to requests/sec. Other models use default_rate, except
+    ":free" variants, which default to FREE_MODEL_RATE. A rate of 0 disables
+    limiting for that model.
+    """
+
+    def __init__(self, default_rate=0, rates=None, burst=DEFAULT_BURST):
+        self.default_rate = default_rate
+        self.rates = dict(rates or {})
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def rate_for(self, model):
+        if model in self.rates:
+            return self.rates[model]
+        if model and model.endswith(':free') and not self.default_rate:
+            return FREE_MODEL_RATE
+        return self.default_rate
+
+    def acquire(self, model):
+        with self._lock:
+            bucket = self._buckets.get(model)
+            if bucket is None:
+                bucket = self._buckets[model] = TokenBucket(self.rate_for(model), self.burst)
+        bucket.acquire()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Page Rendering
+Renders the report wrapper (index.html), the provenance section, the
+comparison index pages and the export bundle from the templates in
+templates/, in-process. Each
+template is compiled once into a Python function, so a batch of thousands of
+reports renders without forking bash, date or sed per report.
+
+Template syntax:
+    {{ name }} / {{ item.field }}      value, HTML-escaped
+    {{ name|raw }}                     value inserted as-is (trusted HTML, JSON)
+    {% for a, b in items %} ... {% endfor %}
+    {% if name %} ... {% elif other %} ... {% else %} ... {% endif %}  ("not name" works too)
+    {% include "other.html" %}          another template, pasted in before compiling
+
+A block tag alone on its line takes the whole line with it. Output is
+byte-reproducible: timestamps are passed in (SOURCE_DATE_EPOCH overrides the
+clock, as for reproducible builds) and nothing else varies between runs.
+
+Usage:
+    python3 render.py wrapper <project-name> <report-dir>
+    python3 render.py provenance <project-name> <model> [report-dir]   # written to stdout
+"""
+
+import argparse
+import html
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+from manifest import load_manifest, provider_name
+from sections import load_sections
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S UTC'
+
+# {{ expression }}, {% tag %} (swallowing its line when it stands alone) and {# comments #}
+TOKEN_RE = re.compile(r'^[ \t]*\{%\s*(?P<line_tag>.+?)\s*%\}[ \t]*\n'
+                      r'|\{\{\s*(?P<expr>.+?)\s*\}\}'
+                      r'|\{%\s*(?P<tag>.+?)\s*%\}'
+                      r'|\{#.*?#\}', re.MULTILINE | re.DOTALL)
+NAME_RE = re.compile(r'[A-Za-z_]\w*$')
+INCLUDE_RE = re.compile(r'\{%\s*include\s+"([\w.-]+)"\s*%\}')
+
+
+class TemplateError(Exception):
+    """Raised for a template that cannot be compiled."""
+
+
+def escape(value):
+    """HTML-escape a value for text or a quoted attribute; None renders as ''."""
+    return '' if value is None else html.escape(str(value), quote=True)
+
+
+def lookup(value, name):
+    """item.field: a dict key, or else an attribute."""
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+def compile_expression(expression, local_names, template):
+    negate = expression.startswith('not ')
+    if negate:
+        expression = expression[4:].strip()
+    parts = expression.split('.')
+    if not all(NAME_RE.match(part) for part in parts):
+        raise TemplateError(f"{template}: unsupported expression {expression!r}")
+    code = parts[0] if parts[0] in local_names else f'context.get({parts[0]!r})'
+    for part in parts[1:]:
+        code = f'lookup({code}, {part!r})'
+    return f'(not {code})' if negate else code
+
+
+def compile_template(source, name='<template>'):
+    """Compile template source into a function(context dict) -> str."""
+    lines = ['def render(context):', ' out = []', ' append = out.append']
+    depth = 1
+    blocks = []        # open block tags, innermost last
+    local_names = set()
+    pos = 0
+
+    def emit(line):
+        lines.append(' ' * depth + line)
+
+    for match in TOKEN_RE.finditer(source):
+        if match.start() > pos:
+            emit(f'append({source[pos:match.start()]!r})')
+        pos = match.end()
+        tag = match.group('line_tag') or match.group('tag')
+        expression = match.group('expr')
+        if expression is not None:
+            expression, _, flag = expression.partition('|')
+            code = compile_expression(expression.strip(), local_names, name)
+            if flag.strip() == 'raw':
+                emit(f"append('' if {code} is None else str({code}))")
+            elif not flag.strip():
+                emit(f'append(escape({code}))')
+            else:
+                raise TemplateError(f"{name}: unknown filter {flag.strip()!r}")
+            continue
+        if tag is None:
+            continue  # comment
+
+        keyword, _, rest = tag.partition(' ')
+        rest = rest.strip()
+        if keyword == 'for':
+            targets, sep, iterable = rest.partition(' in ')
+            names = [target.strip() for target in targets.split(',')]
+            if not sep or not all(NAME_RE.match(target) for target in names):
+                raise TemplateError(f"{name}: bad for tag {tag!r}")
+            emit(f"for {', '.join(names)} in ({compile_expression(iterable.strip(), local_names, name)} or ()):")
+            local_names.update(names)
+            blocks.append('for')
+            depth += 1
+        elif keyword == 'if':
+            emit(f'if {compile_expression(rest, local_names, name)}:')
+            blocks.append('if')
+            depth += 1
+        elif keyword in ('elif', 'else'):
+            if not blocks or blocks[-1] != 'if':
+                raise TemplateError(f"{name}: {keyword} outside if")
+            depth -= 1
+            emit(f'elif {compile_expression(rest, local_names, name)}:' if keyword == 'elif' else 'else:')
+            depth += 1
+        elif keyword in ('endfor', 'endif'):
+            if not blocks or blocks.pop() != keyword[3:]:
+                raise TemplateError(f"{name}: unexpected {keyword}")
+            emit('pass')
+            depth -= 1
+        else:
+            raise TemplateError(f"{name}: unknown tag {tag!r}")
+    if blocks:
+        raise TemplateError(f"{name}: unclosed {blocks[-1]}")
+    if pos < len(source):
+        emit(f'append({source[pos:]!r})')
+    emit("return ''.join(out)")
+
+    namespace = {'escape': escape, 'lookup': lookup}
+    exec(compile('\n'.join(lines), name, 'exec'), namespace)
+    return namespace['render']
+
+
+@lru_cache(maxsize=None)
+def get_template(name):
+    """The compiled template templates/<name>, compiled on first use."""
+    return compile_template(template_source(name), name)
+
+
+def template_source(name, including=()):
+    """Source of templates/<name> with its includes expanded."""
+    if name in including:
+        raise TemplateError(f"{name}: includes itself")
+    source = (TEMPLATES_DIR / name).read_text(encoding='utf-8')
+    return INCLUDE_RE.sub(lambda m: template_source(m.group(1), including + (name,)), source)
+
+
+def render_template(name, **context):
+    return get_template(name)(context)
+
+
+def write_page(path, content):
+    """Write a rendered page atomically with "\\n" line endings."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def build_time(fallback=None):
+    """The time to stamp on a page: SOURCE_DATE_EPOCH if set, else fallback (a datetime), else now (UTC)."""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), timezone.utc)
+    if fallback is not None:
+        return fallback.astimezone(timezone.utc)
+    return datetime.now(timezone.utc)
+
+
+def report_time(manifest):
+    """When a report was last generated, from its manifest (local ISO time), or None."""
+    try:
+        return datetime.fromisoformat(manifest['updated'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def wrapper_sections():
+    """The tabs of the report wrapper, the first one active."""
+    tabs = [{'file': section.file_name, 'number': int(section.num), 'title': section.name}
+            for section in load_sections()]
+    tabs.append({'file': 'section09-provenance.html', 'number': 9, 'title': 'Provenance'})
+    tabs[0]['active'] = True
+    return tabs
+
+
+def render_wrapper(project_name, generated):
+    return render_template('wrapper.html', project_name=project_name, sections=wrapper_sections(),
+                           timestamp=generated.strftime(TIMESTAMP_FORMAT))
+
+
+def write_wrapper(project_name, report_dir):
+    """Write report_dir/index.html, the tabbed wrapper around the section files."""
+    report_dir = Path(report_dir)
+    generated = build_time(report_time(load_manifest(report_dir)))
+    write_page(report_dir / 'index.html', render_wrapper(project_name, generated))
+
+
+def render_provenance(project_name, model, generated, manifest=None):
+    """The provenance section; manifest adds the model that produced each section."""
+    section_models = []
+    for entry in (manifest or {}).get('sections', []):
+        if entry.get('status') == 'failed':
+            continue
+        served_by = entry.get('served_by') or model
+        section_models.append({'num': entry['num'], 'name': entry.get('name'), 'model': served_by,
+                               'fallback': served_by != model})
+    return render_template('provenance.html', project_name=project_name, model=model,
+                           provider=provider_name(model), timestamp=generated.strftime(TIMESTAMP_FORMAT),
+                           section_models=section_models)
+
+
+def write_provenance(project_name, model, report_dir):
+    """Write report_dir/section09-provenance.html."""
+    report_dir = Path(report_dir)
+    manifest = load_manifest(report_dir)
+    page = render_provenance(project_name, model, build_time(report_time(manifest)), manifest)
+    write_page(report_dir / 'section09-provenance.html', page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render VenturePulse report pages')
+    commands = parser.add_subparsers(dest='command', required=True)
+    wrapper = commands.add_parser('wrapper', help='Write <report-dir>/index.html')
+    wrapper.add_argument('project_name')
+    wrapper.add_argument('report_dir')
+    provenance = commands.add_parser('provenance', help='Print the provenance section')
+    provenance.add_argument('project_name')
+    provenance.add_argument('model')
+    provenance.add_argument('report_dir', nargs='?')
+    args = parser.parse_args()
+
+    if args.command == 'wrapper':
+        if not Path(args.report_dir).is_dir():
+            print(f"Error: {args.report_dir} is not a directory", file=sys.stderr)
+            sys.exit(1)
+        write_wrapper(args.project_name, args.report_dir)
+    else:
+        manifest = load_manifest(args.report_dir) if args.report_dir else None
+        sys.stdout.write(render_provenance(args.project_name, args.model,
+                                           build_time(report_time(manifest)), manifest))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Model Routing
+Keeps rolling latency, error-rate and throughput statistics per model and
+routes each section request by a policy: a primary model, ordered fallbacks
+and an optional latency SLO. A model that is failing or missing the SLO is
+skipped while a healthy fallback exists; a request that fails on one model
+moves on to the next; with hedging, a slow request is raced against the next
+model and the first good answer wins.
+
+Statistics persist between runs in <cache-dir>/model-stats.json.
+
+Usage:
+    python3 routing.py                  # show the recorded model statistics
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from cache import DEFAULT_CACHE_DIR
+from openrouter import RetryPolicy
+
+STATS_FILE_NAME = 'model-stats.json'
+STATS_FILE = DEFAULT_CACHE_DIR / STATS_FILE_NAME
+
+# Calls remembered per model, and how many are needed before judging it
+ROLLING_WINDOW = 20
+MIN_SAMPLES = 3
+
+# Seconds before a hedged request is raced against the next model, without an SLO
+DEFAULT_HEDGE_AFTER = 60.0
+
+# Models with fallbacks behind them give up sooner, so a rate-limited model
+# does not hold a section through the full retry schedule
+FALLBACK_RETRY = RetryPolicy(max_attempts=2, max_delay=10.0, max_elapsed=60.0)
+
+
+def stats_file(cache_dir=DEFAULT_CACHE_DIR):
+    """The model statistics file kept in a cache directory."""
+    return Path(cache_dir) / STATS_FILE_NAME
+
+
+class ModelStats:
+    """Rolling window of (ok, seconds, completion tokens/sec) samples for one model."""
+
+    def __init__(self, samples=()):
+        self.samples = deque(samples, maxlen=ROLLING_WINDOW)
+
+    def record(self, ok, seconds, tokens_per_sec=None):
+        self.samples.append((bool(ok), round(seconds, 3), tokens_per_sec and round(tokens_per_sec, 1)))
+
+    @property
+    def count(self):
+        return len(self.samples)
+
+    @property
+    def error_rate(self):
+        return sum(not ok for ok, _, _ in self.samples) / len(self.samples) if self.samples else 0.0
+
+    def latency(self, p=50):
+        """Latency percentile of successful calls in seconds, or None."""
+        values = sorted(seconds for ok, seconds, _ in self.samples if ok)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+    @property
+    def throughput(self):
+        values = [rate for ok, _, rate in self.samples if ok and rate]
+        return sum(values) / len(values) if values else None
+
+
+class StatsStore:
+    """Thread-safe ModelStats per model, loaded from and saved to a JSON file."""
+
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self.models = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for model, samples in json.load(f).items():
+                    self.models[model] = ModelStats(tuple(sample) for sample in samples)
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def get(self, model):
+        with self._lock:
+            return self.models.setdefault(model, ModelStats())
+
+    def record(self, model, ok, seconds, tokens_per_sec=None):
+        with self._lock:
+            self.models.setdefault(model, ModelStats()).record(ok, seconds, tokens_per_sec)
+
+    def save(self):
+        with self._lock:
+            data = {model: list(stats.samples) for model, stats in self.models.items()}
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class RoutingPolicy:
+    primary: str
+    fallbacks: list = field(default_factory=list)
+    latency_slo: float = None       # seconds per section; slower models count as unhealthy
+    hedge: bool = False             # race a slow request against the next model
+    max_error_rate: float = 0.5
+
+    @property
+    def models(self):
+        return [self.primary] + [m for m in self.fallbacks if m != self.primary]
+
+
+class Router:
+    """Sends section requests according to a RoutingPolicy, recording every call in a StatsStore."""
+
+    def __init__(self, policy, stats=None, max_workers=16):
+        self.policy = policy
+        self.stats = stats or StatsStore()
+        self._hedges = ThreadPoolExecutor(max_workers=max_workers) if policy.hedge else None
+
+    def close(self):
+        if self._hedges:
+            self._hedges.shutdown(wait=True, cancel_futures=True)
+        self.stats.save()
+
+    def healthy(self, model):
+        stats = self.stats.get(model)
+        if stats.count < MIN_SAMPLES:
+            return True
+        if stats.error_rate > self.policy.max_error_rate:
+            return False
+        latency = stats.latency(50)
+        return not (self.policy.latency_slo and latency is not None and latency > self.policy.latency_slo)
+
+    def candidates(self):
+        """Models to try, in order: healthy ones in policy order, then the rest by error rate."""
+        models = self.policy.models
+        healthy = [m for m in models if self.healthy(m)]
+        unhealthy = sorted((m for m in models if m not in healthy), key=lambda m: self.stats.get(m).error_rate)
+        return healthy + unhealthy
+
+    def _call(self, send, request, model, retry):
+        start = time.monotonic()
+        try:
+            completion = send(dict(request, model=model), retry)
+        except Exception:
+            self.stats.record(model, False, time.monotonic() - start)
+            raise
+        tokens = (completion.usage or {}).get('completion_tokens')
+        seconds = time.monotonic() - start
+        self.stats.record(model, True, seconds, tokens / seconds if tokens and seconds else None)
+        return completion
+
+    def send(self, request, send, hedge=True):
+        """Send request (its "model" is replaced per candidate) via send(request, retry).
+
+        Returns (model, completion) from the first model that succeeds, or
+        raises the last error. Hedging applies only when hedge is True (it is
+        not used for streamed output, which is written to a single file).
+        """
+        models = self.candidates()
+        error = None
+        i = 0
+        while i < len(models):
+            model = models[i]
+            retry = FALLBACK_RETRY if i < len(models) - 1 else None
+            if not (hedge and self._hedges and i + 1 < len(models)):
+                try:
+                    return model, self._call(send, request, model, retry)
+                except Exception as e:
+                    error = e
+                    i += 1
+                    if i < len(models):
+                        print(f"  ⤳ {model} failed - falling back to {models[i]}", file=sys.stderr)
+                    continue
+
+            # Hedged: start the next model if this one is still running after the hedge delay
+            running = {self._hedges.submit(self._call, send, request, model, retry): model}
+            done, _ = wait(running, timeout=self.policy.latency_slo or DEFAULT_HEDGE_AFTER)
+            if not done:
+                backup = models[i + 1]
+                print(f"  ⇉ {model} is slow - hedging with {backup}", file=sys.stderr)
+                running[self._hedges.submit(self._call, send, request, backup, FALLBACK_RETRY)] = backup
+                i += 1
+            i += 1
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    winner = running.pop(future)
+                    if future.exception() is None:
+                        return winner, future.result()
+                    error = future.exception()
+        raise error
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show rolling per-model statistics used for routing')
+    parser.add_argument('--stats-file', default=str(STATS_FILE), help=f'Statistics file (default: {STATS_FILE})')
+    args = parser.parse_args()
+
+    store = StatsStore(Path(args.stats_file))
+    if not store.models:
+        print(f"No model statistics recorded yet in {args.stats_file}")
+        return
+    def show(value, spec):
+        return '-' if value is None else format(value, spec)
+
+    print(f"{'model':<48} {'calls':>5} {'errors':>7} {'p50 s':>7} {'p95 s':>7} {'tok/s':>7}")
+    for model, stats in sorted(store.models.items()):
+        print(f"{model:<48} {stats.count:>5} {stats.error_rate:>7.0%} {show(stats.latency(50), '.1f'):>7} "
+              f"{show(stats.latency(95), '.1f'):>7} {show(stats.throughput, '.0f'):>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Full-Text Search
+Extracts the text of every generated section once and keeps an inverted index
+(term -> report/section postings) next to each project's index.html, so any
+phrase can be found across the archive without grepping raw HTML. The index is
+updated incrementally by createindex.py: only report folders that changed since
+the last run are re-read. In archive mode the project indexes are merged into
+one at the archive root.
+
+Usage:
+    python3 search.py <project-or-archive-dir> <words> [...] [--limit N] [--json]
+    python3 search.py reports/ competitor acme
+    python3 search.py my-idea/ TAM fintech --limit 5
+
+All words must appear in a section for it to match; results are ranked by
+TF-IDF. The index is written as search-index.js, which the index page loads
+for its search box (a plain <script> works from file:// where fetch() does not).
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from sections import condense_section, load_sections
+
+SEARCH_INDEX_FILE = 'search-index.js'
+SEARCH_CACHE_FILE = '.venturepulse-search.json'
+SEARCH_INDEX_VERSION = 1
+JS_PREFIX = 'window.VENTUREPULSE_SEARCH = '
+
+# Provenance (section 09) is the same boilerplate in every report
+SECTION_GLOB = 'section0[1-8]-*.html'
+SECTION_NAMES = {section.num: section.name for section in load_sections()}
+
+# Words and numbers, keeping decimals and thousands together ("4.2", "1,500")
+TOKEN_RE = re.compile(r'[^\W_]+(?:[.,]\d+)*')
+STOPWORDS = frozenset('''
+    a an and are as at be but by can for from has have if in into is it its may more
+    not of on or our should than that the their them there these they this to was
+    were what when which will with would you your
+'''.split())
+
+SNIPPET_CHARS = 80
+
+
+def tokenize(text):
+    """Lower-case search terms of a text, without stopwords and single characters."""
+    return [term for term in TOKEN_RE.findall(text.lower()) if len(term) > 1 and term not in STOPWORDS]
+
+
+def section_text(path):
+    """Plain text of a generated section file."""
+    return condense_section(path.read_text(encoding='utf-8'), max_chars=sys.maxsize)
+
+
+def scan_folder(folder):
+    """Index documents for the section files of one report folder."""
+    docs = []
+    for path in sorted(folder.glob(SECTION_GLOB)):
+        num = path.name[7:9]
+        try:
+            terms = Counter(tokenize(section_text(path)))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Warning: Could not read {path}: {e}")
+            continue
+        docs.append({'file': path.name, 'section': num,
+                     'name': SECTION_NAMES.get(num, path.stem[10:].replace('-', ' ').title()),
+                     'terms': dict(terms)})
+    return docs
+
+
+def build_search_index(folders, project=None):
+    """Build the inverted index from {folder: {'model', 'docs'}}.
+
+    Each doc is [path, model, section number, section name, project]; postings
+    are flat [doc id, term frequency, doc id, term frequency, ...] lists.
+    """
+    docs = []
+    postings = defaultdict(list)
+    for folder in sorted(folders):
+        entry = folders[folder]
+        for doc in entry['docs']:
+            doc_id = len(docs)
+            docs.append([f"{folder}/{doc['file']}", entry['model'], doc['section'], doc['name'], project])
+            for term, count in doc['terms'].items():
+                postings[term] += [doc_id, count]
+    return {'version': SEARCH_INDEX_VERSION, 'stopwords': sorted(STOPWORDS), 'docs': docs,
+            'postings': dict(sorted(postings.items()))}
+
+
+def write_search_index(path, index):
+    """Write index as search-index.js; returns False when the file was already up to date."""
+    content = JS_PREFIX + json.dumps(index, ensure_ascii=False, separators=(',', ':')) + ';\n'
+    try:
+        if path.read_text(encoding='utf-8') == content:
+            return False
+    except OSError:
+        pass
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+
+def load_search_index(directory):
+    """Load the search-index.js of a project or archive directory, or None if there is none."""
+    try:
+        text = (Path(directory) / SEARCH_INDEX_FILE).read_text(encoding='utf-8')
+    except OSError:
+        return None
+    if not text.startswith(JS_PREFIX):
+        return None
+    index = json.loads(text[len(JS_PREFIX):].rstrip().rstrip(';'))
+    return index if index.get('version') == SEARCH_INDEX_VERSION else None
+
+
+def update_search_index(target_dir, folders, project=None, use_cache=True, log=print):
+    """Bring target_dir/search-index.js up to date with its analysis folders.
+
+    folders maps folder names to (fingerprint, model), as scanned by
+    createindex.py; only folders whose fingerprint changed are re-read. The
+    extracted terms are kept in .venturepulse-search.json. Returns the number
+    of indexed sections.
+    """
+    target_dir = Path(target_dir)
+    cache = {}
+    if use_cache:
+        try:
+            with open(target_dir / SEARCH_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict) or cache.get('version') != SEARCH_INDEX_VERSION:
+            cache = {}
+    cached_folders = cache.get('folders', {})
+
+    indexed = {}
+    rescanned = 0
+    for name, (fingerprint, model) in folders.items():
+        cached = cached_folders.get(name)
+        if cached and cached['fingerprint'] == fingerprint:
+            indexed[name] = dict(cached, model=model)
+        else:
+            indexed[name] = {'fingerprint': fingerprint, 'model': model, 'docs': scan_folder(target_dir / name)}
+            rescanned += 1
+
+    index = build_search_index(indexed, project)
+    write_search_index(target_dir / SEARCH_INDEX_FILE, index)
+    if indexed != cached_folders:
+        tmp_path = target_dir / f'{SEARCH_CACHE_FILE}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': SEARCH_INDEX_VERSION, 'folders': indexed}, f, ensure_ascii=False,
+                      separators=(',', ':'))
+        os.replace(tmp_path, target_dir / SEARCH_CACHE_FILE)
+    log(f"  Search index: {len(index['docs'])} sections ({rescanned} folder(s) re-read)")
+    return len(index['docs'])
+
+
+def merge_search_indexes(root, projects):
+    """Write root/search-index.js combining the indexes of projects (dicts with 'dir' and 'name')."""
+    docs = []
+    postings = defaultdict(list)
+    for project in projects:
+        index = load_search_index(project['dir'])
+        if not index:
+            continue
+        prefix = Path(project['dir']).relative_to(root).as_posix() + '/'
+        offset = len(docs)
+        docs += [[prefix + path, model, num, name, project['name']] for path, model, num, name, _ in index['docs']]
+        for term, entries in index['postings'].items():
+            merged = postings[term]
+            for i in range(0, len(entries), 2):
+                merged += [entries[i] + offset, entries[i + 1]]
+    index = {'version': SEARCH_INDEX_VERSION, 'stopwords': sorted(STOPWORDS), 'docs': docs,
+             'postings': dict(sorted(postings.items()))}
+    write_search_index(Path(root) / SEARCH_INDEX_FILE, index)
+    return len(docs)
+
+
+def search(index, query, limit=20):
+    """Return [(doc, score)] for the sections containing every term of query, best first."""
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+    total = len(index['docs'])
+    scores = None
+    # Rarest term first, so the candidate set shrinks as fast as possible
+    for term in sorted(terms, key=lambda t: len(index['postings'].get(t, ()))):
+        entries = index['postings'].get(term)
+        if not entries:
+            return []
+        idf = math.log(1 + total / (len(entries) // 2))
+        term_scores = {entries[i]: (1 + math.log(entries[i + 1])) * idf for i in range(0, len(entries), 2)}
+        if scores is None:
+            scores = term_scores
+        else:
+            scores = {doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores}
+        if not scores:
+            return []
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [(index['docs'][doc], score) for doc, score in ranked]
+
+
+def snippet(path, query):
+    """A line of context around the first query term in a section file, or ''."""
+    try:
+        text = ' '.join(section_text(path).split())
+    except OSError:
+        return ''
+    terms = tokenize(query)
+    match = re.search(r'(?<![^\W_])(?:' + '|'.join(map(re.escape, terms)) + r')(?![^\W_])', text, re.IGNORECASE) \
+        if terms else None
+    if not match:
+        return text[:2 * SNIPPET_CHARS]
+    start = max(0, match.start() - SNIPPET_CHARS)
+    end = min(len(text), match.end() + SNIPPET_CHARS)
+    return ('…' if start else '') + text[start:end] + ('…' if end < len(text) else '')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search the text of generated VenturePulse reports')
+    parser.add_argument('directory', help='Project directory or archive root indexed by createindex.py')
+    parser.add_argument('query', nargs='+', help='Words that must all appear in a section')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum results (default: 20)')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    args = parser.parse_args()
+
+    directory = Path(args.directory)
+    index = load_search_index(directory)
+    if index is None:
+        print(f"Error: No {SEARCH_INDEX_FILE} in {directory}; run createindex.py on it first", file=sys.stderr)
+        sys.exit(1)
+
+    query = ' '.join(args.query)
+    results = search(index, query, args.limit)
+    if args.json:
+        print(json.dumps([{'path': path, 'model': model, 'section': num, 'name': name, 'project': project,
+                           'score': round(score, 3)} for (path, model, num, name, project), score in results],
+                         indent=2, ensure_ascii=False))
+        return
+    if not results:
+        print(f"No sections match: {query}")
+        sys.exit(1)
+    for (path, model, num, name, project), score in results:
+        title = f"{project} · " if project else ''
+        print(f"{score:6.2f}  {title}{model} · Section {num}: {name}")
+        print(f"        {path}")
+        context = snippet(directory / path, query)
+        if context:
+            print(f"        {context}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+VenturePulse Section Graph
+The report sections and their dependencies are declared in
+prompts/sections.json. A section that depends on others is generated after
+them, with a condensed copy of their output added to its prompt, so it can
+build on their findings instead of re-deriving them.
+"""
+
+import html
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+SECTIONS_FILE = Path(__file__).resolve().parent.parent / 'prompts' / 'sections.json'
+
+# Characters of condensed text passed on per upstream section
+UPSTREAM_CHARS = 2500
+
+
+@dataclass(frozen=True)
+class Section:
+    num: str
+    name: str
+    slug: str
+    depends_on: tuple = ()
+
+    @property
+    def file_name(self):
+        return f'section{self.num}-{self.slug}.html'
+
+
+def load_sections(path=SECTIONS_FILE):
+    """Load the section graph, in declaration order.
+
+    Raises ValueError for an unknown dependency or a dependency cycle.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    sections = [Section(entry['num'], entry['name'], entry['slug'], tuple(entry.get('depends_on', ())))
+                for entry in entries]
+
+    known = {section.num for section in sections}
+    for section in sections:
+        unknown = [num for num in section.depends_on if num not in known]
+        if unknown:
+            raise ValueError(f"{path}: section {section.num} depends on unknown section(s) {', '.join(unknown)}")
+    topological_order(sections)
+    return sections
+
+
+def topological_order(sections):
+    """Return the sections ordered so that every section follows its dependencies."""
+    remaining = {section.num: section for section in sections}
+    ordered = []
+    while remaining:
+        ready = [section for section in remaining.values()
+                 if not any(num in remaining for num in section.depends_on)]
+        if not ready:
+            raise ValueError(f"Section dependency cycle between {', '.join(sorted(remaining))}")
+        for section in ready:
+            ordered.append(section)
+            del remaining[section.num]
+    return ordered
+
+
+def condense_section(text, max_chars=UPSTREAM_CHARS):
+    """Reduce a generated section to plain text, cut at about max_chars.
+
+    Styles, scripts and markup are dropped; headings, paragraphs, list items
+    and table rows each become a line.
+    """
+    text = re.sub(r'^\s*```[a-zA-Z]*\s*$', '', text, flags=re.MULTILINE)
+    text = re.sub(r'<(style|script)\b.*?</\1\s*>', ' ', text, flags=re.IGNORECASE | re.DOTALL)
+    text = re.sub(r'<!--.*?-->', ' ', text, flags=re.DOTALL)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'<h[1-6][^>]*>', '\n## ', text, flags=re.IGNORECASE)
+    text = re.sub(r'<li[^>]*>', '\n- ', text, flags=re.IGNORECASE)
+    text = re.sub(r'</t[dh]\s*>', ' | ', text, flags=re.IGNORECASE)
+    text = re.sub(r'<(?:/?(?:p|div|tr|br|h[1-6]|ul|ol|table|section))\b[^>]*>', '\n', text, flags=re.IGNORECASE)
+    text = html.unescape(re.sub(r'<[^>]+>', ' ', text))
+
+    lines = []
+    for line in text.split('\n'):
+        line = ' '.join(line.split()).strip(' |')
+        if line and line not in ('##', '-'):
+            lines.append(line)
+    text = '\n'.join(lines)
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit(None, 1)[0] + ' …'
+    return text
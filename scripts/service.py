@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Service
+A long-running process with a local HTTP API for submitting analyses. Prompts,
+the OpenRouter connection pool and the response cache stay warm between
+requests, and section jobs from every submission share one worker pool that
+is scheduled fairly between users: each user gets at most --per-user sections
+in flight, and users take turns for free workers.
+
+Usage:
+    python3 service.py [--port 8090] [--output-root reports/] [--concurrency 8] [--per-user 4]
+
+API (JSON):
+    POST /analyses                       submit {"project": "<markdown>", "name": "my-idea",
+                                         "models": ["google/gemini-2.5-flash", ...]}
+                                         (user from the X-VenturePulse-User header or "user")
+    GET  /analyses[?user=NAME]           list submissions
+    GET  /analyses/<id>                  status of every report and section
+    GET  /analyses/<id>/files/<path>     fetch an artifact, e.g. index.html or
+                                         <report-folder>/section02-market-landscape.html
+    GET  /health                         worker, queue and cache statistics
+"""
+
+import argparse
+import json
+import mimetypes
+import os
+import re
+import secrets
+import sys
+import threading
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from analyze import (
+    DEFAULT_CONCURRENCY, DEFAULT_MODEL, SECTIONS, SectionError, build_jobs, default_output_dir,
+    describe_result, finalize_report, generate_section, load_prompts, prepare_job, project_slug,
+    read_text, telemetry_record,
+)
+from brief import condense_project
+from cache import DEFAULT_CACHE_DIR, ResponseCache
+from createindex import build_index
+from manifest import update_manifest
+from openrouter import OpenRouterClient, OpenRouterError
+from preflight import CompletionHistory, history_file
+from ratelimit import DEFAULT_RATE, TokenBucket
+from telemetry import TELEMETRY_FILE, RunLog
+
+DEFAULT_PORT = 8090
+DEFAULT_PER_USER = 4
+USER_HEADER = 'X-VenturePulse-User'
+# Largest accepted request body (project text plus options)
+MAX_BODY_BYTES = 1024 * 1024
+
+
+def now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class FairScheduler:
+    """Hands out jobs to worker threads, round-robin between users.
+
+    A user with per_user jobs already running is skipped until one finishes,
+    so one large submission cannot starve everyone else.
+    """
+
+    def __init__(self, per_user=DEFAULT_PER_USER):
+        self.per_user = max(1, per_user)
+        self._queues = OrderedDict()  # user -> deque of ready jobs, in turn order
+        self._running = Counter()
+        self._cond = threading.Condition()
+        self._stopped = False
+
+    def put(self, user, item):
+        with self._cond:
+            self._queues.setdefault(user, deque()).append(item)
+            self._cond.notify()
+
+    def get(self):
+        """Block until a job may run; returns (user, item), or None once stopped."""
+        with self._cond:
+            while True:
+                if self._stopped:
+                    return None
+                for user, queue in self._queues.items():
+                    if queue and self._running[user] < self.per_user:
+                        item = queue.popleft()
+                        self._running[user] += 1
+                        # The user goes to the back of the line
+                        self._queues.move_to_end(user)
+                        return user, item
+                self._cond.wait()
+
+    def done(self, user):
+        with self._cond:
+            self._running[user] -= 1
+            if not self._queues.get(user) and not self._running[user]:
+                self._queues.pop(user, None)
+                del self._running[user]
+            self._cond.notify_all()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {'queued': {user: len(queue) for user, queue in self._queues.items() if queue},
+                    'running': {user: count for user, count in self._running.items() if count}}
+
+
+@dataclass
+class Report:
+    """One model's report within a submission."""
+    model: str
+    output_dir: Path
+    jobs: dict                                     # section number -> SectionJob, once prepared
+    log: RunLog
+    sections: dict = field(default_factory=dict)   # section number -> pending | running | done | failed
+    errors: dict = field(default_factory=dict)
+    status: str = 'queued'                         # queued | running | done | failed
+
+    def finished(self):
+        return all(status in ('done', 'failed') for status in self.sections.values())
+
+
+@dataclass
+class Analysis:
+    """One submission: a project analysed by one or more models."""
+    id: str
+    user: str
+    name: str
+    project_file: Path
+    reports: list
+    created: str = field(default_factory=now)
+    finished: str = None
+    status: str = 'queued'                         # queued | running | done | failed
+    finalizing: bool = False                       # set by the one call that indexes the analysis
+
+    @property
+    def directory(self):
+        return self.project_file.parent
+
+    def to_json(self):
+        files = sorted(str(p.relative_to(self.directory)) for p in self.directory.rglob('*')
+                       if p.is_file() and not p.name.startswith('.'))
+        return {
+            'id': self.id, 'user': self.user, 'name': self.name, 'status': self.status,
+            'created': self.created, 'finished': self.finished,
+            'index': 'index.html' if (self.directory / 'index.html').exists() else None,
+            'reports': [{
+                'model': report.model,
+                'folder': report.output_dir.name,
+                'status': report.status,
+                'sections': dict(sorted(report.sections.items())),
+                'errors': report.errors,
+            } for report in self.reports],
+            'files': files,
+        }
+
+
+class Service:
+    """Owns the warm state (prompts, client pool, cache) and runs submitted analyses."""
+
+    def __init__(self, output_root, concurrency=DEFAULT_CONCURRENCY, per_user=DEFAULT_PER_USER,
+                 cache=None, stream=False):
+        self.output_root = Path(output_root).resolve()
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        self.prompts = load_prompts()
+        self.cache = cache
+        self.stream = stream
+        self.history = CompletionHistory(history_file(cache.directory if cache else DEFAULT_CACHE_DIR))
+        rate = float(os.environ.get('VENTUREPULSE_RATE_LIMIT', DEFAULT_RATE))
+        self.client = OpenRouterClient(pool_size=concurrency, rate_limiter=TokenBucket(rate, burst=concurrency))
+        self.scheduler = FairScheduler(per_user)
+        self.analyses = {}
+        self._lock = threading.Lock()
+        self._workers = [threading.Thread(target=self._work, name=f'worker-{i}', daemon=True)
+                         for i in range(max(1, concurrency))]
+        for worker in self._workers:
+            worker.start()
+
+    def close(self):
+        self.scheduler.stop()
+        for worker in self._workers:
+            worker.join()
+        self.client.close()
+        self.history.save()
+
+    def submit(self, user, name, project_text, models):
+        """Queue a new analysis and return it.
+
+        Its section jobs are built by a worker (see _prepare), since a large
+        project description is condensed first, which takes several requests.
+        """
+        analysis_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+        slug = project_slug(f'{name}.md') or 'project'
+        directory = self.output_root / f'{slug}-{analysis_id}'
+        directory.mkdir(parents=True)
+        project_file = directory / f'{slug}.md'
+        project_file.write_text(project_text, encoding='utf-8')
+
+        reports = []
+        for model in models:
+            output_dir = directory / default_output_dir(project_file, model)
+            reports.append(Report(model, output_dir, {}, RunLog(output_dir / TELEMETRY_FILE),
+                                  sections={section.num: 'pending' for section in SECTIONS}))
+        analysis = Analysis(analysis_id, user, slug, project_file, reports)
+        with self._lock:
+            self.analyses[analysis_id] = analysis
+        # Preparing the jobs is scheduled like a section, within the user's share
+        self.scheduler.put(user, (analysis, None, None))
+        print(f"→ {analysis_id}: {user} submitted {slug} for {', '.join(models)}")
+        return analysis
+
+    def _prepare(self, analysis):
+        """Build the section jobs of every report, condensing the project once, and queue the first sections."""
+        try:
+            project_data = condense_project(read_text(analysis.project_file), analysis.reports[0].model,
+                                            self.client, cache_dir=self.cache.directory if self.cache else None)
+            jobs = {}
+            for report in analysis.reports:
+                jobs[report.model] = build_jobs(analysis.project_file, report.model, report.output_dir,
+                                                label=f'{analysis.user} · {analysis.name} · {report.model}',
+                                                prompts=self.prompts, project_data=project_data)
+        except Exception as e:
+            print(f"  ✗ {analysis.id}: could not prepare the section jobs\n{e}", file=sys.stderr)
+            with self._lock:
+                for report in analysis.reports:
+                    report.sections = dict.fromkeys(report.sections, 'failed')
+                    report.errors = dict.fromkeys(report.sections, str(e))
+                    report.status = 'failed'
+            for report in analysis.reports:
+                self._finish_report(analysis, report)
+            return
+        with self._lock:
+            for report in analysis.reports:
+                report.jobs = {job.num: job for job in jobs[report.model]}
+                report.sections = {num: 'pending' for num in report.jobs}
+                self._release(analysis, report)
+
+    def _release(self, analysis, report):
+        """Queue every pending section of a report whose dependencies are done (lock held)."""
+        for num, job in report.jobs.items():
+            if report.sections[num] != 'pending':
+                continue
+            states = [report.sections.get(dep, 'done') for dep in job.depends_on]
+            if 'failed' in states:
+                error = SectionError(f"Upstream section(s) failed: "
+                                     f"{', '.join(d for d in job.depends_on if report.sections.get(d) == 'failed')}")
+                self._record(analysis, report, job, None, error)
+            elif all(state == 'done' for state in states):
+                report.sections[num] = 'queued'
+                self.scheduler.put(analysis.user, (analysis, report, job))
+
+    def _work(self):
+        while True:
+            task = self.scheduler.get()
+            if task is None:
+                return
+            user, (analysis, report, job) = task
+            if job is None:
+                try:
+                    self._prepare(analysis)
+                finally:
+                    self.scheduler.done(user)
+                continue
+            with self._lock:
+                report.sections[job.num] = 'running'
+                report.status = analysis.status = 'running'
+            result = error = None
+            try:
+                max_tokens = prepare_job(job, self.history)
+                result = generate_section(self.client, job.model, job.messages, job.output_file,
+                                          self.cache, job.refresh, self.stream, max_tokens=max_tokens)
+            except Exception as e:
+                error = e
+            finally:
+                self.scheduler.done(user)
+            with self._lock:
+                self._record(analysis, report, job, result, error)
+                self._release(analysis, report)
+                finished = report.finished() and report.status == 'running'
+                if finished:
+                    report.status = 'failed' if report.errors else 'finishing'
+            if finished:
+                self._finish_report(analysis, report)
+
+    def _record(self, analysis, report, job, result, error):
+        """Store a finished section's outcome (lock held)."""
+        report.sections[job.num] = 'failed' if error else 'done'
+        report.log.write(telemetry_record(job, result, error))
+        if error:
+            report.errors[job.num] = str(error)
+            print(f"  ✗ [{job.label}] Section {job.num}: {job.name} failed\n{error}", file=sys.stderr)
+        else:
+            if not result['cached'] and not result['problems']:
+                self.history.record(job.model, job.num, result['usage'].get('completion_tokens'))
+            print(f"  ✓ [{job.label}] Section {job.num}: {job.name} -> {describe_result(result)}")
+
+    def _finish_report(self, analysis, report):
+        """Write the manifest, provenance and wrapper of a finished report; index the analysis when all are done.
+
+        Errors are logged rather than raised, so the worker thread survives
+        and the analysis still reaches done or failed.
+        """
+        try:
+            run = report.log.finish()
+            if run:
+                update_manifest(report.output_dir, list(report.jobs.values()), report.log.records, run)
+            if not report.errors:
+                finalize_report(analysis.name, report.model, report.output_dir)
+        except Exception as e:
+            print(f"  ✗ {analysis.id}: could not finish the {report.model} report\n{e}", file=sys.stderr)
+            with self._lock:
+                report.errors['report'] = str(e)
+        with self._lock:
+            report.status = 'failed' if report.errors else 'done'
+            # Reports can finish at the same moment; only one call indexes the analysis
+            last = not analysis.finalizing and all(r.status in ('done', 'failed') for r in analysis.reports)
+            if last:
+                analysis.finalizing = True
+        if not last:
+            return
+        try:
+            build_index(analysis.directory)
+            self.history.save()
+            if self.cache:
+                self.cache.evict()
+        except Exception as e:
+            print(f"  ✗ {analysis.id}: could not index the analysis\n{e}", file=sys.stderr)
+        with self._lock:
+            analysis.status = 'failed' if any(r.status == 'failed' for r in analysis.reports) else 'done'
+            analysis.finished = now()
+        print(f"✓ {analysis.id}: {analysis.status}")
+
+    def get(self, analysis_id):
+        with self._lock:
+            return self.analyses.get(analysis_id)
+
+    def list(self, user=None):
+        with self._lock:
+            return [analysis for analysis in self.analyses.values() if user is None or analysis.user == user]
+
+    def status(self, analysis):
+        with self._lock:
+            return analysis.to_json()
+
+    def health(self):
+        with self._lock:
+            analyses = Counter(analysis.status for analysis in self.analyses.values())
+        return {
+            'workers': len(self._workers),
+            'per_user': self.scheduler.per_user,
+            'scheduler': self.scheduler.stats(),
+            'analyses': dict(analyses),
+            'client': {'requests': self.client.requests_sent,
+                       'connections_opened': self.client.connections_opened,
+                       'retries': self.client.retries},
+            'cache': self.cache.stats() if self.cache else None,
+        }
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def send_json(self, status, payload):
+        data = (json.dumps(payload, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_error_json(self, status, message):
+        self.send_json(status, {'error': message})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = unquote(url.path).rstrip('/')
+        if path == '/health':
+            self.send_json(200, self.service.health())
+            return
+        if path == '/analyses':
+            user = parse_qs(url.query).get('user', [None])[0]
+            self.send_json(200, [{'id': a.id, 'user': a.user, 'name': a.name, 'status': a.status,
+                                  'created': a.created} for a in self.service.list(user)])
+            return
+        match = re.fullmatch(r'/analyses/([\w-]+)(?:/files/(.+))?', path)
+        analysis = self.service.get(match.group(1)) if match else None
+        if analysis is None:
+            self.send_error_json(404, f'Not found: {url.path}')
+            return
+        if match.group(2) is None:
+            self.send_json(200, self.service.status(analysis))
+            return
+        self.send_file(analysis.directory, match.group(2))
+
+    def send_file(self, directory, relative):
+        path = (directory / relative).resolve()
+        if not path.is_relative_to(directory) or not path.is_file():
+            self.send_error_json(404, f'No such file: {relative}')
+            return
+        data = path.read_bytes()
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type == 'application/json':
+            content_type += '; charset=utf-8'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip('/') != '/analyses':
+            self.send_error_json(404, f'Not found: {self.path}')
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self.send_error_json(413, f'Request body larger than {MAX_BODY_BYTES} bytes')
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self.send_error_json(400, 'Request body is not valid JSON')
+            return
+        if not isinstance(body, dict):
+            self.send_error_json(400, 'Request body must be a JSON object')
+            return
+
+        project = body.get('project')
+        models = body.get('models') or [body.get('model') or DEFAULT_MODEL]
+        if not isinstance(project, str) or not project.strip():
+            self.send_error_json(400, '"project" (the project description text) is required')
+            return
+        if not isinstance(models, list) or not all(isinstance(m, str) and m for m in models):
+            self.send_error_json(400, '"models" must be a list of model names')
+            return
+        user = self.headers.get(USER_HEADER) or body.get('user') or 'anonymous'
+        name = body.get('name') or 'project'
+        analysis = self.service.submit(str(user), str(name), project, list(dict.fromkeys(models)))
+        self.send_json(202, dict(self.service.status(analysis), url=f'/analyses/{analysis.id}'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run VenturePulse as a local HTTP service')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--output-root', default='reports', help='Where analyses are written (default: reports/)')
+    parser.add_argument('--concurrency', type=int,
+                        default=int(os.environ.get('VENTUREPULSE_CONCURRENCY', DEFAULT_CONCURRENCY)),
+                        help=f'Sections generated at once across all users (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--per-user', type=int, default=DEFAULT_PER_USER,
+                        help=f'Sections in flight per user (default: {DEFAULT_PER_USER})')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the response cache')
+    parser.add_argument('--cache-dir', help='Response cache directory (default: ~/.cache/venturepulse)')
+    parser.add_argument('--stream', action='store_true', help='Stream responses into the section files')
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else ResponseCache(args.cache_dir or DEFAULT_CACHE_DIR)
+    try:
+        service = Service(args.output_root, args.concurrency, args.per_user, cache, args.stream)
+    except OpenRouterError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    server = ThreadingHTTPServer((args.host, args.port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    print(f"VenturePulse service on http://{args.host}:{server.server_address[1]} "
+          f"({args.concurrency} workers, {args.per_user} per user, output in {service.output_root})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down - waiting for sections in flight...")
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Run Telemetry
+Every section call appends one JSON line to telemetry.jsonl in its report
+folder: millisecond phase timings (build, connect, ttft, transfer, parse,
+total), prompt/completion tokens (and how many prompt tokens the provider
+served from its prompt cache), HTTP status, retries and estimated cost.
+Each run then appends a "run" record with its wall time and totals.
+
+Usage:
+    python3 telemetry.py <report-folder-or-telemetry.jsonl> [...]
+    python3 telemetry.py my-idea-analysis-*/
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+TELEMETRY_FILE = 'telemetry.jsonl'
+
+# USD per million (prompt, completion) tokens, used when OpenRouter does not
+# report the cost itself. ":free" variants cost nothing.
+PRICES = {
+    'anthropic/claude-sonnet-4.5': (3.00, 15.00),
+    'anthropic/claude-sonnet-4': (3.00, 15.00),
+    'openai/gpt-4o': (2.50, 10.00),
+    'openai/gpt-4o-mini': (0.15, 0.60),
+    'openai/gpt-4-turbo': (10.00, 30.00),
+    'google/gemini-2.5-pro': (1.25, 10.00),
+    'google/gemini-2.5-flash': (0.30, 2.50),
+    'deepseek/deepseek-chat': (0.30, 0.85),
+}
+
+# Fraction of the prompt price charged for prompt tokens read from the
+# provider's prompt cache
+CACHED_PRICE_FACTORS = {
+    'anthropic': 0.10,
+    'openai': 0.50,
+    'google': 0.25,
+    'deepseek': 0.10,
+}
+
+PHASES = ('build', 'connect', 'ttft', 'transfer', 'parse', 'total')
+
+_write_lock = threading.Lock()
+
+
+def estimate_cost(model, usage):
+    """Return the USD cost of a call, or None when the model has no known price."""
+    if usage.get('cost') is not None:
+        return usage['cost']
+    if model and model.endswith(':free'):
+        return 0.0
+    price = PRICES.get(model)
+    if price is None:
+        return None
+    prompt_price, completion_price = price
+    cached = (usage.get('prompt_tokens_details') or {}).get('cached_tokens') or 0
+    factor = CACHED_PRICE_FACTORS.get(model.split('/', 1)[0], 1.0)
+    prompt_cost = (usage.get('prompt_tokens', 0) - cached + cached * factor) * prompt_price
+    return round((prompt_cost + usage.get('completion_tokens', 0) * completion_price) / 1_000_000, 6)
+
+
+class RunLog:
+    """Appends telemetry records to a JSONL file; safe to share between threads.
+
+    The log remembers the records written during this run so that finish()
+    can append the run's summary record.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.started = datetime.now()
+        self.records = []
+        self._start = time.monotonic()
+        self._last = None
+
+    def write(self, record):
+        record = dict(ts=datetime.now().isoformat(timespec='milliseconds'), **record)
+        line = json.dumps(record, ensure_ascii=False)
+        with _write_lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+            if record.get('type') == 'section':
+                self.records.append(record)
+                self._last = time.monotonic()
+
+    def finish(self):
+        """Append the run record (wall time to the last section and totals), if any sections ran."""
+        if not self.records:
+            return None
+        record = summarize_run(self.records)
+        record.update(started=self.started.isoformat(timespec='seconds'),
+                      wall_ms=round((self._last - self._start) * 1000, 1))
+        self.write(record)
+        return record
+
+
+def summarize_run(records):
+    """Total the section records of one run. Tokens and cost count only live calls."""
+    live = [r for r in records if r.get('status') == 'ok']
+    costs = [r.get('cost_usd') for r in live]
+    return {
+        'type': 'run',
+        'sections': len(records),
+        'ok': len(live),
+        'cached': sum(r.get('status') == 'cached' for r in records),
+        'failed': sum(r.get('status') == 'failed' for r in records),
+        'prompt_tokens': sum(r.get('prompt_tokens') or 0 for r in live),
+        'cached_tokens': sum(r.get('cached_tokens') or 0 for r in live),
+        'completion_tokens': sum(r.get('completion_tokens') or 0 for r in live),
+        'cost_usd': round(sum(costs), 6) if None not in costs else None,
+    }
+
+
+def read_log(path):
+    """Return the records in a telemetry file (or report folder), skipping bad lines."""
+    path = Path(path)
+    if path.is_dir():
+        path = path / TELEMETRY_FILE
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def print_report(name, records):
+    runs = [r for r in records if r.get('type') == 'run']
+    records = [r for r in records if r.get('type', 'section') == 'section']
+    print(f"{name} ({len(records)} calls, {len(runs)} runs)")
+    print(f"  {'section':<8} {'status':<7} {'http':>4} {'tries':>5} "
+          + ' '.join(f"{phase:>8}" for phase in PHASES)
+          + f" {'in':>7} {'cached':>7} {'out':>7} {'cost $':>9}")
+    for r in records:
+        timings = r.get('timings_ms') or {}
+        cost = r.get('cost_usd')
+        print(f"  {r.get('section', '?'):<8} {r.get('status', '?'):<7} "
+              f"{r.get('http_status') or '-':>4} {r.get('attempts', 1):>5} "
+              + ' '.join(f"{timings[p]:>8.0f}" if timings.get(p) is not None else f"{'-':>8}"
+                         for p in PHASES)
+              + f" {r.get('prompt_tokens') or 0:>7} {r.get('cached_tokens') or 0:>7} "
+                f"{r.get('completion_tokens') or 0:>7} "
+              + (f"{cost:>9.4f}" if cost is not None else f"{'?':>9}"))
+
+    costs = [r['cost_usd'] for r in records if r.get('cost_usd') is not None]
+    tokens = sum((r.get('prompt_tokens') or 0) + (r.get('completion_tokens') or 0) for r in records)
+    retries = sum(r.get('retries') or 0 for r in records)
+    failed = sum(r.get('status') == 'failed' for r in records)
+    print(f"  Total: {tokens} tokens, {retries} retries, {failed} failed, "
+          f"${sum(costs):.4f}{' (some prices unknown)' if len(costs) < len(records) else ''}")
+    for run in runs:
+        print(f"  Run {run.get('started')}: {run['wall_ms'] / 1000:.1f}s wall, "
+              f"{run['sections']} sections ({run['cached']} cached, {run['failed']} failed)")
+        if run.get('prompt_tokens'):
+            cached = run.get('cached_tokens') or 0
+            print(f"    Prompt tokens: {cached} cached by the provider, "
+                  f"{run['prompt_tokens'] - cached} uncached "
+                  f"({cached / run['prompt_tokens']:.0%} cache hit rate)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarise VenturePulse run telemetry')
+    parser.add_argument('paths', nargs='+', help='Report folders or telemetry.jsonl files')
+    args = parser.parse_args()
+
+    found = False
+    for path in args.paths:
+        records = read_log(path)
+        if not records:
+            print(f"Warning: no telemetry in {path}", file=sys.stderr)
+            continue
+        found = True
+        print_report(path, records)
+        print()
+    if not found:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
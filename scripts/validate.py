@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+VenturePulse Section Validation
+Checks generated section HTML before it is saved: strips markdown code
+fences, parses the HTML in one pass and reports anything that makes the
+section unusable - no HTML at all, elements left open, output ending inside
+a tag, or a response cut off at max_tokens. analyze.py uses it to continue or
+regenerate just the broken section.
+
+Usage:
+    python3 validate.py <report-folder> [...]      # list broken sections
+"""
+
+import argparse
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+
+# Elements that are left open when a section is cut short. Others (p, li,
+# td, ...) may legally omit their end tag.
+STRUCTURAL_TAGS = {'html', 'body', 'div', 'section', 'article', 'main', 'header', 'footer',
+                   'table', 'ul', 'ol', 'style', 'script', 'svg'}
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+             'source', 'track', 'wbr'}
+
+FENCE_RE = re.compile(r'^```[a-zA-Z]*[ \t]*\n(.*?)(?:\n```|\Z)', re.MULTILINE | re.DOTALL)
+
+
+def strip_fences(text):
+    """Return the HTML inside a markdown code fence, dropping prose around it.
+
+    Text without a fence is returned unchanged (apart from surrounding whitespace).
+    """
+    fenced = FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    return text.strip()
+
+
+class StructureParser(HTMLParser):
+    """Tracks open elements so unclosed structure can be reported at the end."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.stack = []
+        self.tags = 0
+
+    def handle_starttag(self, tag, attrs):
+        self.tags += 1
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_endtag(self, tag):
+        # Close the nearest matching element, implicitly closing any inside it;
+        # a stray end tag is ignored, as browsers do
+        if tag in self.stack:
+            index = len(self.stack) - 1 - self.stack[::-1].index(tag)
+            del self.stack[index:]
+
+
+def check_section(content, finish_reason=None):
+    """Return a list of problems with a section's HTML (empty when it is usable)."""
+    problems = []
+    if finish_reason == 'length':
+        problems.append('truncated at max_tokens')
+    if '<' not in content:
+        problems.append('no HTML in response')
+        return problems
+
+    parser = StructureParser()
+    parser.feed(content)
+    if content.rfind('<') > content.rfind('>'):
+        problems.append('ends inside a tag')
+    parser.close()
+    if parser.tags == 0:
+        problems.append('no HTML elements')
+    unclosed = [tag for tag in parser.stack if tag in STRUCTURAL_TAGS]
+    if unclosed:
+        problems.append('unclosed ' + ', '.join(f'<{tag}>' for tag in unclosed))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the section files of VenturePulse reports')
+    parser.add_argument('report_dirs', nargs='+', help='Report folders to check')
+    args = parser.parse_args()
+
+    broken = 0
+    for report_dir in args.report_dirs:
+        for path in sorted(Path(report_dir).glob('section[0-8][0-9]-*.html')):
+            text = path.read_text(encoding='utf-8')
+            problems = check_section(strip_fences(text))
+            if FENCE_RE.search(text):
+                problems.insert(0, 'wrapped in a code fence')
+            if problems:
+                broken += 1
+                print(f"✗ {path}: {'; '.join(problems)}")
+    if broken:
+        print(f"{broken} section(s) need attention; regenerate with: analyze.py <project> --refresh-section NN")
+        sys.exit(1)
+    print("✓ All sections look complete")
+
+
+if __name__ == '__main__':
+    main()